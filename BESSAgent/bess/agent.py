@@ -81,6 +81,7 @@ class BESSAgent(Agent):
         self.soc_low_recovery_charge_command = 10  # kW rate to charge while in SoC Recovery mode.
 
         self.system_fault_check_interval = 1
+        self.poll_points = False  # Read all points in one RPC per component before each fault check.
         self.wait_connecting_interval = 1
         self.default_rpc_wait = 0.9
 
@@ -136,6 +137,7 @@ class BESSAgent(Agent):
                                "soc_recovery_check_interval": self.soc_recovery_check_interval,
                                "soc_low_recovery_charge_command": self.soc_low_recovery_charge_command,
                                "system_fault_check_interval": self.system_fault_check_interval,
+                               "poll_points": self.poll_points,
                                "wait_connecting_interval": self.wait_connecting_interval,
                                "default_rpc_wait": self.default_rpc_wait,
                                "strict_power_sign": self.strict_power_sign,
@@ -200,6 +202,9 @@ class BESSAgent(Agent):
             self.system_fault_check_interval = float(config.get('system_fault_check_interval'))
             if self.system_fault_check_interval <= 0:
                 raise ValueError('SYSTEM FAULT CHECK INTERVAL MUST BE POSITIVE')
+            self.poll_points = config.get('poll_points', self.poll_points)
+            if not isinstance(self.poll_points, bool):
+                raise ValueError('POLL POINTS MUST BE A BOOLEAN')
             self.wait_connecting_interval = float(config.get('wait_connecting_interval'))
             if self.wait_connecting_interval <= 0:
                 raise ValueError('WAIT CONNECTING INTERVAL MUST BE POSITIVE')
@@ -217,6 +222,7 @@ class BESSAgent(Agent):
             self.system_state_publish_topic = config.get('system_state_publish_topic')
         except ValueError as e:
             _log.error("ERROR PROCESSING CONFIGURATION: {}".format(e))
+        _log.info('Data point buffers hold {} bytes'.format(self.buffer_nbytes()))
 
         # Start the state manager:
         self.state_manager_greenlet = self.core.spawn(self.manage_state)
@@ -277,6 +283,13 @@ class BESSAgent(Agent):
         _log.info('Received USER_HOLD request.')
         self.state_queue.put(StateRequest(State.HOLD_TRANSITION, None, None))
 
+    @RPC.export('poll_latency')
+    def poll_latency_rpc(self):
+        """Last, mean and max duration in seconds of the batched point polls of each component."""
+        return {'battery': self.battery.poll_latency_stats(),
+                'inverter': self.inverter.poll_latency_stats(),
+                'meter': self.meter.poll_latency_stats()}
+
     @RPC.export('recover_soc')
     def user_soc_recovery(self, command=None):
         _log.info('Received USER_RECOVER_SOC request')
@@ -423,8 +436,7 @@ class BESSAgent(Agent):
             return StateRequest(State.HOLD_TRANSITION, None, None)
         try:
             calculated_command = self.calculate_command(request.command, 'CHARGE')
-            pf_accepted = self.inverter.set_pf_command(request.pf)
-            command_accepted = self.inverter.command_power(calculated_command)
+            command_accepted, pf_accepted = self.inverter.command_power_pf(calculated_command, request.pf)
         except Exception as e:
             _log.warning('Exception in CHARGE_TRANSITION: {} HOLDING now.'.format(e))
             return StateRequest(State.HOLD_TRANSITION, None, None)
@@ -439,8 +451,7 @@ class BESSAgent(Agent):
             return StateRequest(State.HOLD_TRANSITION, None, None)
         try:
             calculated_command = self.calculate_command(request.command, 'DISCHARGE')
-            pf_accepted = self.inverter.set_pf_command(request.pf)
-            command_accepted = self.inverter.command_power(calculated_command)
+            command_accepted, pf_accepted = self.inverter.command_power_pf(calculated_command, request.pf)
         except Exception as e:
             _log.warning('Exception in DISCHARGE_TRANSITION: {} HOLDING now.'.format(e))
             return StateRequest(State.HOLD_TRANSITION, None, None)
@@ -552,6 +563,11 @@ class BESSAgent(Agent):
         status = Status.build(STATUS_BAD, context=context)
         self.vip.health.send_alert(alert_key, status)
 
+    def buffer_nbytes(self):
+        """Memory held by the data point buffers of all components."""
+        return sum(component.buffer_nbytes() for component in (self.battery, self.inverter, self.meter)
+                   if hasattr(component, 'buffer_nbytes'))
+
     #
     # Periodic Functions
     #
@@ -591,6 +607,9 @@ class BESSAgent(Agent):
     def system_faults(self):
         """Check for System Faults.  If found, shutdown BESS."""
         faults = []
+        if self.poll_points:
+            self.battery.read_points()
+            self.inverter.read_points()
         # Read fault registers
         faults.extend(self.battery.check_faults())
         faults.extend(self.inverter.check_faults())
@@ -14,10 +14,14 @@
 
 import logging
 from volttron.platform.agent import utils
-from time_series_buffer import PointRecord
+from time_series_buffer import PointRecord, TimeSeriesBuffer
 from data_point import DataPoint
 import weakref
+import time
+import pytz
 from collections import defaultdict
+from datetime import datetime
+from gevent import sleep, Timeout
 
 utils.setup_logging()
 _log = logging.getLogger(__name__)
@@ -32,6 +36,9 @@ class BessComponent(object):
         self.agent = None
         self.point_mapping = {}
         self.repeatable_blocks = {}
+        self.rpc_timeout = 5
+        # Duration in seconds of each batched poll.
+        self.poll_latency = TimeSeriesBuffer(maxlen=100)
 
     def configure(self, agent, config):
         self.agent = agent
@@ -69,6 +76,89 @@ class BessComponent(object):
                 if attribute.topic and attribute.point_name:
                     self.subscriptions['devices/' + attribute.topic + '/all'].append(attribute)
 
+    def data_points(self):
+        """Mapped data points of this component and its repeatable blocks, keyed by actuator topic."""
+        points = {}
+        for value in vars(self).values():
+            if isinstance(value, DataPoint) and value.topic and value.point_name:
+                points[value.topic + '/' + value.point_name] = value
+        for block in self.repeatable_blocks.values():
+            points.update(block.data_points())
+        return points
+
+    def _call_with_retry(self, method, points, *args):
+        """Call an actuator RPC covering several points.
+
+        Uses the largest rpc_attempts and rpc_wait configured for the points."""
+        rpc_attempts = max(point.rpc_attempts for point in points)
+        rpc_wait = max(point.rpc_wait for point in points)
+        tries_remaining = rpc_attempts
+        while True:
+            try:
+                return self.agent.vip.rpc.call(self.agent.actuator_vip, method, *args).get(timeout=self.rpc_timeout)
+            except (Exception, Timeout) as e:
+                tries_remaining -= 1
+                if tries_remaining <= 0:
+                    raise
+                _log.warning('{} tries remaining of {} for {}: {}'.format(
+                    tries_remaining, rpc_attempts, method, e))
+                sleep(rpc_wait)
+
+    def read_points(self):
+        """Read every mapped data point with one get_multiple_points RPC.
+
+        Returns a dictionary of errors by topic.  The duration of the poll is
+        stored in poll_latency."""
+        points = self.data_points()
+        if not points:
+            return {}
+        start = time.time()
+        try:
+            results, errors = self._call_with_retry('get_multiple_points', points.values(), list(points))
+        except (Exception, Timeout) as e:
+            _log.error('Batched read of {} points failed: {}'.format(len(points), e))
+            return dict((topic, repr(e)) for topic in points)
+        now = datetime.now(pytz.utc).astimezone(self.agent.tz)
+        for topic, value in results.items():
+            point = points.get(topic)
+            if point is not None and value is not None:
+                point.append(PointRecord(point.scale_in(value), now))
+        self.poll_latency.append(time.time() - start, now)
+        if errors:
+            _log.warning('Errors reading points: {}'.format(errors))
+        return errors
+
+    def set_points(self, values):
+        """Set several data points with one set_multiple_points RPC.
+
+        :param values: list of (DataPoint, value) pairs in real-world units, in the order they should be written.
+        Returns a dictionary of errors by topic, empty if every point was set."""
+        if not values:
+            return {}
+        topics_values = [point.set_request(value) for point, value in values]
+        try:
+            errors = self._call_with_retry('set_multiple_points', [point for point, _ in values],
+                                           self.agent.core.identity, topics_values)
+        except (Exception, Timeout) as e:
+            _log.error('Batched set of {} points failed: {}'.format(len(topics_values), e))
+            return dict((topic, repr(e)) for topic, _ in topics_values)
+        if errors:
+            _log.error('Failed to set points: {}'.format(errors))
+        return errors or {}
+
+    def poll_latency_stats(self):
+        """Last, mean and max batched poll duration in seconds."""
+        last = self.poll_latency.last
+        return {'last': last.value if last else None,
+                'mean': self.poll_latency.mean(),
+                'max': self.poll_latency.max()}
+
+    def buffer_nbytes(self):
+        """Memory held by the data point buffers of this component and its repeatable blocks."""
+        nbytes = sum(value.nbytes for value in vars(self).values() if isinstance(value, DataPoint))
+        nbytes += sum(block.buffer_nbytes() for block in self.repeatable_blocks.values())
+        return nbytes
+
     def on_topic(self, peer, sender, bus, topic, headers, message):
         date_header = headers.get('Date')
         d_time = utils.parse_timestamp_string(date_header) if date_header is not None else None
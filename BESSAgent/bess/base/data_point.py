@@ -78,6 +78,9 @@ class DataPoint(TimeSeriesBuffer):
     def get(self, since=None, until=None, columns=None):
         if self.max_data_age and not since:
             since = datetime.now(pytz.utc).astimezone(self.tz) - timedelta(seconds=self.max_data_age)
+        if not columns:
+            # Only the newest record is wanted, find it without building the window.
+            return self.latest(since, until)
         try:
             retval = super(DataPoint, self).get(since, until, columns)
             retval = retval[-1]
@@ -85,6 +88,10 @@ class DataPoint(TimeSeriesBuffer):
             retval = None
         return retval
 
+    def set_request(self, value):
+        """Actuator topic and scaled value for setting this point in a set_multiple_points call."""
+        return self.topic + '/' + self.point_name, self.scale_out(value)
+
     # TODO: The value in the object will not update until the next poll. Should it? Corner cases with set_result....
     def set(self, value, check_response=True):
         value = self.scale_out(value)
@@ -12,79 +12,220 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from collections import deque, namedtuple
+from collections import namedtuple
+import calendar
 import pytz
 from datetime import datetime, tzinfo
-from itertools import ifilter
+import numpy as np
 
 PointRecord = namedtuple('PointRecord', ['value', 'd_time'])
 
+# Capacity used when no maxlen is given. The buffer never grows past it.
+DEFAULT_MAXLEN = 1024
+
+
+def _timestamp(d_time):
+    """Seconds since the epoch for an aware or naive (UTC) datetime."""
+    if d_time.tzinfo is not None:
+        d_time = d_time.astimezone(pytz.utc)
+    return calendar.timegm(d_time.timetuple()) + d_time.microsecond / 1e6
+
 
 # TODO: Implement comparison methods (__lt__, __eq__, etc)
-class TimeSeriesBuffer(deque):
+class TimeSeriesBuffer(object):
+    """
+    Fixed capacity ring buffer of PointRecords backed by numpy arrays.
+
+    Records are expected to arrive in time order. While they do, time window
+    queries use a binary search. If an older record is appended the buffer
+    falls back to a linear scan for queries until it is cleared.
+    """
     def __init__(self, iterable=(), maxlen=None, tz='UTC'):
-        super(TimeSeriesBuffer, self).__init__(iterable, maxlen)
+        self._capacity = int(maxlen) if maxlen else DEFAULT_MAXLEN
         self.tz = tz if isinstance(tz, tzinfo) else pytz.timezone(tz)
+        self._times = np.empty(self._capacity, dtype=np.float64)
+        self._d_times = np.empty(self._capacity, dtype=object)
+        # Values are kept as given, with a float copy for the statistics.
+        self._values = np.empty(self._capacity, dtype=object)
+        self._numeric = np.empty(self._capacity, dtype=np.float64)
+        self._head = 0
+        self._size = 0
+        self._ordered = True
         self.last = None
+        self.extend(iterable)
+
+    maxlen = property(lambda self: self._capacity)
+
+    @property
+    def nbytes(self):
+        """Memory held by the buffer arrays.  This is fixed by maxlen."""
+        # Object arrays hold a pointer per slot; count the pointed to
+        # datetimes too as they are kept alive by the buffer.
+        return self._times.nbytes + self._d_times.nbytes + self._values.nbytes + \
+            self._numeric.nbytes + self._size * datetime.__basicsize__
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for index in self._indices():
+            yield PointRecord(self._values[index], self._d_times[index])
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(self._size))]
+        if item < 0:
+            item += self._size
+        if not 0 <= item < self._size:
+            raise IndexError('TimeSeriesBuffer index out of range')
+        index = (self._head + item) % self._capacity
+        return PointRecord(self._values[index], self._d_times[index])
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+        self._ordered = True
+        self._d_times[:] = None
+        self._values[:] = None
+
+    def _record(self, value, d_time=None):
+        if isinstance(value, PointRecord):
+            value, d_time = value
+        if d_time is None:
+            d_time = datetime.now(pytz.utc).astimezone(self.tz)
+        return PointRecord(value, d_time)
+
+    def _store(self, index, record):
+        self._values[index] = record.value
+        try:
+            self._numeric[index] = float(record.value)
+        except (TypeError, ValueError):
+            self._numeric[index] = np.nan
+        self._times[index] = _timestamp(record.d_time)
+        self._d_times[index] = record.d_time
 
     def append(self, value, d_time=None):
-        if not isinstance(value, PointRecord):
-            d_time = d_time if d_time else datetime.now(pytz.utc).astimezone(self.tz)
-            value = PointRecord(value, d_time)
-        self.last = value
-        super(TimeSeriesBuffer, self).append(value)
+        record = self._record(value, d_time)
+        if self._size == self._capacity:
+            index = self._head
+            self._head = (self._head + 1) % self._capacity
+        else:
+            index = (self._head + self._size) % self._capacity
+            self._size += 1
+        if self._size > 1 and self._ordered:
+            previous = (index - 1) % self._capacity
+            self._ordered = _timestamp(record.d_time) >= self._times[previous]
+        self._store(index, record)
+        self.last = record
 
     def appendleft(self, value, d_time=None):
-        if not isinstance(value, PointRecord):
-            d_time = d_time if d_time else datetime.now(pytz.utc).astimezone(self.tz)
-            super(TimeSeriesBuffer, self).append(PointRecord(value, d_time))
-        else:
-            super(TimeSeriesBuffer, self).appendleft(value)
+        record = self._record(value, d_time)
+        if self._size == self._capacity:
+            # A full deque drops the newest record on appendleft.
+            self._size -= 1
+        self._head = (self._head - 1) % self._capacity
+        self._size += 1
+        if self._size > 1 and self._ordered:
+            following = (self._head + 1) % self._capacity
+            self._ordered = _timestamp(record.d_time) <= self._times[following]
+        self._store(self._head, record)
 
     def extend(self, values):
-        if not all(isinstance(x, PointRecord) for x in values):
-            if all(len(x) == 2 and isinstance(x[1], datetime) for x in values):
-                values = [PointRecord(*x) for x in values]
-            else:
-                raise ValueError('Values must be iterable and all elements must be compatible with PointRecord.')
-        # TODO: How do we know this should really be the last value?
-        self.last = values[-1]
-        super(TimeSeriesBuffer, self).extend(values)
+        values = self._validate(values)
+        for record in values:
+            self.append(record)
 
     def extendleft(self, values):
+        values = self._validate(values)
+        for record in values:
+            self.appendleft(record)
+
+    @staticmethod
+    def _validate(values):
+        values = list(values)
         if not all(isinstance(x, PointRecord) for x in values):
-            if all(len(x) == 2 or isinstance(x[1], datetime)for x in values):
+            if all(len(x) == 2 and isinstance(x[1], datetime) for x in values):
                 values = [PointRecord(*x) for x in values]
             else:
                 raise ValueError('Values must be iterable and all elements must be compatible with PointRecord.')
-        super(TimeSeriesBuffer, self).extendleft(values)
+        return values
+
+    def _segments(self):
+        """Physical (start, stop) slices of the buffer in time order."""
+        end = self._head + self._size
+        if end <= self._capacity:
+            return [(self._head, end)]
+        return [(self._head, self._capacity), (0, end - self._capacity)]
+
+    def _indices(self, since=None, until=None):
+        """Physical indices of the records with since < d_time < until."""
+        if since is not None and not isinstance(since, datetime):
+            raise ValueError("If specified, since must be a datetime.")
+        if until is not None and not isinstance(until, datetime):
+            raise ValueError("If specified, until must be a datetime")
+        lower = _timestamp(since) if since else None
+        upper = _timestamp(until) if until else None
+        indices = []
+        for start, stop in self._segments():
+            times = self._times[start:stop]
+            if self._ordered:
+                lo = np.searchsorted(times, lower, side='right') if lower is not None else 0
+                hi = np.searchsorted(times, upper, side='left') if upper is not None else len(times)
+                indices.append(np.arange(start + lo, start + max(lo, hi)))
+            else:
+                mask = np.ones(len(times), dtype=bool)
+                if lower is not None:
+                    mask &= times > lower
+                if upper is not None:
+                    mask &= times < upper
+                indices.append(start + np.flatnonzero(mask))
+        return np.concatenate(indices) if indices else np.array([], dtype=int)
+
+    def latest(self, since=None, until=None):
+        """Most recent record with since < d_time < until, or None."""
+        if not self._ordered:
+            indices = self._indices(since, until)
+            if not len(indices):
+                return None
+            return PointRecord(self._values[indices[-1]], self._d_times[indices[-1]])
+        lower = _timestamp(since) if since else None
+        upper = _timestamp(until) if until else None
+        for start, stop in reversed(self._segments()):
+            times = self._times[start:stop]
+            lo = np.searchsorted(times, lower, side='right') if lower is not None else 0
+            hi = np.searchsorted(times, upper, side='left') if upper is not None else len(times)
+            if hi > lo:
+                return PointRecord(self._values[start + hi - 1], self._d_times[start + hi - 1])
+            if lo > 0:
+                # Everything older is before since as well.
+                break
+        return None
 
     def get(self, since=None, until=None, columns=False):
-        retval = self
-        retval = self._since(retval, since) if since else retval
-        retval = self._until(retval, until) if until else retval
-        retval = zip(*retval) if columns else list(retval)
+        indices = self._indices(since, until)
+        retval = [PointRecord(self._values[i], self._d_times[i]) for i in indices]
+        retval = list(zip(*retval)) if columns else retval
         return retval
 
     def get_values(self, since=None, until=None):
-        return self.get(since, until)[0]
+        return self.get(since, until, columns=True)[0]
 
     def get_times(self, since=None, until=None):
-        return self.get(since, until)[1]
+        return self.get(since, until, columns=True)[1]
 
-    @staticmethod
-    def _until(inval, until):
-        if not isinstance(until, datetime):
-            raise ValueError("If specified, until must be a datetime")
-        return ifilter(lambda d: d[1] < until, inval)
-
-    @staticmethod
-    def _since(inval, since):
-        print("since is: {}, datetime is {}".format(type(since), type(datetime)))
-        if not isinstance(since, datetime):
-            raise ValueError("If specified, since must be a datetime.")
-        return ifilter(lambda d: d[1] > since, inval)
+    def _window_values(self, since, until):
+        """Numeric values in the window, non numeric values are skipped."""
+        values = self._numeric[self._indices(since, until)]
+        return values[~np.isnan(values)]
 
-    maxlen = property(lambda self: object(), lambda self, v: None, lambda self: None)
+    def mean(self, since=None, until=None):
+        values = self._window_values(since, until)
+        return float(values.mean()) if len(values) else None
 
+    def min(self, since=None, until=None):
+        values = self._window_values(since, until)
+        return float(values.min()) if len(values) else None
 
+    def max(self, since=None, until=None):
+        values = self._window_values(since, until)
+        return float(values.max()) if len(values) else None
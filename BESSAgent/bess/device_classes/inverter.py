@@ -176,6 +176,12 @@ class Inverter(BessComponent):
         raise NotImplementedError('Inverter.set_pf_command() is not implemented.')
         # TODO: Implement: Return accepted pf.
 
+    def command_power_pf(self, power, pf):
+        """Set the power factor and then the power command. Returns accepted power and accepted pf."""
+        pf_accepted = self.set_pf_command(pf)
+        command_accepted = self.command_power(power)
+        return command_accepted, pf_accepted
+
     def check_faults(self):
         # Should return list of string fault names.
         raise NotImplementedError('Inverter.check_faults() is not implemented.')
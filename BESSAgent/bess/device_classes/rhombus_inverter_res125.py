@@ -363,6 +363,19 @@ class RhombusInverterRes125(Inverter):
                 power, max_power_command_success))
         return max_power_command_success
 
+    def command_power_pf(self, power, pf):
+        """Write PowerFactorOffset and then MaxPowerCommand in one set_multiple_points call.
+
+        Returns accepted power and accepted power factor."""
+        approved_pf = self.limit_pf(pf)
+        _log.info('Setting Inverter PowerFactorOffset to {} (requested {}) and MaxPowerCommand to {}'.format(
+            approved_pf, pf, power))
+        errors = self.set_points([(self.power_factor_offset, approved_pf), (self.max_power_command, power)])
+        if errors:
+            raise Exception('Failed to set Inverter PowerFactorOffset to {} and MaxPowerCommand to {}: {}'.format(
+                approved_pf, power, errors))
+        return power, approved_pf
+
     def command_current(self, current):
         raise NotImplementedError('RhombusInverter.command_current() is not implemented.')
         # TODO: Implement: Return accepted current.
@@ -381,15 +394,19 @@ class RhombusInverterRes125(Inverter):
     # TODO: JCI indicates that PF control is open loop.  How should this be managed using meter reading?
     # TODO: JCI uses scale factor of 100 and -0.5 to 0.5 limits, but the Rhombus manual shows same limits with +or- 25
     # TODO: as the command which would be scale factor of 50.
+    @staticmethod
+    def limit_pf(pf):
+        """Restrict power factor offset to the limit of 60 degrees."""
+        if -0.5 > pf:
+            return -0.5
+        elif 0.5 < pf:
+            return 0.5
+        return pf
+
     def set_pf_command(self, pf):
         """Set power factor in inverter after restricting to limit of 60 degrees. Returns approved power factor."""
         # Curtail Power Factor to Natural Limits
-        if -0.5 > pf:
-            approved_pf = -0.5
-        elif 0.5 < pf:
-            approved_pf = 0.5
-        else:
-            approved_pf = pf
+        approved_pf = self.limit_pf(pf)
         _log.info('Requested power factor offset: {}. Setting to: {}'.format(pf, approved_pf))
 
         # Write Power Factor Command.
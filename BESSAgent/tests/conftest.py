@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The BESS base modules import each other by module name.
+sys.path.insert(0, os.path.join(os.path.abspath(os.path.dirname(os.path.dirname(__file__))), 'bess', 'base'))
@@ -0,0 +1,103 @@
+import pytest
+import pytz
+
+pytest.importorskip("volttron")
+
+from bess_component import BessComponent
+from data_point import DataPoint
+
+
+class FakeResult(object):
+    def __init__(self, value=None, error=None):
+        self.value = value
+        self.error = error
+
+    def get(self, timeout=None):
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class FakeRpc(object):
+    """Actuator stand-in for vip.rpc; fails the first `failures` calls."""
+    def __init__(self, values=None, failures=0):
+        self.values = values or {}
+        self.failures = failures
+        self.calls = []
+
+    def call(self, peer, method, *args):
+        self.calls.append((method,) + args)
+        if self.failures:
+            self.failures -= 1
+            return FakeResult(error=RuntimeError('actuator busy'))
+        if method == 'get_multiple_points':
+            return FakeResult(({t: self.values[t] for t in args[0] if t in self.values},
+                               {t: 'missing' for t in args[0] if t not in self.values}))
+        if method == 'set_multiple_points':
+            return FakeResult({})
+        raise AssertionError(method)
+
+
+class FakeCore(object):
+    identity = 'bess'
+
+
+class FakeVip(object):
+    def __init__(self, rpc):
+        self.rpc = rpc
+
+
+class FakeAgent(object):
+    actuator_vip = 'platform.actuator'
+    default_rpc_wait = 0.0
+    tz = pytz.utc
+
+    def __init__(self, rpc):
+        self.vip = FakeVip(rpc)
+        self.core = FakeCore()
+
+
+def make_component(rpc):
+    agent = FakeAgent(rpc)
+    component = BessComponent()
+    component.agent = agent
+    component.power = DataPoint(agent, maxlen=4, topic='campus/inverter', point_name='W', scale_factor=10.0,
+                                rpc_attempts=2, rpc_wait=0.0)
+    component.pf = DataPoint(agent, maxlen=4, topic='campus/inverter', point_name='PF', rpc_attempts=3, rpc_wait=0.0)
+    block = BessComponent()
+    block.agent = agent
+    block.soc = DataPoint(agent, maxlen=4, topic='campus/battery', point_name='SoC', rpc_wait=0.0)
+    component.repeatable_blocks['battery'] = block
+    return component
+
+
+def test_read_points_includes_repeatable_blocks():
+    rpc = FakeRpc({'campus/inverter/W': 5, 'campus/inverter/PF': 0.25, 'campus/battery/SoC': 80})
+    component = make_component(rpc)
+    assert component.read_points() == {}
+    assert len(rpc.calls) == 1
+    assert sorted(rpc.calls[0][1]) == ['campus/battery/SoC', 'campus/inverter/PF', 'campus/inverter/W']
+    assert component.power.last.value == 50.0
+    assert component.repeatable_blocks['battery'].soc.last.value == 80
+    assert len(component.poll_latency) == 1
+
+
+def test_set_points_uses_one_ordered_call():
+    rpc = FakeRpc()
+    component = make_component(rpc)
+    assert component.set_points([(component.pf, 0.1), (component.power, 300.0)]) == {}
+    assert rpc.calls == [('set_multiple_points', 'bess', [('campus/inverter/PF', 0.1), ('campus/inverter/W', 30.0)])]
+
+
+def test_batched_calls_retry_with_point_settings():
+    rpc = FakeRpc(failures=2)
+    component = make_component(rpc)
+    # The largest rpc_attempts of the points set is 3, so the third attempt succeeds.
+    assert component.set_points([(component.pf, 0.1), (component.power, 300.0)]) == {}
+    assert len(rpc.calls) == 3
+
+    rpc = FakeRpc(failures=2)
+    component = make_component(rpc)
+    errors = component.set_points([(component.power, 300.0)])
+    assert list(errors) == ['campus/inverter/W']
+    assert len(rpc.calls) == 2
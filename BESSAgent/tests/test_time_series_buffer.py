@@ -0,0 +1,140 @@
+from collections import deque
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+from time_series_buffer import PointRecord, TimeSeriesBuffer
+
+START = datetime(2019, 7, 1, tzinfo=pytz.utc)
+
+
+def records(count, start=0):
+    return [PointRecord(float(i % 7) - 2.5, START + timedelta(seconds=10 * i)) for i in range(start, start + count)]
+
+
+def reference_get(reference, since=None, until=None):
+    """Window query as the deque based buffer did it."""
+    retval = list(reference)
+    retval = [r for r in retval if r.d_time > since] if since else retval
+    retval = [r for r in retval if r.d_time < until] if until else retval
+    return retval
+
+
+WINDOWS = [
+    (None, None),
+    (START + timedelta(seconds=95), None),
+    (None, START + timedelta(seconds=205)),
+    (START + timedelta(seconds=100), START + timedelta(seconds=200)),
+    (START + timedelta(seconds=1000), None),
+    (None, START - timedelta(seconds=1)),
+]
+
+
+def test_wraparound_matches_deque():
+    buf = TimeSeriesBuffer(maxlen=8)
+    reference = deque(maxlen=8)
+    for record in records(21):
+        buf.append(record)
+        reference.append(record)
+        assert list(buf) == list(reference)
+        assert len(buf) == len(reference)
+        assert buf.last == record
+    assert buf[0] == reference[0]
+    assert buf[-1] == reference[-1]
+    assert buf[2:5] == list(reference)[2:5]
+    with pytest.raises(IndexError):
+        buf[8]
+
+
+def test_appendleft_on_full_buffer_drops_newest():
+    buf = TimeSeriesBuffer(records(4, start=10), maxlen=4)
+    reference = deque(records(4, start=10), maxlen=4)
+    for record in reversed(records(3, start=7)):
+        buf.appendleft(record)
+        reference.appendleft(record)
+        assert list(buf) == list(reference)
+    buf.extendleft(reversed(records(2, start=5)))
+    reference.extendleft(reversed(records(2, start=5)))
+    assert list(buf) == list(reference)
+
+
+@pytest.mark.parametrize("since, until", WINDOWS)
+def test_window_queries_match_deque(since, until):
+    buf = TimeSeriesBuffer(maxlen=16)
+    reference = deque(maxlen=16)
+    for record in records(30):
+        buf.append(record)
+        reference.append(record)
+    expected = reference_get(reference, since, until)
+    assert buf.get(since, until) == expected
+    assert buf.latest(since, until) == (expected[-1] if expected else None)
+    if expected:
+        assert list(buf.get_values(since, until)) == [r.value for r in expected]
+        assert list(buf.get_times(since, until)) == [r.d_time for r in expected]
+
+
+@pytest.mark.parametrize("since, until", WINDOWS)
+def test_out_of_order_records_match_deque(since, until):
+    shuffled = records(12)
+    shuffled[3], shuffled[9] = shuffled[9], shuffled[3]
+    buf = TimeSeriesBuffer(shuffled, maxlen=10)
+    reference = deque(shuffled, maxlen=10)
+    expected = reference_get(reference, since, until)
+    assert buf.get(since, until) == expected
+    assert buf.latest(since, until) == (expected[-1] if expected else None)
+
+
+@pytest.mark.parametrize("since, until", WINDOWS)
+def test_statistics(since, until):
+    buf = TimeSeriesBuffer(maxlen=16)
+    reference = deque(maxlen=16)
+    for record in records(30):
+        buf.append(record)
+        reference.append(record)
+    values = [r.value for r in reference_get(reference, since, until)]
+    if values:
+        assert buf.mean(since, until) == pytest.approx(sum(values) / len(values))
+        assert buf.min(since, until) == min(values)
+        assert buf.max(since, until) == max(values)
+    else:
+        assert buf.mean(since, until) is None
+        assert buf.min(since, until) is None
+        assert buf.max(since, until) is None
+
+
+def test_statistics_skip_non_numeric_values():
+    buf = TimeSeriesBuffer([PointRecord(1.0, START),
+                            PointRecord('fault', START + timedelta(seconds=1)),
+                            PointRecord(3.0, START + timedelta(seconds=2))], maxlen=4)
+    assert buf.mean() == 2.0
+    assert buf.min() == 1.0
+    assert buf.max() == 3.0
+    assert buf[1].value == 'fault'
+
+
+def test_nbytes_is_bounded_by_maxlen():
+    buf = TimeSeriesBuffer(maxlen=32)
+    buf.extend(records(32))
+    full = buf.nbytes
+    buf.extend(records(500, start=32))
+    assert len(buf) == 32
+    assert buf.nbytes == full
+    assert TimeSeriesBuffer(maxlen=64).nbytes > TimeSeriesBuffer(maxlen=32).nbytes
+
+
+def test_clear_resets_window_search():
+    buf = TimeSeriesBuffer(records(5)[::-1], maxlen=8)
+    buf.clear()
+    assert len(buf) == 0
+    assert buf.latest() is None
+    buf.extend(records(5))
+    assert buf.get(START + timedelta(seconds=15)) == records(5)[2:]
+
+
+def test_invalid_window_bounds():
+    buf = TimeSeriesBuffer(records(3), maxlen=4)
+    with pytest.raises(ValueError):
+        buf.get(since=5)
+    with pytest.raises(ValueError):
+        buf.get(until='tomorrow')
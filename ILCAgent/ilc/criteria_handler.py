@@ -66,14 +66,15 @@ import abc
 from sympy import symbols
 from sympy.core import numbers
 from sympy.parsing.sympy_parser import parse_expr
-from collections import deque
+from collections import deque, defaultdict
 import logging
+import numpy as np
 from datetime import timedelta as td
 from volttron.platform.agent.utils import setup_logging, get_aware_utc_now, format_timestamp
 from volttron.platform.messaging import topics, headers as headers_mod
-from .ilc_matrices import (build_score, input_matrix)
+from .ilc_matrices import (build_score, criteria_weights, input_matrix)
 
-from .utils import parse_sympy, create_device_topic_map, fix_up_point_name
+from .utils import parse_sympy, create_device_topic_map, fix_up_point_name, compile_expression
 
 setup_logging()
 _log = logging.getLogger(__name__)
@@ -94,6 +95,7 @@ class CriteriaCluster(object):
         self.priority = priority
         self.criteria_labels = criteria_labels
         self.row_average = row_average
+        self.weights = criteria_weights(row_average, priority)
         global mappers
         try:
             mappers = cluster_config.pop("mappers")
@@ -117,33 +119,61 @@ class CriteriaContainer(object):
     def __init__(self):
         self.clusters = []
         self.devices = {}
+        self.topic_map = defaultdict(list)
+        self.criterion_count = 0
 
     def add_criteria_cluster(self, cluster):
         self.clusters.append(cluster)
         self.devices.update(cluster.criteria)
+        self.index_criteria(cluster)
+
+    def index_criteria(self, cluster):
+        """
+        Map each point topic to the criteria that read it so ingest_data
+        only reaches the criteria that use the published points.
+        :param cluster: CriteriaCluster
+        :return:
+        """
+        for device in cluster.criteria.values():
+            for criteria in device.criteria.values():
+                for criterion in criteria.criteria.values():
+                    # Keep the configuration order so criteria ingest data
+                    # in the same order as a walk over all devices.
+                    entry = (self.criterion_count, criterion)
+                    self.criterion_count += 1
+                    for topic in criterion.ingest_topics():
+                        self.topic_map[topic].append(entry)
 
     def get_score_order(self, state):
-        all_scored = []
+        all_devices = []
+        all_scores = []
+        debug = _log.isEnabledFor(logging.DEBUG)
         for cluster in self.clusters:
             evaluations = cluster.get_all_evaluations(state)
 
-            _log.debug('Device Evaluations: ' + str(evaluations))
+            if debug:
+                _log.debug('Device Evaluations: ' + str(evaluations))
 
             if not evaluations:
                 continue
 
-            if state not in cluster.criteria_labels.keys() or state not in cluster.row_average.keys():
+            if state not in cluster.criteria_labels.keys() or state not in cluster.weights.keys():
                 _log.debug("Criteria - Not configured for current state: {}".format(state))
                 continue
-            _log.debug("EVAL: {} - {}".format(evaluations.values(), cluster.criteria_labels[state]))
-            input_arr = input_matrix(evaluations, cluster.criteria_labels[state])
-            scores = build_score(input_arr, cluster.row_average[state], cluster.priority)
-            all_scored.extend(scores)
-
-            _log.debug('Input Array: ' + str(input_arr))
-            _log.debug('Scored devices: ' + str(scores))
-
-        all_scored.sort(reverse=True)
+            if debug:
+                _log.debug("EVAL: {} - {}".format(evaluations.values(), cluster.criteria_labels[state]))
+            devices, input_arr = input_matrix(evaluations, cluster.criteria_labels[state])
+            scores = build_score(input_arr, cluster.weights[state])
+            all_devices.extend(devices)
+            all_scores.append(scores)
+
+            if debug:
+                _log.debug('Input Array: ' + str(input_arr))
+                _log.debug('Scored devices: ' + str(list(zip(scores.tolist(), devices))))
+
+        if not all_devices:
+            return []
+        all_scored = sorted(zip(np.concatenate(all_scores).tolist(), all_devices), reverse=True)
         results = [x[1] for x in all_scored]
 
         return results
@@ -151,11 +181,13 @@ class CriteriaContainer(object):
     def get_device(self, device_name):
         return self.devices[device_name]
 
-    # this passes all data coming in to all device criteria
-    # TODO:  rethink this approach.  Is there a better way to create the topic map to pass only data needed
     def ingest_data(self, time_stamp, data):
-        for device in self.devices.values():
-            device.ingest_data(time_stamp, data)
+        targets = {}
+        for topic in data:
+            for order, criterion in self.topic_map.get(topic, ()):
+                targets[order] = criterion
+        for order in sorted(targets):
+            targets[order].ingest_data(time_stamp, data)
 
 
 class DeviceCriteria(object):
@@ -271,6 +303,14 @@ class BaseCriterion(object):
     def ingest_data(self, time_stamp, data):
         pass
 
+    def ingest_topics(self):
+        """
+        Point topics read by ingest_data.  Criteria that override
+        ingest_data must also override this to receive data.
+        :return: set of topics
+        """
+        return set()
+
     def criteria_status(self, status):
         pass
 
@@ -308,6 +348,9 @@ class StatusCriterion(BaseCriterion):
             self.publish_data(self.point_name, value, time_stamp)
             self.current_status = bool(data[self.point_name])
 
+    def ingest_topics(self):
+        return {self.point_name}
+
 
 @register_criterion('constant')
 class ConstantCriterion(BaseCriterion):
@@ -336,6 +379,7 @@ class FormulaCriterion(BaseCriterion):
         self.build_ingest_map(operation_args)
         _log.debug("Device topic map: {}".format(self.device_topic_map))
         self.expr = parse_expr(parse_sympy(operation))
+        self.compiled_expr = compile_expression(self.expr)
         self.status = False
 
         self.current_operation_values = {}
@@ -376,8 +420,7 @@ class FormulaCriterion(BaseCriterion):
 
     def evaluate(self):
         if len(self.current_operation_values) >= self.operation_arg_count:
-            point_list = self.current_operation_values.items()
-            value = self.expr.subs(point_list)
+            value = self.compiled_expr(self.current_operation_values)
         else:
             value = self.minimum
         return value
@@ -390,6 +433,9 @@ class FormulaCriterion(BaseCriterion):
                     self.publish_data(topic, value, time_stamp)
                     self.current_operation_values[point] = value
 
+    def ingest_topics(self):
+        return set(self.device_topic_map)
+
     def criteria_status(self, status):
         self.status = status
 
@@ -455,3 +501,6 @@ class HistoryCriterion(BaseCriterion):
             self.current_value = data[self.point_name]
             self.history.appendleft((time_stamp, self.current_value))
 
+    def ingest_topics(self):
+        return {self.point_name}
+
@@ -68,7 +68,7 @@ from sympy.parsing.sympy_parser import parse_expr
 from volttron.platform.agent.utils import setup_logging, format_timestamp, get_aware_utc_now
 from volttron.platform.messaging import topics, headers as headers_mod
 
-from .utils import parse_sympy, create_device_topic_map, fix_up_point_name
+from .utils import parse_sympy, create_device_topic_map, fix_up_point_name, compile_expression
 
 setup_logging()
 _log = logging.getLogger(__name__)
@@ -142,6 +142,7 @@ class DeviceStatus(object):
         # self.device_status_args = device_status_args
         self.condition = parse_sympy(condition, condition=True)
         self.expr = parse_expr(self.condition)
+        self.compiled_expr = compile_expression(self.expr)
         self.command_status = False
         self.default_device = default_device
         self.parent = parent
@@ -161,7 +162,7 @@ class DeviceStatus(object):
         conditional_points = self.current_device_values.items()
         conditional_value = False
         if conditional_points:
-            conditional_value = self.expr.subs(conditional_points)
+            conditional_value = self.compiled_expr(conditional_points)
         try:
             self.command_status = bool(conditional_value)
         except TypeError:
@@ -306,6 +307,7 @@ class ControlSetting(object):
                 self.equation_args.append([token, point])
 
             self.control_value_formula = parse_expr(parse_sympy(equation['operation']))
+            self.compiled_control_value_formula = compile_expression(self.control_value_formula)
             self.maximum = equation['maximum']
             self.minimum = equation['minimum']
 
@@ -325,6 +327,7 @@ class ControlSetting(object):
             load_expr = parse_expr(parse_sympy(load['operation']))
             self.load = {
                 'load_equation': load_expr,
+                'compiled_load_equation': compile_expression(load_expr),
                 'load_equation_args': load_args,
                 'actuator_args': actuator_args
             }
@@ -341,6 +344,7 @@ class ControlSetting(object):
             # self.conditional_args = parse_sympy(conditional_args)
             self.conditional_expr = parse_sympy(condition, condition=True)
             self.conditional_control = parse_expr(self.conditional_expr)
+            self.compiled_conditional_control = compile_expression(self.conditional_control)
 
             self.device_topic_map, self.device_topics = create_device_topic_map(conditional_args, default_device)
         self.device_topics.add(self.point_device)
@@ -356,6 +360,7 @@ class ControlSetting(object):
                 'load': self.load,
                 'revert_priority': self.revert_priority,
                 'control_equation': self.control_value_formula,
+                'compiled_control_equation': self.compiled_control_value_formula,
                 'equation_args': self.equation_args,
                 'control_method': self.control_method,
                 'maximum': self.maximum,
@@ -388,7 +393,7 @@ class ControlSetting(object):
             return True
 
         if self.conditional_points:
-            value = self.conditional_control.subs(self.conditional_points)
+            value = self.compiled_conditional_control(self.conditional_points)
             _log.debug('{} (conditional_control) evaluated to {}'.format(self.conditional_expr, value))
         else:
             value = False
@@ -66,15 +66,16 @@ import os
 import sys
 import logging
 import math
+import time
 from datetime import timedelta as td, datetime as dt
 from dateutil import parser
 import gevent
+from gevent.pool import Pool
 import dateutil.tz
 from sympy.parsing.sympy_parser import parse_expr
 from sympy import symbols
 from volttron.platform.agent import utils
 from volttron.platform.messaging import topics, headers as headers_mod
-from volttron.platform.agent.math_utils import mean
 from volttron.platform.agent.utils import (setup_logging, format_timestamp, get_aware_utc_now, parse_timestamp_string)
 from volttron.platform.vip.agent import Agent, Core
 from volttron.platform.jsonrpc import RemoteError
@@ -82,6 +83,7 @@ from ilc.ilc_matrices import (extract_criteria, calc_column_sums,
                               normalize_matrix, validate_input)
 from ilc.curtailment_handler import ControlCluster, ControlContainer
 from ilc.criteria_handler import CriteriaContainer, CriteriaCluster, parse_sympy
+from ilc.utils import clear_expression_cache, compile_expression, RollingPowerAverage
 
 from transitions import Machine
 # from transitions.extensions import GraphMachine as Machine
@@ -259,7 +261,7 @@ class ILCAgent(Agent):
         self.kill_signal_received = False
         self.scheduled_devices = set()
         self.devices = []
-        self.bldg_power = []
+        self.bldg_power = RollingPowerAverage(td(minutes=15))
         self.avg_power = None
         self.device_group_size = None
         self.current_stagger = None
@@ -329,6 +331,7 @@ class ILCAgent(Agent):
         self.ilc_start_topic = "/".join([ilc_start_topic, "ilc/start"])
 
         cluster_configs = config["clusters"]
+        clear_expression_cache()
         self.criteria_container = CriteriaContainer()
         self.control_container = ControlContainer()
 
@@ -389,6 +392,7 @@ class ILCAgent(Agent):
                 self.demand_expr = parse_expr(parse_sympy(demand_operation))
                 self.demand_args = parse_sympy(demand_formula["operation_args"])
                 self.demand_points = symbols(self.demand_args)
+                self.compiled_demand_expr = compile_expression(self.demand_expr)
             except (KeyError, ValueError):
                 _log.debug("Missing 'operation_args' or 'operation' for setting demand formula!")
                 self.calculate_demand = False
@@ -424,6 +428,7 @@ class ILCAgent(Agent):
         action_time = config.get("control_time", 15)
         self.action_time = td(minutes=action_time)
         self.average_window = td(minutes=config.get("average_building_power_window", 15))
+        self.bldg_power.window = self.average_window
         self.confirm_time = td(minutes=config.get("confirm_time", 5))
 
         self.actuator_schedule_buffer = td(minutes=config.get("actuator_schedule_buffer", 15)) + self.action_time
@@ -432,6 +437,8 @@ class ILCAgent(Agent):
         self.stagger_release_time = float(config.get("release_time", action_time))
         self.stagger_release = config.get("stagger_release", False)
         self.need_actuator_schedule = config.get("need_actuator_schedule", False)
+        self.actuator_concurrency = max(1, int(config.get("actuator_concurrency", 20)))
+        self.actuator_timeout = config.get("actuator_timeout", 30)
         self.demand_threshold = config.get("demand_threshold", 5.0)
         self.sim_running = config.get("simulation_running", False)
         self.starting_base('core')
@@ -701,30 +708,9 @@ class ILCAgent(Agent):
         if self.sim_running:
             self.check_schedule(current_time)
 
-        if self.bldg_power:
-            average_time = self.bldg_power[-1][0] - self.bldg_power[0][0] + td(seconds=15)
-        else:
-            average_time = td(minutes=0)
-
-        if average_time >= self.average_window and current_power > 0:
-            self.bldg_power.append((current_time, current_power))
-            self.bldg_power.pop(0)
-        elif current_power > 0:
-            self.bldg_power.append((current_time, current_power))
-
-        smoothing_constant = 2.0 / (len(self.bldg_power) + 1.0) * 2.0 if self.bldg_power else 1.0
-        smoothing_constant = smoothing_constant if smoothing_constant <= 1.0 else 1.0
-        power_sort = list(self.bldg_power)
-        power_sort.sort(reverse=True)
-        exp_power = 0
-
-        for n in range(len(self.bldg_power)):
-            exp_power += power_sort[n][1] * smoothing_constant * (1.0 - smoothing_constant) ** n
-
-        exp_power += power_sort[-1][1] * (1.0 - smoothing_constant) ** (len(self.bldg_power))
-
-        norm_list = [float(i[1]) for i in self.bldg_power]
-        average_power = mean(norm_list) if norm_list else 0.0
+        average_time = self.bldg_power.add(current_time, float(current_power))
+        exp_power = self.bldg_power.exponential_average()
+        average_power = self.bldg_power.mean()
 
         _log.debug("Reported time: {} - instantaneous power: {}".format(current_time,
                                                                         current_power))
@@ -756,11 +742,9 @@ class ILCAgent(Agent):
             _log.debug("Reading building power data.")
             if self.calculate_demand:
                 try:
-                    demand_point_list = []
-                    for point in self.demand_args:
-                        _log.debug("Demand calculation - point: {} - value: {}".format(point, data[point]))
-                        demand_point_list.append((point, data[point]))
-                    current_power = self.demand_expr.subs(demand_point_list)
+                    demand_point_list = [(point, data[point]) for point in self.demand_args]
+                    _log.debug("Demand calculation - points: {}".format(demand_point_list))
+                    current_power = self.compiled_demand_expr(demand_point_list)
                     _log.debug("Demand calculation - calculated power: {}".format(current_power))
                 except:
                     current_power = float(data[self.power_point])
@@ -897,41 +881,89 @@ class ILCAgent(Agent):
         self.action_end = self.current_time + self.action_time
         self.next_confirm = self.current_time + self.confirm_time
 
-        for device in remaining_devices:
-            device_name, device_id, actuator = device
-            action_info = self.control_container.get_device((device_name, actuator)).get_control_info(device_id, self.state)
-            _log.debug("State: {} - action info: {} - device {}, {} -- remaining {}".format(self.state, action_info, device_name, device_id, remaining_devices))
-            if action_info is None:
-                continue
-            control_pt, control_value, control_load, revert_priority, revert_value = self.determine_curtail_parms(action_info, device)
+        while remaining_devices and not self.kill_signal_received:
+            # Take the next devices in score order, up to actuator_concurrency
+            # or until their configured loads cover what is still needed, and
+            # read the points their curtail parameters depend on together.
+            candidates = []
+            planned_curtailed = est_curtailed
+            while remaining_devices and len(candidates) < self.actuator_concurrency:
+                device = remaining_devices.pop(0)
+                device_name, device_id, actuator = device
+                action_info = self.control_container.get_device((device_name, actuator)).get_control_info(device_id, self.state)
+                _log.debug("State: {} - action info: {} - device {}, {} -- remaining {}".format(self.state, action_info, device_name, device_id, remaining_devices))
+                if action_info is None:
+                    continue
+                candidates.append((device, action_info, self.curtail_reads(action_info)))
+                if not isinstance(action_info["load"], dict):
+                    planned_curtailed += action_info["load"]
+                    if planned_curtailed >= need_curtailed:
+                        break
 
-            try:
-                if self.kill_signal_received:
+            if not candidates:
+                break
+            reads = [(device[2], "get_point", (point,))
+                     for device, action_info, device_reads in candidates for kind, arg, point in device_reads]
+            responses = self.dispatch_actuator_calls(reads)
+            self.publish_actuator_latency("get_point", [args[0] for actuator, method, args in reads], responses)
+            if self.kill_signal_received:
+                break
+
+            # Command the candidates in score order until their estimated load
+            # covers what is still needed.  The rest are returned to the front
+            # of remaining_devices and devices whose command fails are
+            # replaced in the next pass.
+            commands = []
+            planned_curtailed = est_curtailed
+            index = 0
+            for position, (device, action_info, device_reads) in enumerate(candidates):
+                if commands and planned_curtailed >= need_curtailed:
+                    remaining_devices[0:0] = [candidate[0] for candidate in candidates[position:]]
                     break
-                _log.debug("***** ENTER SET POINT *****************")
-                result = self.vip.rpc.call(actuator, "set_point", "ilc_agent", control_pt, control_value).get(timeout=30)
+                device_responses = responses[index:index + len(device_reads)]
+                index += len(device_reads)
+                control_parms = self.determine_curtail_parms(action_info, device, device_responses)
+                if control_parms is None:
+                    _log.warning("Could not determine control value for {}, {}".format(device[0], device[1]))
+                    continue
+                commands.append((device, control_parms))
+                planned_curtailed += control_parms[2]
+
+            if not commands:
+                continue
+            _log.debug("***** ENTER SET POINT *****************")
+            responses = self.dispatch_actuator_calls(
+                [(device[2], "set_point", ("ilc_agent", control_parms[0], control_parms[1]))
+                 for device, control_parms in commands]
+            )
+            self.publish_actuator_latency("set_point", [control_parms[0] for device, control_parms in commands], responses)
+
+            for (device, control_parms), (result, error, latency) in zip(commands, responses):
+                device_name, device_id, actuator = device
+                control_pt, control_value, control_load, revert_priority, revert_value = control_parms
+                if error is not None:
+                    _log.warning("Failed to set {} to {}: {}".format(control_pt, control_value, str(error)))
+                    continue
+
                 prefix = self.update_base_topic.split("/")[0]
                 topic = "/".join([prefix, control_pt, "Actuate"])
                 message = {"Value": control_value, "PreviousValue": revert_value}
                 self.publish_record(topic, message)
-            except RemoteError as ex:
-                _log.warning("Failed to set {} to {}: {}".format(control_pt, control_value, str(ex)))
-                continue
 
-            est_curtailed += control_load
-            self.control_container.get_device((device_name, actuator)).increment_control(device_id)
-            self.devices.append(
-                [
-                    device_name,
-                    device_id,
-                    control_pt,
-                    revert_value,
-                    control_load,
-                    revert_priority,
-                    format_timestamp(self.current_time),
-                    actuator
-                 ]
-            )
+                est_curtailed += control_load
+                self.control_container.get_device((device_name, actuator)).increment_control(device_id)
+                self.devices.append(
+                    [
+                        device_name,
+                        device_id,
+                        control_pt,
+                        revert_value,
+                        control_load,
+                        revert_priority,
+                        format_timestamp(self.current_time),
+                        actuator
+                     ]
+                )
             if est_curtailed >= need_curtailed:
                 break
         self.hold()
@@ -947,6 +979,8 @@ class ILCAgent(Agent):
         end_curtail_time = current_time + self.longest_possible_curtail + self.actuator_schedule_buffer
         end_time_str = format_timestamp(end_curtail_time)
         control_devices = []
+        reserve_devices = []
+        schedule_requests = []
 
         already_handled = dict((device[0], True) for device in self.scheduled_devices)
 
@@ -964,82 +998,166 @@ class ILCAgent(Agent):
                 continue
 
             _log.debug("Reserving device: {}".format(device))
+            reserve_devices.append(item)
             if device in already_handled:
                 if already_handled[device]:
                     _log.debug("Skipping reserve device (previously reserved): " + device)
-                    control_devices.append(item)
                 continue
-
-            schedule_request = [[control_device, start_time_str, end_time_str]]
-            try:
-                if self.kill_signal_received:
-                    break
-                result = self.vip.rpc.call(device_actuator, "request_new_schedule",
-                                           self.agent_id, control_device, "HIGH", schedule_request).get(timeout=30)
-            except RemoteError as ex:
-                _log.warning("Failed to schedule device {} (RemoteError): {}".format(device, str(ex)))
-                continue
-
-            if result is not None and result["result"] == "FAILURE":
+            already_handled[device] = None
+            schedule_requests.append((device, device_actuator, control_device))
+
+        if not reserve_devices or self.kill_signal_received:
+            return control_devices
+
+        responses = self.dispatch_actuator_calls(
+            [(device_actuator, "request_new_schedule",
+              (self.agent_id, control_device, "HIGH", [[control_device, start_time_str, end_time_str]]))
+             for device, device_actuator, control_device in schedule_requests]
+        )
+        self.publish_actuator_latency("request_new_schedule",
+                                      [control_device for device, device_actuator, control_device in schedule_requests],
+                                      responses)
+
+        for (device, device_actuator, control_device), (result, error, latency) in zip(schedule_requests, responses):
+            if error is not None:
+                _log.warning("Failed to schedule device {} ({}): {}".format(device, type(error).__name__, str(error)))
+                already_handled[device] = False
+            elif result is not None and result["result"] == "FAILURE":
                 _log.warn("Failed to schedule device (unavailable) " + device)
                 already_handled[device] = False
             else:
                 already_handled[device] = True
                 self.scheduled_devices.add((device, device_actuator, control_device))
-                control_devices.append(item)
 
+        control_devices.extend(item for item in reserve_devices if already_handled[item[0]])
         return control_devices
 
-    def determine_curtail_parms(self, control, device_dict):
+    def dispatch_actuator_calls(self, calls):
+        """
+        Make actuator rpc calls concurrently, at most actuator_concurrency
+        at a time.  Each call has its own timeout and a failed call does not
+        affect the others.
+        :param calls: list of (actuator, method, args) tuples.
+        :return: list of (result, error, latency in seconds) tuples in the
+        order of calls.  error is None if the call succeeded.
+        """
+        def call(request):
+            actuator, method, args = request
+            start = time.time()
+            try:
+                result = self.vip.rpc.call(actuator, method, *args).get(timeout=self.actuator_timeout)
+                error = None
+            except (RemoteError, gevent.Timeout) as ex:
+                result = None
+                error = ex
+            return result, error, time.time() - start
+
+        if not calls:
+            return []
+        return Pool(self.actuator_concurrency).map(call, calls)
+
+    def publish_actuator_latency(self, method, targets, responses):
+        """
+        Publish the latency of each actuator call made by dispatch_actuator_calls.
+        :param method: actuator method that was called.
+        :param targets: point or device addressed by each call.
+        :param responses: return value of dispatch_actuator_calls.
+        :return:
+        """
+        if not targets:
+            return
+        latency = {}
+        failed = []
+        for target, (result, error, elapsed) in zip(targets, responses):
+            latency[target] = elapsed
+            if error is not None:
+                failed.append(target)
+        try:
+            headers = {headers_mod.DATE: format_timestamp(get_aware_utc_now())}
+            topic = "/".join([self.update_base_topic, self.agent_id, "ActuatorLatency"])
+            message = {
+                "Method": method,
+                "Latency": latency,
+                "MaximumLatency": max(latency.values()),
+                "Failed": failed
+            }
+            self.vip.pubsub.publish("pubsub", topic, headers=headers, message=message).get(timeout=30.0)
+        except Exception as ex:
+            _log.debug("Unable to publish actuator latency: {}".format(str(ex)))
+
+    def curtail_reads(self, control):
+        """
+        Points that must be read from the actuator to determine the curtail
+        parameters of a device.
+        :param control: dictionary containing device control parameters
+        :return: list of (kind, token, point) tuples; kind is "revert",
+        "load" or "equation".
+        """
+        reads = [("revert", None, self.base_rpc_path(path=control["point"]))]
+        if isinstance(control["load"], dict):
+            for load_arg in control["load"]["load_equation_args"]:
+                reads.append(("load", load_arg[0], self.base_rpc_path(path=load_arg[1])))
+        if control["control_method"].lower() == "equation":
+            for eq_arg in control["equation_args"]:
+                reads.append(("equation", eq_arg[0], self.base_rpc_path(path=eq_arg[1])))
+        return reads
+
+    def determine_curtail_parms(self, control, device_dict, responses=None):
         """
         Pull stored curtail parameters for devices.
         :param control: dictionary containing device control parameters
         :param device_dict: tuple containing device
-        :return:
+        :param responses: dispatch_actuator_calls results for the points of
+        curtail_reads(control), in order.  The points are read here if None.
+        :return: curtail parameters or None if the control value cannot be
+        determined.
         """
         device, token, device_actuator = device_dict
-        contol_pt = control["point"]
         control_load = control["load"]
         revert_priority = control["revert_priority"]
         control_method = control["control_method"]
 
-        control_pt = self.base_rpc_path(path=contol_pt)
+        reads = self.curtail_reads(control)
+        if responses is None:
+            responses = self.dispatch_actuator_calls([(device_actuator, "get_point", (point,))
+                                                      for kind, arg, point in reads])
+
+        control_pt = reads[0][2]
+        revert_value = None
+        point_values = {"load": [], "equation": []}
+        failed = set()
+        for (kind, arg, point), (result, error, latency) in zip(reads, responses):
+            if error is not None:
+                failed.add(kind)
+                if kind == "revert":
+                    _log.warning("Failed get point for revert value storage {} ({}): {}".format(point, type(error).__name__, str(error)))
+                elif kind == "load":
+                    _log.warning("Failed get point for load calculation {} ({}): {}".format(point, type(error).__name__, str(error)))
+                else:
+                    _log.warning("Failed get point for control equation {} ({}): {}".format(point, type(error).__name__, str(error)))
+            elif kind == "revert":
+                revert_value = result
+            else:
+                point_values[kind].append((arg, result))
 
         if isinstance(control_load, dict):
-            load_equation = control_load["load_equation"]
-            load_point_values = []
-            for load_arg in control_load["load_equation_args"]:
-                point_to_get = self.base_rpc_path(path=load_arg[1])
-                try:
-                   value = self.vip.rpc.call(device_actuator, "get_point", point_to_get).get(timeout=30)
-                except RemoteError as ex:
-                    _log.warning("Failed get point for load calculation {} (RemoteError): {}".format(point_to_get, str(ex)))
-                    control_load = 0.0
-                    break
-                load_point_values.append((load_arg[0], value))
+            if "load" in failed:
+                control_load = 0.0
+            else:
                 try:
-                    control_load = float(load_equation.subs(load_point_values))
+                    control_load = float(control_load["compiled_load_equation"](point_values["load"]))
                 except:
                     _log.debug("Could not convert expression for load estimation: ")
-
-        try:
-            revert_value = self.vip.rpc.call(device_actuator, "get_point", control_pt).get(timeout=30)
-        except RemoteError as ex:
-            _log.warning("Failed get point for revert value storage {} (RemoteError): {}".format(control_pt, str(ex)))
-            revert_value = None
+                    control_load = 0.0
 
         if control_method.lower() == "offset":
+            if revert_value is None:
+                return None
             control_value = revert_value + control["offset"]
         elif control_method.lower() == "equation":
-            equation = control["control_equation"]
-            equation_point_values = []
-
-            for eq_arg in control["equation_args"]:
-                point_get = self.base_rpc_path(path=eq_arg[1])
-                value = self.vip.rpc.call(device_actuator, "get_point", point_get).get(timeout=30)
-                equation_point_values.append((eq_arg[0], value))
-
-            control_value = float(equation.subs(equation_point_values))
+            if "equation" in failed:
+                return None
+            control_value = float(control["compiled_control_equation"](point_values["equation"]))
         else:
             control_value = control["value"]
 
@@ -1100,32 +1218,35 @@ class ILCAgent(Agent):
         _log.debug("Controlled devices: {}".format(self.devices))
 
         currently_controlled = controlled[::-1]
-        controlled_iterate = currently_controlled[:]
-        index_counter = 0
+        release_group = currently_controlled[:self.device_group_size.pop(0)]
         _log.debug("Controlled devices for release reverse sort: {}".format(currently_controlled))
 
-        for item in range(self.device_group_size.pop(0)):
-            device, device_id, control_pt, revert_val, control_load, revert_priority, modified_time, actuator = controlled_iterate[item]
+        calls = []
+        for controlled_device in release_group:
+            device, device_id, control_pt, revert_val, control_load, revert_priority, modified_time, actuator = controlled_device
             revert_value = self.get_revert_value(device, revert_priority, revert_val)
 
             _log.debug("Returned revert value: {}".format(revert_value))
+            if revert_value is not None:
+                calls.append((actuator, "set_point", ("ilc", control_pt, revert_value)))
+            else:
+                calls.append((actuator, "revert_point", ("ilc", control_pt)))
 
-            try:
-                if revert_value is not None:
-                    result = self.vip.rpc.call(actuator, "set_point", "ilc", control_pt, revert_value).get(timeout=30)
-                    _log.debug("Reverted point: {} to value: {}".format(control_pt, revert_value))
-                else:
-                    result = self.vip.rpc.call(actuator, "revert_point", "ilc", control_pt).get(timeout=30)
-                    _log.debug("Reverted point: {} - Result: {}".format(control_pt, result))
-                if currently_controlled:
-                    _log.debug("Removing from controlled list: {} ".format(controlled_iterate[item]))
-                    self.control_container.get_device((device, actuator)).reset_control_status(device_id)
-                    index = controlled_iterate.index(controlled_iterate[item]) - index_counter
-                    currently_controlled.pop(index)
-                    index_counter += 1
-            except RemoteError as ex:
-                _log.warning("Failed to revert point {} (RemoteError): {}".format(control_pt, str(ex)))
+        responses = self.dispatch_actuator_calls(calls)
+        self.publish_actuator_latency("revert", [controlled_device[2] for controlled_device in release_group], responses)
+
+        for controlled_device, (actuator, method, args), (result, error, latency) in zip(release_group, calls, responses):
+            device, device_id, control_pt = controlled_device[:3]
+            if error is not None:
+                _log.warning("Failed to revert point {} ({}): {}".format(control_pt, type(error).__name__, str(error)))
                 continue
+            if method == "set_point":
+                _log.debug("Reverted point: {} to value: {}".format(control_pt, args[2]))
+            else:
+                _log.debug("Reverted point: {} - Result: {}".format(control_pt, result))
+            _log.debug("Removing from controlled list: {} ".format(controlled_device))
+            self.control_container.get_device((device, actuator)).reset_control_status(device_id)
+            currently_controlled.remove(controlled_device)
         self.devices = currently_controlled
         if self.current_stagger:
             self.next_release = self.current_time + td(minutes=self.current_stagger.pop(0))
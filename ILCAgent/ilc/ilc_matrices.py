@@ -62,16 +62,13 @@ BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
 under Contract DE-AC05-76RL01830
 }}}
 """
-import operator
 import logging
-import math
+import numpy as np
 from volttron.platform.agent import utils
-from collections import defaultdict
-from functools import reduce
 
 utils.setup_logging()
 _log = logging.getLogger(__name__)
-logging.basicConfig(level=logging.debug,
+logging.basicConfig(level=logging.DEBUG,
                     format='%(asctime)s   %(levelname)-8s %(message)s',
                     datefmt='%m-%d-%y %H:%M:%S')
 
@@ -93,21 +90,18 @@ def extract_criteria(filename):
 
     _log.debug("CONFIG_MATRIX: {}".format(config_matrix))
     for state in config_matrix:
-        index_of = dict([(a, i) for i, a in enumerate(config_matrix[state].keys())])
+        criteria_labels[state] = list(config_matrix[state].keys())
+        index_of = dict([(a, i) for i, a in enumerate(criteria_labels[state])])
 
-        criteria_labels[state] = []
-        for label, index in index_of.items():
-            criteria_labels[state].insert(index, label)
-
-        criteria_matrix[state] = [[0.0 for _ in config_matrix[state]] for _ in config_matrix[state]]
+        criteria_matrix[state] = np.zeros((len(index_of), len(index_of)))
         for j in config_matrix[state]:
             row = index_of[j]
-            criteria_matrix[state][row][row] = 1.0
+            criteria_matrix[state][row, row] = 1.0
 
             for k in config_matrix[state][j]:
                 col = index_of[k]
-                criteria_matrix[state][row][col] = float(config_matrix[state][j][k])
-                criteria_matrix[state][col][row] = float(1.0 / criteria_matrix[state][row][col])
+                criteria_matrix[state][row, col] = float(config_matrix[state][j][k])
+                criteria_matrix[state][col, row] = 1.0 / criteria_matrix[state][row, col]
 
     return criteria_labels, criteria_matrix, list(config_matrix.keys())
 
@@ -120,40 +114,25 @@ def calc_column_sums(criteria_matrix):
     """
     cumsum = {}
     for state in criteria_matrix:
-        j = 0
-        cumsum[state] = []
-        while j < len(criteria_matrix[state][0]):
-            col = [float(row[j]) for row in criteria_matrix[state]]
-            cumsum[state].append(sum(col))
-            j += 1
+        cumsum[state] = np.asarray(criteria_matrix[state], dtype=float).sum(axis=0)
     return cumsum
 
 
 def normalize_matrix(criteria_matrix, col_sums):
     """
     Normalizes the members of criteria matrix using the vector
-    col_sums. Returns sums of each row of the matrix.
+    col_sums. Returns the average of each row of the normalized matrix,
+    which are the criteria weights.
     :param criteria_matrix:
     :param col_sums:
     :return:
     """
-    normalized_matrix = {}
     row_sums = {}
     for state in criteria_matrix:
-        normalized_matrix[state] = []
-        row_sums[state] = []
-        i = 0
-        while i < len(criteria_matrix[state]):
-            j = 0
-            norm_row = []
-            while j < len(criteria_matrix[state][0]):
-                norm_row.append(criteria_matrix[state][i][j]/(col_sums[state][j] if col_sums[state][j] != 0 else 1))
-                j += 1
-            row_sum = sum(norm_row)
-            norm_row.append(row_sum/j)
-            row_sums[state].append(row_sum/j)
-            normalized_matrix[state].append(norm_row)
-            i += 1
+        col_sum = np.asarray(col_sums[state], dtype=float)
+        col_sum = np.where(col_sum != 0, col_sum, 1.0)
+        normalized_matrix = np.asarray(criteria_matrix[state], dtype=float) / col_sum
+        row_sums[state] = normalized_matrix.mean(axis=1)
     return row_sums
 
 
@@ -170,36 +149,25 @@ def validate_input(pairwise_matrix, col_sums):
     # Calculate row products and take the 5th root
     _log.info("Validating matrix")
     consistent = True
+    random_index = [0, 0, 0, 0.58, 0.9, 1.12, 1.24, 1.32, 1.41, 1.45, 1.49]
     for state in pairwise_matrix:
-        random_index = [0, 0, 0, 0.58, 0.9, 1.12, 1.24, 1.32, 1.41, 1.45, 1.49]
-        roots = []
-        for row in pairwise_matrix[state]:
-            roots.append(math.pow(reduce(operator.mul, row, 1), 1.0/5))
-        # Sum the vector of products
-        root_sum = sum(roots)
+        roots = np.prod(np.asarray(pairwise_matrix[state], dtype=float), axis=1) ** (1.0/5)
         # Calculate the priority vector
-        priority_vec = []
-        for item in roots:
-            priority_vec.append(item / root_sum)
-
-        # Calculate the priority row
-        priority_row = []
-        for i in range(0, len(col_sums[state])):
-            priority_row.append(col_sums[state][i] * priority_vec[i])
+        priority_vec = roots / roots.sum()
 
         # Sum the priority row
-        priority_row_sum = sum(priority_row)
+        col_sum = np.asarray(col_sums[state], dtype=float)
+        priority_row_sum = np.dot(col_sum, priority_vec)
 
         # Calculate the consistency index
-        ncols = max(len(col_sums[state]) - 1, 1)
-        consistency_index = \
-            (priority_row_sum - len(col_sums[state]))/ncols
+        ncols = max(len(col_sum) - 1, 1)
+        consistency_index = (priority_row_sum - len(col_sum))/ncols
 
         # Calculate the consistency ratio
-        if len(col_sums[state]) < 4:
+        if len(col_sum) < 4:
             consistency_ratio = consistency_index
         else:
-            rindex = random_index[len(col_sums[state])]
+            rindex = random_index[len(col_sum)]
             consistency_ratio = consistency_index / rindex
 
         _log.debug("Pairwise comparison: {} - CR: {}".format(state, consistency_index))
@@ -210,49 +178,42 @@ def validate_input(pairwise_matrix, col_sums):
     return consistent
 
 
-def build_score(_matrix, weight, priority):
+def criteria_weights(row_average, priority):
     """
-    Calculates the curtailment score using the normalized matrix
-    and the weights vector. Returns a sorted vector of weights for each
-    device that is a candidate for curtailment.
-    :param _matrix:
-    :param weight:
-    :param priority:
+    Scale the criteria weights of every state by the cluster priority.
+    Done once when the cluster is configured so scoring is a single
+    matrix-vector product.
+    :param row_average: criteria weights by state from normalize_matrix.
+    :param priority: cluster priority.
     :return:
     """
-    input_keys, input_values = _matrix.keys(), _matrix.values()
-    scores = []
-
-    for input_array in input_values:
-        criteria_sum = sum(i*w for i, w in zip(input_array, weight))
+    return dict((state, np.asarray(weights, dtype=float) * priority) for state, weights in row_average.items())
 
-        scores.append(criteria_sum*priority)
 
-    return zip(scores, input_keys)
+def build_score(_matrix, weights):
+    """
+    Calculates the curtailment score of every device using the normalized
+    input matrix and the weights vector from criteria_weights.
+    :param _matrix: devices x criteria array from input_matrix.
+    :param weights:
+    :return: array of scores in the row order of _matrix.
+    """
+    return np.dot(_matrix, weights)
 
 
 def input_matrix(builder, criteria_labels):
     """
-    Construct input normalized input matrix.
-    :param builder:
+    Construct normalized input matrix.  Each criteria column is divided by
+    its sum over all devices.
+    :param builder: criteria values by device.
     :param criteria_labels:
-    :return:
+    :return: list of devices and devices x criteria array.
     """
-    sum_mat = defaultdict(float)
-    inp_mat = {}
-    label_check = list(list(builder.values())[-1].keys())
+    devices = list(builder.keys())
+    label_check = list(builder[devices[-1]].keys())
     if set(label_check) != set(criteria_labels):
         raise Exception('Input criteria and data criteria do not match.')
-    for device_data in builder.values():
-        for k, v in device_data.items():
-            sum_mat[k] += v
-    for key in builder:
-        inp_mat[key] = mat_list = []
-        for tag in criteria_labels:
-            builder_value = builder[key][tag]
-            if builder_value:
-                mat_list.append(builder_value/sum_mat[tag])
-            else:
-                mat_list.append(0.0)
-
-    return inp_mat
+    values = np.array([[builder[device][tag] for tag in criteria_labels] for device in devices], dtype=float)
+    col_sum = values.sum(axis=0)
+    inp_mat = np.divide(values, col_sum, out=np.zeros_like(values), where=col_sum != 0)
+    return devices, inp_mat
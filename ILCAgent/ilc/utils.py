@@ -64,6 +64,11 @@ under Contract DE-AC05-76RL01830
 """
 
 import re
+from collections import deque
+from datetime import timedelta as td
+from sympy import lambdify
+
+_expression_cache = {}
 
 
 def clean_text(text, rep={" ": ""}):
@@ -124,4 +129,132 @@ def fix_up_point_name(point, default_topic=""):
         return device + '/' + point, device
     elif isinstance(point, str):
         point = clean_text(point)
-        return default_topic + '/' + point, default_topic
\ No newline at end of file
+        return default_topic + '/' + point, default_topic
+
+
+class CompiledExpression(object):
+    """
+    Sympy expression compiled to a Python closure with lambdify.  Calling the
+    object with (point, value) pairs gives the same result as expr.subs() but
+    avoids walking the sympy tree on every evaluation.  Values the closure
+    cannot handle (strings, division by zero, missing points) fall back to
+    expr.subs() so results match the sympy evaluation.
+    """
+    def __init__(self, expr):
+        self.expr = expr
+        symbol_list = sorted(expr.free_symbols, key=str)
+        self.arg_names = [str(symbol) for symbol in symbol_list]
+        try:
+            self.func = lambdify(symbol_list, expr, modules="math")
+        except Exception:
+            self.func = None
+
+    def __call__(self, point_values):
+        values = dict(point_values)
+        if self.func is not None:
+            try:
+                return self.func(*[values[name] for name in self.arg_names])
+            except (KeyError, TypeError, ValueError, ArithmeticError):
+                pass
+        return self.expr.subs(list(values.items()))
+
+
+def compile_expression(expr):
+    """
+    Return the CompiledExpression for expr, building it on first use.
+    Devices sharing a formula share one compiled closure.
+    :param expr: sympy expression
+    :return: CompiledExpression
+    """
+    try:
+        return _expression_cache[expr]
+    except KeyError:
+        compiled = CompiledExpression(expr)
+        _expression_cache[expr] = compiled
+        return compiled
+
+
+def clear_expression_cache():
+    """
+    Drop all compiled expressions.  Called when the configuration is reloaded.
+    """
+    _expression_cache.clear()
+
+
+class RollingPowerAverage(object):
+    """
+    Windowed mean and exponential average of building power, updated in
+    constant time per sample.
+
+    Samples are kept while they span less than window.  Once the window is
+    full each new sample replaces the oldest one.  The exponential average
+    weights the newest sample most, with a smoothing constant of
+    4 / (number of samples + 1), capped at 1.0.  While the number of samples
+    is unchanged the weighted sum is updated recursively.  It is recomputed
+    when the number changes and once every window length of updates, so
+    rounding errors cannot accumulate.
+    """
+    def __init__(self, window):
+        self.window = window
+        self.samples = deque()
+        self.total = 0.0
+        self._weighted = 0.0
+        self._weighted_size = None
+        self._updates = 0
+
+    def __len__(self):
+        return len(self.samples)
+
+    def __iter__(self):
+        return iter(self.samples)
+
+    def add(self, current_time, current_power):
+        """
+        Add a power sample.  Samples with no positive power are ignored.
+        :param current_time: datetime of the sample
+        :param current_power: power
+        :return: time spanned by the samples before this one
+        """
+        if self.samples:
+            average_time = self.samples[-1][0] - self.samples[0][0] + td(seconds=15)
+        else:
+            average_time = td(minutes=0)
+
+        if current_power > 0:
+            removed = None
+            if average_time >= self.window:
+                removed = self.samples.popleft()[1]
+                self.total -= removed
+            self.samples.append((current_time, current_power))
+            self.total += current_power
+            self._update_weighted(current_power, removed)
+        return average_time
+
+    def smoothing_constant(self):
+        smoothing_constant = 2.0 / (len(self.samples) + 1.0) * 2.0 if self.samples else 1.0
+        return smoothing_constant if smoothing_constant <= 1.0 else 1.0
+
+    def _update_weighted(self, current_power, removed):
+        size = len(self.samples)
+        ratio = 1.0 - self.smoothing_constant()
+        self._updates += 1
+        if removed is not None and size == self._weighted_size and self._updates < size:
+            self._weighted = current_power + ratio * self._weighted - removed * ratio ** size
+        else:
+            # Newest sample first.
+            self._weighted = 0.0
+            for power in self.samples:
+                self._weighted = power[1] + ratio * self._weighted
+            self.total = sum(power[1] for power in self.samples)
+            self._weighted_size = size
+            self._updates = 0
+
+    def mean(self):
+        return self.total / len(self.samples) if self.samples else 0.0
+
+    def exponential_average(self):
+        if not self.samples:
+            return 0.0
+        smoothing_constant = self.smoothing_constant()
+        ratio = 1.0 - smoothing_constant
+        return self._weighted * smoothing_constant + self.samples[0][1] * ratio ** len(self.samples)
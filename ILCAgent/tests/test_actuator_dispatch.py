@@ -0,0 +1,262 @@
+import time
+from datetime import datetime, timedelta as td
+
+import pytest
+
+pytest.importorskip("volttron")
+gevent = pytest.importorskip("gevent")
+pytest.importorskip("transitions")
+
+from volttron.platform.jsonrpc import RemoteError
+
+from ilc.ilc_agent import ILCAgent
+
+
+class Result(object):
+    def __init__(self, func):
+        self.greenlet = gevent.spawn(func)
+
+    def get(self, timeout=None):
+        with gevent.Timeout(timeout):
+            return self.greenlet.get()
+
+
+class FakeRpc(object):
+    """
+    Actuator stand-in.  Points in failures raise RemoteError, points in
+    slow never answer in time and devices in unavailable cannot be
+    scheduled.
+    """
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.calls = []
+        self.values = {}
+        self.failures = set()
+        self.slow = set()
+        self.unavailable = set()
+
+    def call(self, actuator, method, *args):
+        self.calls.append((method, args))
+
+        def run():
+            target = args[1] if method in ("set_point", "revert_point", "request_new_schedule") else args[0]
+            gevent.sleep(self.delay)
+            if target in self.slow:
+                gevent.sleep(10)
+            if target in self.failures:
+                raise RemoteError("failed {}".format(target))
+            if method == "request_new_schedule":
+                return {"result": "FAILURE" if target in self.unavailable else "SUCCESS"}
+            if method == "get_point":
+                return self.values.get(target, 70.0)
+            return None
+        return Result(run)
+
+    def points(self, method):
+        return [args[1] for called, args in self.calls if called == method]
+
+
+class FakePubSub(object):
+    def __init__(self):
+        self.published = []
+
+    def publish(self, peer, topic, headers=None, message=None):
+        self.published.append((topic, message))
+        return Result(lambda: None)
+
+
+class FakeVip(object):
+    def __init__(self):
+        self.rpc = FakeRpc()
+        self.pubsub = FakePubSub()
+
+
+class FakeControl(object):
+    def __init__(self, name, load=10.0, control_method="offset"):
+        self.name = name
+        self.load = load
+        self.control_method = control_method
+        self.controlled = 0
+
+    def get_control_info(self, device_id, state):
+        info = {
+            "point": self.name + "/ZoneTemperatureSetPoint",
+            "load": self.load,
+            "revert_priority": None,
+            "control_method": self.control_method,
+            "offset": 2.0,
+            "minimum": None,
+            "maximum": None
+        }
+        if self.control_method == "equation":
+            info["equation_args"] = [["ZoneTemperature", self.name + "/ZoneTemperature"]]
+            info["compiled_control_equation"] = lambda values: dict(values)["ZoneTemperature"] + 0.5
+        return info
+
+    def get_point_device(self, device_id, state):
+        return self.name
+
+    def increment_control(self, device_id):
+        self.controlled += 1
+
+    def reset_control_status(self, device_id):
+        self.controlled -= 1
+
+
+class FakeControlContainer(object):
+    def __init__(self, controls):
+        self.controls = dict((control.name, control) for control in controls)
+
+    def get_device(self, device):
+        return self.controls[device[0]]
+
+    def get_devices_status(self, state):
+        return [(name, name.lower(), "platform.actuator") for name in self.controls]
+
+
+class FakeCriteriaContainer(object):
+    def __init__(self, names):
+        self.names = names
+
+    def get_score_order(self, state):
+        return [(name, name.lower()) for name in self.names]
+
+
+def make_agent(controls):
+    agent = ILCAgent.__new__(ILCAgent)
+    agent.vip = FakeVip()
+    agent.control_container = FakeControlContainer(controls)
+    agent.criteria_container = FakeCriteriaContainer([control.name for control in controls])
+    agent.actuator_concurrency = 20
+    agent.actuator_timeout = 1.0
+    agent.update_base_topic = "record/CAMPUS/BUILDING"
+    agent.record_topic = "record"
+    agent.agent_id = "ILC"
+    agent.current_time = datetime(2020, 7, 1, 12)
+    agent.state = "curtail"
+    agent.control_mode = "dollar"
+    agent.kill_signal_received = False
+    agent.need_actuator_schedule = False
+    agent.scheduled_devices = set()
+    agent.devices = []
+    agent.base_rpc_path = lambda path: path
+    agent.longest_possible_curtail = td(minutes=40)
+    agent.actuator_schedule_buffer = td(minutes=35)
+    agent.action_time = td(minutes=20)
+    agent.confirm_time = td(minutes=5)
+    agent.hold = lambda: None
+    return agent
+
+
+def test_dispatch_keeps_order_and_reports_errors():
+    agent = make_agent([])
+    agent.actuator_timeout = 0.2
+    agent.vip.rpc.failures.add("RTU2/Setpoint")
+    agent.vip.rpc.slow.add("RTU3/Setpoint")
+    calls = [("platform.actuator", "set_point", ("ilc", "RTU{}/Setpoint".format(i), i)) for i in range(1, 5)]
+
+    responses = agent.dispatch_actuator_calls(calls)
+
+    assert len(responses) == 4
+    assert [error is None for result, error, latency in responses] == [True, False, False, True]
+    assert isinstance(responses[1][1], RemoteError)
+    assert isinstance(responses[2][1], gevent.Timeout)
+    assert responses[2][2] >= 0.2
+    assert agent.dispatch_actuator_calls([]) == []
+
+
+def test_dispatch_runs_concurrently():
+    agent = make_agent([])
+    agent.vip.rpc.delay = 0.1
+    calls = [("platform.actuator", "get_point", ("RTU{}/ZoneTemperature".format(i),)) for i in range(20)]
+
+    start = time.time()
+    responses = agent.dispatch_actuator_calls(calls)
+    assert time.time() - start < 0.5
+    assert all(error is None for result, error, latency in responses)
+
+    agent.actuator_concurrency = 1
+    start = time.time()
+    agent.dispatch_actuator_calls(calls[:5])
+    assert time.time() - start >= 0.5
+
+
+def test_actuator_request_filters_reserved_and_failed():
+    controls = [FakeControl(name) for name in ("RTU1", "RTU2", "RTU3", "RTU4")]
+    agent = make_agent(controls)
+    agent.need_actuator_schedule = True
+    agent.scheduled_devices.add(("RTU1", "platform.actuator", "RTU1"))
+    agent.vip.rpc.failures.add("RTU2")
+    agent.vip.rpc.unavailable.add("RTU3")
+    score_order = [
+        ("RTU4", "rtu4", "platform.actuator"),
+        ("RTU1", "rtu1", "platform.actuator"),
+        ("RTU2", "rtu2", "platform.actuator"),
+        ("RTU3", "rtu3", "platform.actuator"),
+        ("RTU4", "rtu4b", "platform.actuator"),
+    ]
+
+    result = agent.actuator_request(score_order)
+
+    assert result == [score_order[0], score_order[1], score_order[4]]
+    assert sorted(agent.vip.rpc.points("request_new_schedule")) == ["RTU2", "RTU3", "RTU4"]
+    assert ("RTU4", "platform.actuator", "RTU4") in agent.scheduled_devices
+    assert ("RTU2", "platform.actuator", "RTU2") not in agent.scheduled_devices
+
+
+def test_modify_load_replaces_failed_devices_in_order():
+    controls = [FakeControl("RTU{}".format(i)) for i in range(1, 7)]
+    controls[4] = FakeControl("RTU5", control_method="equation")
+    agent = make_agent(controls)
+    agent.avg_power = 125.0
+    agent.demand_limit = 100.0
+    rpc = agent.vip.rpc
+    rpc.failures.add("RTU2/ZoneTemperatureSetPoint")
+    rpc.values["RTU1/ZoneTemperatureSetPoint"] = 72.0
+
+    agent.modify_load()
+
+    # RTU1-RTU3 cover 25 kW; RTU2 fails and is replaced by RTU4.
+    assert [device[0] for device in agent.devices] == ["RTU1", "RTU3", "RTU4"]
+    assert agent.devices[0][3] == 72.0
+    assert rpc.points("set_point") == ["RTU1/ZoneTemperatureSetPoint",
+                                       "RTU3/ZoneTemperatureSetPoint",
+                                       "RTU4/ZoneTemperatureSetPoint"]
+    assert [args[2] for method, args in rpc.calls if method == "set_point"][0] == 74.0
+    assert "RTU5/ZoneTemperatureSetPoint" not in [args[0] for method, args in rpc.calls]
+    latency = [message for topic, message in agent.vip.pubsub.published if topic.endswith("ActuatorLatency")]
+    assert {message["Method"] for message in latency} == {"get_point", "set_point"}
+    assert ["RTU2/ZoneTemperatureSetPoint"] in [message["Failed"] for message in latency]
+
+
+def test_modify_load_skips_device_with_failed_equation_read():
+    controls = [FakeControl("RTU1", control_method="equation"), FakeControl("RTU2")]
+    agent = make_agent(controls)
+    agent.avg_power = 105.0
+    agent.demand_limit = 100.0
+    agent.actuator_timeout = 0.2
+    agent.vip.rpc.slow.add("RTU1/ZoneTemperature")
+
+    agent.modify_load()
+
+    assert [device[0] for device in agent.devices] == ["RTU2"]
+
+
+def test_reset_devices_keeps_failed_reverts():
+    controls = [FakeControl("RTU{}".format(i)) for i in range(1, 4)]
+    agent = make_agent(controls)
+    agent.state = "inactive"
+    agent.state_at_actuation = "curtail"
+    agent.current_stagger = []
+    agent.devices = [[control.name, control.name.lower(), control.name + "/ZoneTemperatureSetPoint", 72.0, 10.0,
+                      None, "2020-07-01T12:00:00", "platform.actuator"] for control in controls]
+    agent.device_group_size = [3]
+    agent.vip.rpc.failures.add("RTU2/ZoneTemperatureSetPoint")
+
+    agent.reset_devices()
+
+    assert sorted(agent.vip.rpc.points("revert_point")) == ["RTU1/ZoneTemperatureSetPoint",
+                                                            "RTU2/ZoneTemperatureSetPoint",
+                                                            "RTU3/ZoneTemperatureSetPoint"]
+    assert [device[0] for device in agent.devices] == ["RTU2"]
+    assert agent.lock is False
@@ -0,0 +1,92 @@
+import pytest
+from sympy.parsing.sympy_parser import parse_expr
+
+from ilc.utils import parse_sympy, compile_expression, clear_expression_cache
+
+
+FORMULAS = [
+    ("ZoneTemperature-ZoneCoolingTemperatureSetPoint",
+     {"ZoneTemperature": 74.2, "ZoneCoolingTemperatureSetPoint": 72.0}),
+    ("(SupplyFanSpeed/100.0)**3*FanPower",
+     {"SupplyFanSpeed": 63.5, "FanPower": 7.4}),
+    ("1/(ZoneTemperature-ZoneCoolingTemperatureSetPoint)",
+     {"ZoneTemperature": 72.0, "ZoneCoolingTemperatureSetPoint": 72.0}),
+    ("Abs(ZoneDamperPosition-50.0)+Max(ZoneAirFlow, 100.0)",
+     {"ZoneDamperPosition": 20.0, "ZoneAirFlow": 80.0}),
+    ("ZoneTemperature+0.5", {"ZoneTemperature": 73.1}),
+    ("2809.8*FirstStageCooling-500.0", {"FirstStageCooling": 1}),
+]
+
+CONDITIONS = [
+    (["SupplyFanStatus > 0", "&", "ZoneTemperature > 70.0"],
+     {"SupplyFanStatus": 1, "ZoneTemperature": 71.3}),
+    (["SupplyFanStatus > 0", "|", "ZoneTemperature > 70.0"],
+     {"SupplyFanStatus": 0, "ZoneTemperature": 68.0}),
+    (["FirstStageCooling >= 1"], {"FirstStageCooling": 1}),
+]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_expression_cache()
+    yield
+    clear_expression_cache()
+
+
+@pytest.mark.parametrize("operation, values", FORMULAS)
+def test_formula_parity(operation, values):
+    expr = parse_expr(parse_sympy(operation))
+    expected = expr.subs(list(values.items()))
+    result = compile_expression(expr)(values)
+    if expected.is_finite:
+        assert float(result) == pytest.approx(float(expected))
+    else:
+        assert result == expected
+
+
+@pytest.mark.parametrize("condition, values", CONDITIONS)
+def test_condition_parity(condition, values):
+    expr = parse_expr(parse_sympy(condition, condition=True))
+    expected = expr.subs(list(values.items()))
+    result = compile_expression(expr)(values.items())
+    assert bool(result) == bool(expected)
+
+
+def test_missing_point_matches_subs():
+    expr = parse_expr("ZoneTemperature-ZoneCoolingTemperatureSetPoint")
+    values = {"ZoneTemperature": 74.0}
+    assert compile_expression(expr)(values) == expr.subs(list(values.items()))
+
+
+def test_cache_shared_until_cleared():
+    expr = parse_expr("ZoneTemperature*2")
+    compiled = compile_expression(expr)
+    assert compile_expression(parse_expr("ZoneTemperature*2")) is compiled
+    clear_expression_cache()
+    assert compile_expression(expr) is not compiled
+
+
+def test_control_setting_parity():
+    pytest.importorskip("volttron")
+    from ilc.curtailment_handler import ControlSetting
+
+    setting = ControlSetting("record", None,
+                             point="ZoneTemperatureSetPoint",
+                             control_method="equation",
+                             equation={"operation": "ZoneTemperature+0.5",
+                                       "equation_args": ["ZoneTemperature"],
+                                       "minimum": 69.0,
+                                       "maximum": 77.0},
+                             load={"operation": "2809.8*FirstStageCooling-500.0",
+                                   "equation_args": [["CAMPUS/BUILDING/HP4", "FirstStageCooling"]]},
+                             default_device="CAMPUS/BUILDING/HP4")
+    control = setting.get_control_info()
+
+    equation_values = [(token, 73.1) for token, point in control["equation_args"]]
+    assert float(control["compiled_control_equation"](equation_values)) == \
+        pytest.approx(float(control["control_equation"].subs(equation_values)))
+
+    load = control["load"]
+    load_values = [(token, 1) for token, point in load["load_equation_args"]]
+    assert float(load["compiled_load_equation"](load_values)) == \
+        pytest.approx(float(load["load_equation"].subs(load_values)))
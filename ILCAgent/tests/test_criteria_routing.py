@@ -0,0 +1,99 @@
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("volttron")
+
+from ilc.criteria_handler import CriteriaCluster, CriteriaContainer
+
+
+class Result(object):
+    def get(self, timeout=None):
+        return None
+
+
+class PubSub(object):
+    def __init__(self):
+        self.published = []
+
+    def publish(self, peer, topic, headers=None, message=None):
+        self.published.append(topic)
+        return Result()
+
+
+class Vip(object):
+    def __init__(self):
+        self.pubsub = PubSub()
+
+
+class Parent(object):
+    def __init__(self):
+        self.vip = Vip()
+
+
+def rtu_criteria(rtu):
+    return {
+        rtu.lower(): {
+            "device_topic": "campus/building/" + rtu,
+            "zonetemperature": {
+                "operation_type": "formula",
+                "operation": "ZoneTemperature-ZoneCoolingTemperatureSetPoint",
+                "operation_args": ["ZoneTemperature", "ZoneCoolingTemperatureSetPoint"]
+            },
+            "stage": {
+                "operation_type": "status",
+                "point_name": "FirstStageCooling",
+                "on_value": 1.0
+            },
+            "rated-power": {
+                "operation_type": "constant",
+                "value": 5.0
+            }
+        }
+    }
+
+
+@pytest.fixture
+def parent():
+    return Parent()
+
+
+@pytest.fixture
+def container(parent):
+    cluster_config = dict((rtu, rtu_criteria(rtu)) for rtu in ("RTU1", "RTU2"))
+    cluster = CriteriaCluster(1.0, {}, {}, cluster_config, "record", parent)
+    criteria_container = CriteriaContainer()
+    criteria_container.add_criteria_cluster(cluster)
+    return criteria_container
+
+
+def test_topic_map(container):
+    assert set(container.topic_map) == {
+        "campus/building/RTU1/ZoneTemperature",
+        "campus/building/RTU1/ZoneCoolingTemperatureSetPoint",
+        "campus/building/RTU1/FirstStageCooling",
+        "campus/building/RTU2/ZoneTemperature",
+        "campus/building/RTU2/ZoneCoolingTemperatureSetPoint",
+        "campus/building/RTU2/FirstStageCooling",
+    }
+    assert len(container.topic_map["campus/building/RTU1/ZoneTemperature"]) == 1
+
+
+def test_ingest_data_reaches_referencing_criteria(container, parent):
+    data = {
+        "campus/building/RTU1/ZoneTemperature": 76.0,
+        "campus/building/RTU1/ZoneCoolingTemperatureSetPoint": 72.0,
+        "campus/building/RTU1/FirstStageCooling": 1,
+        "campus/building/RTU1/SupplyFanSpeed": 50.0,
+    }
+    container.ingest_data(datetime(2020, 7, 1, 12), data)
+
+    rtu1 = container.get_device("RTU1").evaluate(("rtu1", "curtail"))
+    rtu2 = container.get_device("RTU2").evaluate(("rtu2", "curtail"))
+    assert rtu1 == {"zonetemperature": 4.0, "stage": 1.0, "rated-power": 5.0}
+    assert rtu2 == {"zonetemperature": 0.0, "stage": 0.0, "rated-power": 5.0}
+    assert sorted(parent.vip.pubsub.published) == [
+        "record/campus/building/RTU1/FirstStageCooling",
+        "record/campus/building/RTU1/ZoneCoolingTemperatureSetPoint",
+        "record/campus/building/RTU1/ZoneTemperature",
+    ]
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("volttron")
+
+from ilc.ilc_matrices import (extract_criteria, calc_column_sums, normalize_matrix, validate_input,
+                              criteria_weights, input_matrix, build_score)
+
+
+# Consistent pairwise comparison: zonetemperature is twice as important as
+# stage and four times as important as rated-power.
+PAIRWISE = {
+    "zonetemperature": {"stage": 2, "rated-power": 4},
+    "stage": {"rated-power": 2},
+    "rated-power": {}
+}
+
+
+def test_criteria_weights():
+    labels, matrix, states = extract_criteria(PAIRWISE)
+    assert states == ["curtail"]
+    assert labels["curtail"] == ["zonetemperature", "stage", "rated-power"]
+    np.testing.assert_allclose(matrix["curtail"], [[1.0, 2.0, 4.0], [0.5, 1.0, 2.0], [0.25, 0.5, 1.0]])
+
+    col_sums = calc_column_sums(matrix)
+    row_average = normalize_matrix(matrix, col_sums)
+    np.testing.assert_allclose(row_average["curtail"], [4.0 / 7, 2.0 / 7, 1.0 / 7])
+    assert validate_input(matrix, col_sums)
+    np.testing.assert_allclose(criteria_weights(row_average, 2.0)["curtail"], [8.0 / 7, 4.0 / 7, 2.0 / 7])
+
+
+def test_build_score():
+    labels = ["zonetemperature", "stage", "rated-power"]
+    evaluations = {
+        ("RTU1", "rtu1"): {"zonetemperature": 1.0, "stage": 0.0, "rated-power": 3.0},
+        ("RTU2", "rtu2"): {"zonetemperature": 3.0, "stage": 2.0, "rated-power": 1.0},
+        ("RTU3", "rtu3"): {"zonetemperature": 0.0, "stage": 0.0, "rated-power": 0.0},
+    }
+    devices, matrix = input_matrix(evaluations, labels)
+    assert devices == list(evaluations.keys())
+    np.testing.assert_allclose(matrix, [[0.25, 0.0, 0.75], [0.75, 1.0, 0.25], [0.0, 0.0, 0.0]])
+
+    scores = build_score(matrix, np.array([0.5, 0.25, 0.25]))
+    np.testing.assert_allclose(scores, [0.3125, 0.6875, 0.0])
+
+
+def test_input_matrix_label_mismatch():
+    with pytest.raises(Exception):
+        input_matrix({("RTU1", "rtu1"): {"stage": 1.0}}, ["zonetemperature"])
@@ -0,0 +1,69 @@
+import random
+from datetime import datetime as dt, timedelta as td
+
+import pytest
+
+from ilc.utils import RollingPowerAverage
+
+
+def list_average(bldg_power, window, current_power, current_time):
+    """Average power as computed from a plain list of samples."""
+    if bldg_power:
+        average_time = bldg_power[-1][0] - bldg_power[0][0] + td(seconds=15)
+    else:
+        average_time = td(minutes=0)
+
+    if average_time >= window and current_power > 0:
+        bldg_power.append((current_time, current_power))
+        bldg_power.pop(0)
+    elif current_power > 0:
+        bldg_power.append((current_time, current_power))
+
+    smoothing_constant = 2.0 / (len(bldg_power) + 1.0) * 2.0 if bldg_power else 1.0
+    smoothing_constant = smoothing_constant if smoothing_constant <= 1.0 else 1.0
+    power_sort = list(bldg_power)
+    power_sort.sort(reverse=True)
+    exp_power = 0
+    for n in range(len(bldg_power)):
+        exp_power += power_sort[n][1] * smoothing_constant * (1.0 - smoothing_constant) ** n
+    exp_power += power_sort[-1][1] * (1.0 - smoothing_constant) ** (len(bldg_power))
+    average_power = sum(i[1] for i in bldg_power) / len(bldg_power)
+    return exp_power, average_power, average_time
+
+
+@pytest.mark.parametrize("window_minutes, step_seconds", [(15, 1), (15, 60), (5, 7), (1, 1)])
+def test_matches_list_average(window_minutes, step_seconds):
+    rng = random.Random(window_minutes * 100 + step_seconds)
+    window = td(minutes=window_minutes)
+    reference = []
+    rolling = RollingPowerAverage(window)
+    current_time = dt(2020, 7, 1, 12)
+    for i in range(3000):
+        current_power = rng.uniform(200.0, 800.0)
+        if i > 0 and rng.random() < 0.02:
+            current_power = 0.0
+        current_time += td(seconds=step_seconds)
+        expected = list_average(reference, window, current_power, current_time)
+        average_time = rolling.add(current_time, current_power)
+        assert average_time == expected[2]
+        assert rolling.exponential_average() == pytest.approx(expected[0], rel=1e-9)
+        assert rolling.mean() == pytest.approx(expected[1], rel=1e-9)
+        assert len(rolling) == len(reference)
+
+
+def test_memory_is_bounded_by_window():
+    rolling = RollingPowerAverage(td(minutes=15))
+    current_time = dt(2020, 7, 1)
+    for _ in range(10000):
+        current_time += td(seconds=1)
+        rolling.add(current_time, 500.0)
+    assert len(rolling) == 15 * 60 - 14
+    assert rolling.mean() == pytest.approx(500.0)
+    assert rolling.exponential_average() == pytest.approx(500.0)
+
+
+def test_empty():
+    rolling = RollingPowerAverage(td(minutes=15))
+    assert rolling.add(dt(2020, 7, 1), 0.0) == td(0)
+    assert rolling.mean() == 0.0
+    assert rolling.exponential_average() == 0.0
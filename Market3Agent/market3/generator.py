@@ -55,11 +55,14 @@
 
 import os
 import sys
+import time
 import logging
 from datetime import datetime
 from dateutil import parser
 import numpy as np
 
+_log = logging.getLogger(__name__)
+
 
 class Generator:
     def __init__(self):
@@ -69,6 +72,11 @@ class Generator:
         self.plower1 = 0.3  # lower bound of power production
         self.pupper1 = 100  # upper bound of power production
         self.ramp = 0.5  # ramp rate constraint
+        # Parametrized problems keyed by
+        # (T, c, plower, pupper, ramp, rc), built on first use.
+        self.problems = {}
+        self.build_time = None
+        self.solve_time = None
 
     def generate_bid(self, T, price_energy, price_reserved):
         lam = price_energy
@@ -80,27 +88,51 @@ class Generator:
 
         return power_supply, reserve_desired
 
-    def generate(self, T, lam, c, plower, pupper, ramp, rc, rp):
+    def build_problem(self, T, c, plower, pupper, ramp, rc):
+        """
+        Build the generator problem with the energy and reserve prices as
+        cvxpy Parameters so it is canonicalized once and re-solved with
+        new prices.
+        :return: (problem, u, r, lam, rp)
+        """
         import cvxpy as cp
 
-        constraints = []
         u = cp.Variable((T, 1))
         r = cp.Variable((T, 1))
+        lam = cp.Parameter((T, 1))
+        rp = cp.Parameter((T, 1))
         objective = cp.Minimize(cp.sum(
             c[0] * u ** 2 + cp.multiply(c[1], u) + rc[0] * r ** 2 + rc[1] * r - cp.multiply(lam, u) - cp.multiply(rp,
                                                                                                                   r)))
-        for i in range(0, T):
+        constraints = [
+            u >= plower,
+            u <= pupper,
+            r >= 0
+        ]
+        if T > 1:
             constraints += [
-                u[i] >= plower,
-                u[i] <= pupper,
-                r[i] >= 0
-            ]
-            if i < T - 1:
-                constraints += [
-                    u[i + 1] - u[i] <= ramp,
-                    u[i] - u[i + 1] <= ramp]
-        prob = cp.Problem(objective, constraints)
-        result = prob.solve(solver=cp.ECOS_BB, verbose=True)
+                u[1:] - u[:-1] <= ramp,
+                u[:-1] - u[1:] <= ramp]
+        return cp.Problem(objective, constraints), u, r, lam, rp
+
+    def generate(self, T, lam, c, plower, pupper, ramp, rc, rp):
+        import cvxpy as cp
+
+        key = (T, tuple(c), plower, pupper, ramp, tuple(rc))
+        if key not in self.problems:
+            start = time.time()
+            self.problems[key] = self.build_problem(T, c, plower, pupper, ramp, rc)
+            self.build_time = time.time() - start
+            _log.debug("Generator problem for T={} built in {:.4f}s".format(T, self.build_time))
+        prob, u, r, lam_param, rp_param = self.problems[key]
+        lam_param.value = np.broadcast_to(lam, (T, 1))
+        rp_param.value = np.broadcast_to(rp, (T, 1))
+
+        start = time.time()
+        prob.solve(solver=cp.ECOS_BB, warm_start=True, verbose=True)
+        self.solve_time = time.time() - start
+        solver_time = prob.solver_stats.solve_time
+        _log.debug("Generator solve took {:.4f}s (solver {}s)".format(self.solve_time, solver_time))
 
         return u.value, r.value
 
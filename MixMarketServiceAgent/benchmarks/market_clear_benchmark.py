@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+#
+# Copyright 2019, Battelle Memorial Institute.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# This material was prepared as an account of work sponsored by an agency of
+# the United States Government. Neither the United States Government nor the
+# United States Department of Energy, nor Battelle, nor any of their
+# employees, nor any jurisdiction or organization that has cooperated in the
+# development of these materials, makes any warranty, express or
+# implied, or assumes any legal liability or responsibility for the accuracy,
+# completeness, or usefulness or any information, apparatus, product,
+# software, or process disclosed, or represents that its use would not
+# infringe privately owned rights. Reference herein to any specific
+# commercial product, process, or service by trade name, trademark,
+# manufacturer, or otherwise does not necessarily constitute or imply its
+# endorsement by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors expressed
+# herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+
+# }}}
+"""
+Market clear-cycle benchmark for the mix market service.
+
+Drives Market, ReservationManager, OfferManager and PolyLineFactory through
+full reservation -> offer -> aggregate -> clear cycles with synthetic
+participants.  No VOLTTRON platform needs to be running; only the volttron
+package has to be importable.
+
+Example:
+
+    python benchmarks/market_clear_benchmark.py --participants 500 5000 \\
+        --points 10 --markets 4 --iterations 5 --json results.json
+
+Phases reported:
+    reservation - Market.make_reservation, per call
+    offer       - Market.make_offer, per call (excludes the offer that
+                  completes the market, which is reported as clear_cycle)
+    clear_cycle - the last Market.make_offer, which aggregates both sides,
+                  settles and publishes the clearing price
+    aggregate   - OfferManager.aggregate_curves for buyers and sellers
+    combine     - PolyLineFactory.combine with --increment steps
+    settle      - OfferManager.settle
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+from volttron.platform.agent.base_market_agent.buy_sell import BUYER, SELLER
+from volttron.platform.agent.base_market_agent.point import Point
+from volttron.platform.agent.base_market_agent.poly_line import PolyLine
+from volttron.platform.agent.base_market_agent.poly_line_factory import PolyLineFactory
+
+from mix_market_service.market import Market
+from mix_market_service.market_participant import MarketParticipant
+from mix_market_service.offer_manager import OfferManager
+
+PERCENTILES = (50, 90, 99)
+
+
+def demand_curve(rng, points, max_price):
+    """
+    Return a downward sloping buyer curve with the given number of points.
+    :param rng: random.Random
+    :param points: int; number of points on the curve
+    :param max_price: float
+    :return: PolyLine
+    """
+    prices = sorted(rng.uniform(0.0, max_price) for _ in range(points))
+    quantities = sorted((rng.uniform(0.0, 100.0) for _ in range(points)), reverse=True)
+    return PolyLine([Point(q, p) for q, p in zip(quantities, prices)])
+
+
+def supply_curve(rng, points, max_price, total_quantity):
+    """
+    Return an upward sloping seller curve with the given number of points.
+    :param rng: random.Random
+    :param points: int; number of points on the curve
+    :param max_price: float
+    :param total_quantity: float; largest quantity offered
+    :return: PolyLine
+    """
+    prices = sorted(rng.uniform(0.0, max_price) for _ in range(points))
+    quantities = sorted(rng.uniform(0.0, total_quantity) for _ in range(points))
+    return PolyLine([Point(q, p) for q, p in zip(quantities, prices)])
+
+
+def build_participants(rng, buyers, sellers, points, max_price):
+    """
+    Create synthetic participants and their curves.
+    :return: list of (MarketParticipant, PolyLine); sellers first
+    """
+    participants = []
+    total_quantity = 100.0 * buyers / max(sellers, 1)
+    for i in range(sellers):
+        participants.append((MarketParticipant(SELLER, 'seller_{}'.format(i)),
+                             supply_curve(rng, points, max_price, total_quantity)))
+    for i in range(buyers):
+        participants.append((MarketParticipant(BUYER, 'buyer_{}'.format(i)),
+                             demand_curve(rng, points, max_price)))
+    return participants
+
+
+def no_publish(*args, **kwargs):
+    pass
+
+
+class PhaseRecorder(object):
+    """
+    Collects latency samples and peak traced memory for each phase.
+    """
+    def __init__(self, trace_memory):
+        self.trace_memory = trace_memory
+        self.samples = {}
+        self.peak_memory = {}
+
+    def record(self, phase, func, *args):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        self.samples.setdefault(phase, []).append(elapsed)
+        if self.trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            self.peak_memory[phase] = max(self.peak_memory.get(phase, 0), peak)
+        return result
+
+    def summary(self):
+        summary = {}
+        for phase, samples in self.samples.items():
+            values = np.array(samples) * 1000.0
+            stats = {'count': len(samples),
+                     'mean_ms': float(values.mean()),
+                     'max_ms': float(values.max())}
+            for pct in PERCENTILES:
+                stats['p{}_ms'.format(pct)] = float(np.percentile(values, pct))
+            if phase in self.peak_memory:
+                stats['peak_traced_kb'] = self.peak_memory[phase] / 1024.0
+            summary[phase] = stats
+        return summary
+
+
+def run_market_cycle(recorder, market_name, participants):
+    """
+    Run one reservation -> offer -> clear cycle through a Market.
+    """
+    first_participant = participants[0][0]
+    market = recorder.record('reservation', Market, market_name, first_participant, no_publish, False)
+    for participant, _ in participants[1:]:
+        recorder.record('reservation', market.make_reservation, participant)
+    market.collect_offers()
+    # The sellers offer first so that the last buyer offer completes
+    # the market and triggers aggregation and clearing.
+    for participant, curve in participants[:-1]:
+        recorder.record('offer', market.make_offer, participant, curve)
+    participant, curve = participants[-1]
+    recorder.record('clear_cycle', market.make_offer, participant, curve)
+    return market
+
+
+def run_offer_manager(recorder, participants, increment):
+    """
+    Time aggregation, combine and settlement on a stand alone OfferManager.
+    """
+    offers = OfferManager()
+    for participant, curve in participants:
+        offers.make_offer(participant.buyer_seller, curve)
+    recorder.record('aggregate', offers.aggregate_curves, BUYER)
+    recorder.record('aggregate', offers.aggregate_curves, SELLER)
+    recorder.record('combine', PolyLineFactory.combine,
+                    [curve for participant, curve in participants if participant.is_buyer()], increment)
+    recorder.record('settle', offers.settle)
+
+
+def run_benchmark(participants, sellers, points, markets, iterations, increment, seed, trace_memory):
+    """
+    Run the benchmark for one participant count.
+    :return: dict; per phase statistics plus the configuration
+    """
+    rng = random.Random(seed)
+    recorder = PhaseRecorder(trace_memory)
+    for iteration in range(iterations):
+        for market_index in range(markets):
+            market_participants = build_participants(rng, participants, sellers, points, 1.0)
+            gc.collect()
+            run_market_cycle(recorder, 'electric_{}'.format(market_index), market_participants)
+            run_offer_manager(recorder, market_participants, increment)
+    return {'participants': participants,
+            'sellers': sellers,
+            'points': points,
+            'markets': markets,
+            'iterations': iterations,
+            'increment': increment,
+            'seed': seed,
+            'phases': recorder.summary()}
+
+
+def print_result(result):
+    print('participants={participants} sellers={sellers} points={points} '
+          'markets={markets} iterations={iterations}'.format(**result))
+    header = '  {:<12} {:>7} {:>10} {:>10} {:>10} {:>10} {:>10}'.format(
+        'phase', 'count', 'p50 ms', 'p90 ms', 'p99 ms', 'max ms', 'peak kB')
+    print(header)
+    for phase, stats in result['phases'].items():
+        print('  {:<12} {:>7} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.3f} {:>10}'.format(
+            phase, stats['count'], stats['p50_ms'], stats['p90_ms'], stats['p99_ms'], stats['max_ms'],
+            '{:.1f}'.format(stats['peak_traced_kb']) if 'peak_traced_kb' in stats else '-'))
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description='Benchmark mix market clearing cycles.')
+    parser.add_argument('--participants', type=int, nargs='+', default=[500, 5000],
+                        help='number of buyers per market, one run per value')
+    parser.add_argument('--sellers', type=int, default=1, help='number of sellers per market')
+    parser.add_argument('--points', type=int, default=10, help='points per offer curve')
+    parser.add_argument('--markets', type=int, default=1, help='markets cleared per iteration')
+    parser.add_argument('--iterations', type=int, default=3, help='clear cycles per market')
+    parser.add_argument('--increment', type=int, default=100, help='steps for PolyLineFactory.combine')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the synthetic curves')
+    parser.add_argument('--no-trace-memory', dest='trace_memory', action='store_false',
+                        help='disable tracemalloc, which slows down every phase')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args(argv)
+
+    # Market logs every clearing at info level.
+    logging.disable(logging.INFO)
+    if args.trace_memory:
+        tracemalloc.start()
+
+    results = []
+    for participants in args.participants:
+        result = run_benchmark(participants, args.sellers, args.points, args.markets,
+                               args.iterations, args.increment, args.seed, args.trace_memory)
+        results.append(result)
+        print_result(result)
+
+    # ru_maxrss is reported in kilobytes on Linux.
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print('peak RSS: {:.1f} MB'.format(peak_rss_kb / 1024.0))
+    if args.json:
+        with open(args.json, 'w') as outfile:
+            json.dump({'peak_rss_kb': peak_rss_kb, 'results': results}, outfile, indent=4)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -227,6 +227,55 @@ class MarketServiceAgent(Agent):
         _log.info("Offer on Market: {} {} made by {} was rejected.".format(market_name, buyer_seller, identity))
         raise RuntimeError("Error: Market service not accepting offers at this time.")
 
+    @RPC.export
+    def make_reservations(self, reservations):
+        """
+        Make many reservations in a single call.
+
+        :param reservations: A list of [market_name, buyer_seller] entries.
+        :return: A list of [accepted, error_message] results, one per entry, in the same order.
+        A rejected entry does not prevent the remaining entries from being processed.
+        """
+        identity = bytes(self.vip.rpc.context.vip_message.peer, "utf8")
+        _log.debug("Received {} reservations from agent {}".format(len(reservations), identity))
+        results = []
+        for market_name, buyer_seller in reservations:
+            try:
+                if self.state == COLLECT_RESERVATIONS:
+                    self.accept_reservation(buyer_seller, identity, market_name)
+                else:
+                    self.reject_reservation(buyer_seller, identity, market_name)
+                results.append([True, None])
+            except Exception as e:
+                results.append([False, str(e)])
+        return results
+
+    @RPC.export
+    def make_offers(self, offers):
+        """
+        Make many offers in a single call.
+
+        :param offers: A list of [market_name, buyer_seller, offer] entries where offer is the curve as a list of
+        (quantity, price) points.
+        :return: A list of [accepted, error_message] results, one per entry, in the same order.
+        A rejected entry does not prevent the remaining entries from being processed.
+        """
+        identity = bytes(self.vip.rpc.context.vip_message.peer, "utf8")
+        _log.debug("Received {} offers from agent {}".format(len(offers), identity))
+        results = []
+        for market_name, buyer_seller, offer in offers:
+            try:
+                if self.state == COLLECT_OFFERS:
+                    self.accept_offer(buyer_seller, identity, market_name, offer)
+                else:
+                    self.reject_offer(buyer_seller, identity, market_name, offer)
+                results.append([True, None])
+            except Exception as e:
+                _log.info("Offer on Market: {} {} made by {} failed: {}".format(market_name, buyer_seller,
+                                                                               identity, e))
+                results.append([False, str(e)])
+        return results
+
     def has_any_markets(self):
         unformed_markets = self.market_list.unformed_market_list()
         return len(unformed_markets) < self.market_list.market_count()
@@ -39,7 +39,7 @@
 import logging
 
 from volttron.platform.agent import utils
-from volttron.platform.agent.base_market_agent.buy_sell import BUYER
+from volttron.platform.agent.base_market_agent.buy_sell import BUYER, SELLER
 from volttron.platform.agent.base_market_agent.poly_line import PolyLine
 from volttron.platform.agent.base_market_agent.poly_line_factory import PolyLineFactory
 
@@ -51,6 +51,9 @@ class OfferManager(object):
     def __init__(self):
         self._buy_offers = []
         self._sell_offers = []
+        # Aggregate curve for each side, reset whenever that side
+        # receives an offer.
+        self._aggregates = {}
         self.increment = 100
 
     def make_offer(self, buyer_seller, curve):
@@ -58,16 +61,19 @@ class OfferManager(object):
             self._buy_offers.append(curve)
         else:
             self._sell_offers.append(curve)
+        self._aggregates.pop(buyer_seller, None)
 
     def aggregate_curves(self, buyer_seller):
-        if (buyer_seller == BUYER):
-            curve = self._aggregate(self._buy_offers)
-        else:
-            curve = self._aggregate(self._sell_offers)
+        curve = self._aggregates.get(buyer_seller)
+        if curve is None:
+            if (buyer_seller == BUYER):
+                curve = self._aggregate(self._buy_offers)
+            else:
+                curve = self._aggregate(self._sell_offers)
+            self._aggregates[buyer_seller] = curve
         return curve
 
     def _aggregate(self, collection):
-#        curve = PolyLineFactory.combine(collection, self.increment)
         curve = PolyLineFactory.combine_withoutincrement(collection)
         return curve
 
@@ -75,22 +81,23 @@ class OfferManager(object):
         enough_buys = len(self._buy_offers) > 0
         enough_sells = len(self._sell_offers) > 0
         if enough_buys:
-            demand_curve = self._aggregate(self._buy_offers)
+            demand_curve = self.aggregate_curves(BUYER)
         else:
             _log.debug("There are no buy offers.")
         if enough_sells:
-            supply_curve = self._aggregate(self._sell_offers)
+            supply_curve = self.aggregate_curves(SELLER)
         else:
             _log.debug("There are no sell offers.")
 
         if enough_buys and enough_sells:
             intersection = PolyLine.intersection(demand_curve, supply_curve)
+            aux = PolyLine.compare(demand_curve, supply_curve)
         else:
             intersection = None, None, {}
+            aux = {}
 
         quantity = intersection[0]
         price = intersection[1]
-        aux = PolyLine.compare(demand_curve, supply_curve)
 
         return quantity, price, aux
 
@@ -55,12 +55,14 @@
 
 import os
 import sys
+import hashlib
 import logging
 from collections import defaultdict, OrderedDict
 from datetime import datetime as dt, timedelta as td
 from dateutil import parser
 
 import json
+from gevent.pool import Pool
 from scipy.optimize import lsq_linear
 from volttron.platform.vip.agent import Agent, Core, PubSub, RPC
 from volttron.platform.agent import utils
@@ -501,6 +503,19 @@ class RegressionAgent(Agent):
             self.start = config.get('start')
             self.end = config.get('end')
 
+        # Historian query concurrency and on-disk cache of query results.
+        self.max_concurrent_queries = int(config.get("max_concurrent_queries", 8))
+        self.cache_dir = config.get("historian_cache_dir", "historian_cache")
+        if self.cache_dir:
+            self.cache_dir = os.path.join(WORKING_DIR, os.path.expanduser(self.cache_dir))
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+            except OSError as ex:
+                _log.warning("Cannot create historian cache %s: %s", self.cache_dir, ex)
+                self.cache_dir = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+
         self.coefficient_results = {}
         self.exec_start = None
         _log.debug("Validate historian running vip: %s - platform %s",
@@ -646,7 +661,14 @@ class RegressionAgent(Agent):
         # iterate for each device or subdevice in the device list
         for name, device in self.device_list.items():
             self.exec_start = utils.get_aware_utc_now()
+            self.cache_hits = 0
+            self.cache_misses = 0
             df = self.query_historian(device.input_data)
+            _log.info("Historian cache for %s: %s hits, %s misses",
+                      name, self.cache_hits, self.cache_misses)
+            if df is None:
+                _log.debug("ERROR no historian data for %s", name)
+                continue
             df = self.localize_df(df, name)
             result = self.regression_list[name].regression_main(df, name)
             if result is None:
@@ -671,77 +693,123 @@ class RegressionAgent(Agent):
         """
         self.vip.pubsub.publish("pubsub", topic, {}, result).get(timeout=10)
 
+    def query_windows(self):
+        """
+        Build the list of (start, end) historian query windows for the
+        regression period.  Currently 8 hours is the maximum interval that
+        the historian will support for one minute data (1000 max records
+        per query).  If exclude_weekends_holidays is True windows that fall
+        on weekends or holidays are skipped to reduce rpc calls and
+        message bus traffic.
+        :return: list of (datetime, datetime)
+        """
+        windows = []
+        end = self.end.astimezone(UTC_TZ)
+        rpc_start = self.start
+        rpc_end = rpc_start + td(hours=8)
+        while rpc_start < end:
+            if not self.exclude_weekends_holidays or \
+                    not is_weekend_holiday(rpc_start, rpc_end, self.local_tz):
+                windows.append((rpc_start, rpc_end))
+            rpc_start = rpc_start + td(hours=8)
+            rpc_end = min(rpc_start + td(minutes=479), end)
+        return windows
+
+    def cache_path(self, topic, rpc_start_str, rpc_end_str):
+        """
+        Return the on-disk cache file for one historian query.
+        :param topic: str; historian topic
+        :param rpc_start_str: str; query start
+        :param rpc_end_str: str; query end
+        :return: str; file path
+        """
+        key = '|'.join([self.external_platform, self.data_source, topic, rpc_start_str, rpc_end_str])
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+    def query_chunk(self, topic, rpc_start, rpc_end):
+        """
+        Return the historian values for topic between rpc_start and rpc_end.
+        Chunks that are already on disk are read from the cache, otherwise
+        the historian is queried and non-empty results are cached.
+        :param topic: str; historian topic
+        :param rpc_start: datetime
+        :param rpc_end: datetime
+        :return: list of [timestamp, value]
+        """
+        rpc_start_str = format_timestamp(rpc_start)
+        rpc_end_str = format_timestamp(rpc_end)
+        path = self.cache_path(topic, rpc_start_str, rpc_end_str) if self.cache_dir else None
+        if path is not None and os.path.isfile(path):
+            try:
+                with open(path, 'r') as cache_file:
+                    values = json.load(cache_file)
+                self.cache_hits += 1
+                return values
+            except (IOError, ValueError) as ex:
+                _log.debug("Ignoring unreadable cache file %s: %s", path, ex)
+        self.cache_misses += 1
+        _log.debug("RPC start {} - RPC end {} - topic {}".format(rpc_start_str, rpc_end_str, topic))
+        # Currently historian is limited to 1000 records per query.
+        result = self.vip.rpc.call(self.data_source,
+                                   'query',
+                                   topic=topic,
+                                   start=rpc_start_str,
+                                   end=rpc_end_str,
+                                   order='FIRST_TO_LAST',
+                                   count=1000,
+                                   external_platform=self.external_platform).get(timeout=300)
+        if not result or not result.get("values"):
+            return []
+        values = result["values"]
+        # Only cache complete windows, data for a window that has not
+        # ended yet may still change.
+        if path is not None and rpc_end <= get_aware_utc_now():
+            try:
+                with open(path, 'w') as cache_file:
+                    json.dump(values, cache_file)
+            except IOError as ex:
+                _log.debug("Could not write cache file %s: %s", path, ex)
+        return values
+
     def query_historian(self, device_info):
         """
         Query VOLTTRON historian for all points in device_info
         for regression period.  All data will be combined and aggregated
-        to a common interval (i.e., 1Min).
+        to a common interval (i.e., 1Min).  Queries for all topics and
+        windows are run concurrently (up to max_concurrent_queries).
         :param device_info: dict; {regression token: query topic}
         :return:
         """
-        aggregated_df = None
-        rpc_start = self.start
-        rpc_end = rpc_start + td(hours=8)
-        # get data via query to historian
-        # Query loop for device will continue until start > end
-        # or all data for regression period is obtained.
-        while rpc_start < self.end.astimezone(pytz.UTC):
-            df = None
-            # If exclude_weekend_holidays is True then do not query for
-            # these times.  Reduces rpc calls and message bus traffic.
-            if self.exclude_weekends_holidays:
-                if is_weekend_holiday(rpc_start, rpc_end, self.local_tz):
-                    rpc_start = rpc_start + td(hours=8)
-                    rpc_end = rpc_start + td(minutes=479)
-                    if rpc_end > self.end.astimezone(UTC_TZ):
-                        rpc_end = self.end.astimezone(UTC_TZ)
-                    continue
-
-            for token, topic in device_info.items():
-                rpc_start_str = format_timestamp(rpc_start)
-                rpc_end_str = format_timestamp(rpc_end)
-                _log.debug("RPC start {} - RPC end {} - topic {}".format(rpc_start_str, rpc_end_str, topic))
-                # Currently historian is limited to 1000 records per query.
-                result = self.vip.rpc.call(self.data_source,
-                                           'query',
-                                           topic=topic,
-                                           start=rpc_start_str,
-                                           end=rpc_end_str,
-                                           order='FIRST_TO_LAST',
-                                           count=1000,
-                                           external_platform=self.external_platform).get(timeout=300)
-                _log.debug(result)
-                if not bool(result) or "values" not in result or \
-                        ("values" in result and not bool(result["values"])):
-                    _log.debug('ERROR: empty RPC return for '
-                               'coefficient *%s* at %s', token, rpc_start)
-                    break
-                # TODO:  check if enough data is present and compensate for significant missing data
-                data = pd.DataFrame(result['values'], columns=['Date', token])
-                data['Date'] = pd.to_datetime(data['Date'])
-                # Data is aggregated to some common frequency.
-                # This is important if data has different seconds/minutes.
-                # For minute trended data this is set to 1Min.
-                data = data.groupby([pd.Grouper(key='Date', freq=self.data_aggregation_frequency)]).mean()
-                df = data if df is None else pd.merge(df, data, how='outer', left_index=True, right_index=True)
-
-            if aggregated_df is None:
-                aggregated_df = df
-            else:
-                aggregated_df = aggregated_df.append(df)
-
-            # Currently 8 hours is the maximum interval that the historian
-            # will support for one minute data.  1000 max records can be
-            # returned per query and each query has 2 fields timestamp, value.
-            # Note:  If trending is at sub-minute interval this logic would
-            # need to be revised to account for this or the count in historian
-            # could be increased.
-            rpc_start = rpc_start + td(hours=8)
-            if rpc_start + td(minutes=479) <= self.end.astimezone(pytz.UTC):
-                rpc_end = rpc_start + td(minutes=479)  #
-            else:
-                rpc_end = self.end.astimezone(pytz.UTC)
-        return aggregated_df
+        windows = self.query_windows()
+        tasks = [(token, topic, rpc_start, rpc_end)
+                 for token, topic in device_info.items()
+                 for rpc_start, rpc_end in windows]
+        pool = Pool(self.max_concurrent_queries)
+        results = pool.map(lambda task: self.query_chunk(*task[1:]), tasks)
+
+        values = defaultdict(list)
+        for (token, topic, rpc_start, rpc_end), result in zip(tasks, results):
+            if not result:
+                _log.debug('ERROR: empty RPC return for '
+                           'coefficient *%s* at %s', token, rpc_start)
+                continue
+            values[token].extend(result)
+
+        # TODO:  check if enough data is present and compensate for significant missing data
+        frames = []
+        for token in device_info:
+            if not values[token]:
+                continue
+            data = pd.DataFrame(values[token], columns=['Date', token])
+            data['Date'] = pd.to_datetime(data['Date'])
+            # Data is aggregated to some common frequency.
+            # This is important if data has different seconds/minutes.
+            # For minute trended data this is set to 1Min.
+            data = data.groupby([pd.Grouper(key='Date', freq=self.data_aggregation_frequency)]).mean()
+            frames.append(data)
+        if not frames:
+            return None
+        return pd.concat(frames, axis=1, join='outer')
 
     def localize_df(self, df, device):
         """
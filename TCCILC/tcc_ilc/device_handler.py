@@ -2,7 +2,7 @@ import logging
 import re
 from dateutil.parser import parse
 from sympy.parsing.sympy_parser import parse_expr
-from sympy import symbols
+from sympy import symbols, lambdify
 from volttron.platform.agent.utils import setup_logging
 
 __version__ = "0.2"
@@ -45,6 +45,31 @@ def parse_sympy(data, condition=False):
         return_data = clean_text(data)
     return return_data
 
+class CompiledExpression(object):
+    """
+    Lambdified form of a sympy expression, called with (point, value) pairs in
+    place of expr.subs().  Mirrors ilc.utils.CompiledExpression; TCCILC is
+    packaged separately from ILCAgent so it keeps its own copy.
+    """
+    def __init__(self, expr):
+        self.expr = expr
+        symbol_list = sorted(expr.free_symbols, key=str)
+        self.arg_names = [str(symbol) for symbol in symbol_list]
+        try:
+            self.func = lambdify(symbol_list, expr, modules="math")
+        except Exception:
+            self.func = None
+
+    def __call__(self, point_values):
+        values = dict(point_values)
+        if self.func is not None:
+            try:
+                return self.func(*[values[name] for name in self.arg_names])
+            except (KeyError, TypeError, ValueError, ArithmeticError):
+                pass
+        return self.expr.subs(list(values.items()))
+
+
 def init_schedule(schedule):
     _schedule = {}
     if schedule:
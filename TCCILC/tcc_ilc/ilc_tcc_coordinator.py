@@ -71,7 +71,9 @@ import uuid
 from dateutil.parser import parse
 import numpy as np
 
-from tcc_ilc.device_handler import ClusterContainer, DeviceClusters, parse_sympy, init_schedule, check_schedule
+from tcc_ilc.device_handler import (ClusterContainer, DeviceClusters, CompiledExpression, parse_sympy,
+                                    init_schedule, check_schedule)
+from sympy.parsing.sympy_parser import parse_expr
 import pandas as pd
 from volttron.platform.agent import utils
 from volttron.platform.messaging import topics, headers as headers_mod
@@ -138,6 +140,20 @@ class TransactiveIlcCoordinator(MarketAgent):
         power_token = config["power_meter"]
         power_meter = power_token["device"]
         self.power_point = power_token["point"]
+        demand_formula = power_token.get("demand_formula")
+        self.demand_expr = None
+        self.demand_args = []
+        if demand_formula is not None:
+            try:
+                _log.debug("Demand calculation - expression: {}".format(demand_formula["operation"]))
+                self.demand_expr = CompiledExpression(parse_expr(parse_sympy(demand_formula["operation"])))
+                self.demand_args = parse_sympy(demand_formula["operation_args"])
+            except (KeyError, ValueError):
+                _log.debug("Missing 'operation_args' or 'operation' for setting demand formula!")
+                self.demand_expr = None
+            except:
+                _log.debug("Unexpected error when reading demand formula parameters!")
+                self.demand_expr = None
         self.current_time = None
         self.power_meter_topic = topics.DEVICES_VALUE(campus=campus,
                                                       building=building,
@@ -346,6 +362,25 @@ class TransactiveIlcCoordinator(MarketAgent):
         _log.debug("DEBUG TCC - pos {} - neg {}".format(positive_power, negative_power))
         return float(current_power + sum(positive_power)), float(current_power - sum(negative_power))
 
+    def calculate_demand(self, data):
+        """
+        Building demand from the configured demand_formula, falling back to
+        the power meter point when no formula is configured or it cannot be
+        evaluated.
+        :param data: power meter device data
+        :return: current building power
+        """
+        if self.demand_expr is not None:
+            try:
+                current_power = float(self.demand_expr([(point, data[point]) for point in self.demand_args]))
+                _log.debug("Demand calculation - calculated power: {}".format(current_power))
+                return current_power
+            except:
+                current_power = data[self.power_point]
+                _log.debug("Demand calculation - exception using meter value: {}".format(current_power))
+                return current_power
+        return data[self.power_point]
+
     def load_message_handler(self, peer, sender, bus, topic, headers, message):
         """
         Call back method for building power meter. Calculates the average
@@ -361,7 +396,7 @@ class TransactiveIlcCoordinator(MarketAgent):
         """
         # Use instantaneous power or average building power.
         data = message[0]
-        current_power = data[self.power_point]
+        current_power = self.calculate_demand(data)
         tz_info = dateutil.tz.gettz(self.tz)
         current_time = parse(headers["Date"]).astimezone(tz_info)
 
@@ -0,0 +1,45 @@
+import pytest
+from sympy.parsing.sympy_parser import parse_expr
+
+pytest.importorskip("volttron")
+pytest.importorskip("pandas")
+coordinator = pytest.importorskip("tcc_ilc.ilc_tcc_coordinator")
+
+from tcc_ilc.device_handler import CompiledExpression, parse_sympy
+
+
+def make_coordinator(demand_formula=None):
+    agent = coordinator.TransactiveIlcCoordinator.__new__(coordinator.TransactiveIlcCoordinator)
+    agent.power_point = "WholeBuildingPower"
+    agent.demand_expr = None
+    agent.demand_args = []
+    if demand_formula is not None:
+        agent.demand_expr = CompiledExpression(parse_expr(parse_sympy(demand_formula["operation"])))
+        agent.demand_args = parse_sympy(demand_formula["operation_args"])
+    return agent
+
+
+FORMULA = {
+    "operation": "WholeBuildingPower-PVPower",
+    "operation_args": ["WholeBuildingPower", "PVPower"]
+}
+
+
+def test_meter_point_without_formula():
+    agent = make_coordinator()
+    assert agent.calculate_demand({"WholeBuildingPower": 120.0, "PVPower": 30.0}) == 120.0
+
+
+def test_formula_matches_subs():
+    agent = make_coordinator(FORMULA)
+    data = {"WholeBuildingPower": 120.0, "PVPower": 30.5}
+    expected = float(parse_expr(parse_sympy(FORMULA["operation"])).subs(list(data.items())))
+    result = agent.calculate_demand(data)
+    assert isinstance(result, float)
+    assert result == pytest.approx(expected)
+
+
+def test_formula_falls_back_to_meter():
+    agent = make_coordinator(FORMULA)
+    assert agent.calculate_demand({"WholeBuildingPower": 120.0}) == 120.0
+    assert agent.calculate_demand({"WholeBuildingPower": 120.0, "PVPower": "bad"}) == 120.0
@@ -90,6 +90,7 @@ from .vertex import Vertex
 from .interval_value import IntervalValue
 from .timer import Timer
 from .tcc_model import TccModel
+from .signal_codec import signal_to_json
 
 utils.setup_logging()
 _log = logging.getLogger(__name__)
@@ -144,6 +145,7 @@ class BuildingAgent(MarketAgent, myTransactiveNode):
         self.campus_supply_topic = "{}/campus/{}/supply".format(self.db_topic, self.name)
         self.system_loss_topic = "{}/{}/system_loss".format(self.db_topic, self.name)
         self.dc_threshold_topic = "{}/{}/dc_threshold_topic".format(self.db_topic, self.name)
+        self.convergence_topic = "{}/{}/market_convergence".format(self.db_topic, self.name)
 
         self.mix_market_running = False
         verbose_logging = self.config.get('verbose_logging', True)
@@ -213,7 +215,7 @@ class BuildingAgent(MarketAgent, myTransactiveNode):
                                                                             start_of_cycle))
 
         db_topic = "/".join([self.db_topic, self.name, "CampusSupply"])
-        message = supply_curves
+        message = signal_to_json(self.campus.model.receivedSignal)
         headers = {headers_mod.DATE: format_timestamp(Timer.get_cur_time())}
         self.vip.pubsub.publish("pubsub", db_topic, headers, message).get()
 
@@ -269,6 +271,7 @@ class BuildingAgent(MarketAgent, myTransactiveNode):
         market = self.markets[0]  # Assume only 1 TNS market per node
         market.signal_new_data = True
         market.balance(self)
+        self.publish_balance_diagnostics(market)
 
         # Check if now is near the end of the hour, applicable only if not in simulation mode
         now = Timer.get_cur_time()
@@ -310,10 +313,18 @@ class BuildingAgent(MarketAgent, myTransactiveNode):
                                                      "temp": temps,
                                                      "Date": format_timestamp(now)})
 
+    def publish_balance_diagnostics(self, market):
+        message = market.balance_diagnostics()
+        message['current_time'] = format_timestamp(Timer.get_cur_time())
+        self.vip.pubsub.publish(peer='pubsub',
+                                topic=self.convergence_topic,
+                                message=message)
+
     def balance_market(self, run_cnt):
         market = self.markets[0]  # Assume only 1 TNS market per node
         market.new_data_signal = True
         market.balance(self)
+        self.publish_balance_diagnostics(market)
 
         if market.converged:
             _log.debug("TNS market {} balanced successfully.".format(market.name))
@@ -593,6 +604,7 @@ class BuildingAgent(MarketAgent, myTransactiveNode):
         market = self.markets[0]  # Assume only 1 TNS market per node
         market.signal_new_data = True
         market.balance(self)
+        self.publish_balance_diagnostics(market)
 
         # Check if now is near the end of the hour, applicable only if not in simulation mode
         now = Timer.get_cur_time()
@@ -113,6 +113,7 @@ class CampusAgent(Agent, myTransactiveNode):
         self.solar_topic = "/".join([self.db_topic, "campus/pv"])
         self.system_loss_topic = "{}/{}/system_loss".format(self.db_topic, self.name)
         self.dc_threshold_topic = "{}/{}/dc_threshold_topic".format(self.db_topic, self.name)
+        self.convergence_topic = "{}/{}/market_convergence".format(self.db_topic, self.name)
         self.price_topic = "{}/{}/marginal_prices".format(self.db_topic, self.name)
 
         self.reschedule_interval = timedelta(minutes=10, seconds=1)
@@ -174,10 +175,18 @@ class CampusAgent(Agent, myTransactiveNode):
         if start_of_cycle:
             self.balance_market(1, start_of_cycle, fail_to_converged)
 
+    def publish_balance_diagnostics(self, market):
+        message = market.balance_diagnostics()
+        message['current_time'] = format_timestamp(Timer.get_cur_time())
+        self.vip.pubsub.publish(peer='pubsub',
+                                topic=self.convergence_topic,
+                                message=message)
+
     def balance_market(self, run_cnt, start_of_cycle=False, fail_to_converged=False, fail_to_converged_neighbor=None):
         market = self.markets[0]  # Assume only 1 TNS market per node
         market.signal_new_data = True
         market.balance(self)  # Assume only 1 TNS market per node
+        self.publish_balance_diagnostics(market)
 
         if market.converged:
             _log.debug("TNS market {} balanced successfully.".format(market.name))
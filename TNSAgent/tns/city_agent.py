@@ -110,6 +110,7 @@ class CityAgent(Agent, myTransactiveNode):
         self.city_supply_topic = "{}/city/campus/supply".format(self.db_topic)
         self.system_loss_topic = "{}/{}/system_loss".format(self.db_topic, self.name)
         self.dc_threshold_topic = "{}/{}/dc_threshold_topic".format(self.db_topic, self.name)
+        self.convergence_topic = "{}/{}/market_convergence".format(self.db_topic, self.name)
         self.price_topic = "{}/{}/marginal_prices".format(self.db_topic, self.name)
 
         self.reschedule_interval = timedelta(minutes=10, seconds=1)
@@ -185,6 +186,7 @@ class CityAgent(Agent, myTransactiveNode):
         # Balance
         market = self.markets[0]  # Assume only 1 TNS market per node
         market.balance(self)
+        self.publish_balance_diagnostics(market)
         prices = market.marginalPrices
         prices = prices[-25:]
         prices = [x.value for x in prices]
@@ -218,10 +220,18 @@ class CityAgent(Agent, myTransactiveNode):
 
         self.balance_market(1)
 
+    def publish_balance_diagnostics(self, market):
+        message = market.balance_diagnostics()
+        message['current_time'] = format_timestamp(Timer.get_cur_time())
+        self.vip.pubsub.publish(peer='pubsub',
+                                topic=self.convergence_topic,
+                                message=message)
+
     def balance_market(self, run_cnt):
         market = self.markets[0]  # Assume only 1 TNS market per node
         market.signal_new_data = True
         market.balance(self)
+        self.publish_balance_diagnostics(market)
 
         if market.converged:
             # Sum all the powers as will be needed by the net supply/demand curve.
@@ -61,6 +61,10 @@ import math
 import logging
 from datetime import datetime, timedelta
 
+import numpy as np
+
+from .interval_value import IntervalValueList
+
 # from volttron.platform.agent import utils
 # utils.setup_logging()
 # _log = logging.getLogger(__name__)
@@ -88,11 +92,15 @@ def get_duration_in_hour(dur):
 
 
 def find_objs_by_ti(items, ti):
+    if isinstance(items, IntervalValueList):
+        return items.find_all_by_ti(ti)
     found_items = [x for x in items if x.timeInterval.startTime == ti.startTime]
     return found_items
 
 
 def find_obj_by_ti(items, ti):
+    if isinstance(items, IntervalValueList):
+        return items.find_by_ti(ti)
     found_items = [x for x in items if x.timeInterval.startTime == ti.startTime]
     return found_items[0] if len(found_items) > 0 else None
 
@@ -387,6 +395,115 @@ def production(obj, price, ti):
                     return p1
 
 
+def vertex_arrays(objs, tis):
+    # Pack the active vertices of several objects in several time intervals
+    # into arrays so that production() and prod_cost_from_vertices() can be
+    # evaluated for all of them at once. Vertices are ordered as by
+    # order_vertices(). Unused slots are padded with nan.
+    #
+    # objs - list of asset or neighbor models
+    # tis - list of time intervals
+    # [mp, pwr, cost] - marginal prices, powers and production costs of the
+    # vertices, arrays of shape (len(objs), len(tis), max vertex count)
+    # [cnt] - number of vertices, array of shape (len(objs), len(tis))
+    starts = dict((ti.startTime, j) for j, ti in enumerate(tis))
+    vertices = [[[] for ti in tis] for obj in objs]
+    for i, obj in enumerate(objs):
+        for iv in obj.activeVertices:
+            j = starts.get(iv.timeInterval.startTime)
+            if j is not None:
+                vertices[i][j].append(iv.value)
+
+    # Keep room for at least one segment so that empty segment arrays never occur.
+    m = max([len(v) for row in vertices for v in row] + [2])
+    mp = np.full((len(objs), len(tis), m), np.nan)
+    pwr = np.full((len(objs), len(tis), m), np.nan)
+    cost = np.full((len(objs), len(tis), m), np.nan)
+    cnt = np.zeros((len(objs), len(tis)), dtype=int)
+    for i in range(len(objs)):
+        for j in range(len(tis)):
+            v = order_vertices(vertices[i][j])
+            cnt[i, j] = len(v)
+            mp[i, j, :len(v)] = [x.marginalPrice for x in v]
+            pwr[i, j, :len(v)] = [x.power for x in v]
+            cost[i, j, :len(v)] = [x.cost for x in v]
+    return mp, pwr, cost, cnt
+
+
+def _first_match(match, values):
+    # Pick the value at the first True entry of match along the last axis, nan if there is none.
+    found = match.any(axis=-1)
+    index = np.argmax(match, axis=-1)[..., np.newaxis]
+    return np.where(found, np.take_along_axis(values, index, axis=-1)[..., 0], np.nan)
+
+
+def production_arrays(mp, pwr, cnt, prices):
+    # Vectorized production(). Finds the power of every object at every
+    # marginal price in every time interval.
+    #
+    # mp, pwr, cnt - vertex arrays from vertex_arrays()
+    # prices - marginal prices, array of shape (len(tis), number of prices)
+    # [p] - powers, array of shape (len(objs), len(tis), number of prices)
+    #
+    # Every object must have at least one vertex in every time interval.
+    x = prices[np.newaxis, :, :, np.newaxis]
+    mp = mp[:, :, np.newaxis, :]
+    pwr = pwr[:, :, np.newaxis, :]
+    last = np.maximum(cnt - 1, 0)[:, :, np.newaxis, np.newaxis]
+    mp_last = np.take_along_axis(mp, last, axis=-1)[..., 0]
+    pwr_last = np.take_along_axis(pwr, last, axis=-1)[..., 0]
+
+    # Segments between successive vertices, tested in order as production() does.
+    lo, hi = mp[..., :-1], mp[..., 1:]
+    p_lo, p_hi = pwr[..., :-1], pwr[..., 1:]
+    valid = np.arange(mp.shape[-1] - 1) < (cnt - 1)[:, :, np.newaxis, np.newaxis]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        between = valid & (lo <= x) & (x < hi)
+        at_lo = valid & (x == lo)
+        vertical = at_lo & (lo == hi)
+        segment = np.where(between, p_lo + (x - lo) * (p_hi - p_lo) / (hi - lo),
+                           np.where(vertical, p_hi, p_lo))
+        segment = _first_match(between | at_lo, segment)
+
+    x = x[..., 0]
+    p = np.where(x >= mp_last, pwr_last, segment)
+    p = np.where(x < mp[..., 0], pwr[..., 0], p)
+    return np.where((cnt == 1)[:, :, np.newaxis], pwr[..., 0], p)
+
+
+def prod_cost_arrays(mp, pwr, cost, cnt, powers, dur):
+    # Vectorized prod_cost_from_vertices(). Infers the production cost of
+    # every object at every power in every time interval.
+    #
+    # mp, pwr, cost, cnt - vertex arrays from vertex_arrays()
+    # powers - array of shape (len(objs), len(tis), number of powers)
+    # dur - durations of the time intervals [h], array of shape (len(tis),)
+    # [c] - production costs [$], same shape as powers
+    x = powers[..., np.newaxis]
+    mp = mp[:, :, np.newaxis, :]
+    pwr = pwr[:, :, np.newaxis, :]
+    cost = cost[:, :, np.newaxis, :]
+    dur = dur[np.newaxis, :, np.newaxis, np.newaxis]
+    last = np.maximum(cnt - 1, 0)[:, :, np.newaxis, np.newaxis]
+    pwr_last = np.take_along_axis(pwr, last, axis=-1)[..., 0]
+    cost_last = np.take_along_axis(cost, last, axis=-1)[..., 0]
+
+    lo, hi = pwr[..., :-1], pwr[..., 1:]
+    valid = np.arange(pwr.shape[-1] - 1) < (cnt - 1)[:, :, np.newaxis, np.newaxis]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        between = valid & (lo <= x) & (x < hi)
+        a1 = mp[..., :-1] * (x - lo) * dur
+        a2 = np.where(hi == lo, 0.0,
+                      (mp[..., 1:] - mp[..., :-1]) / (hi - lo) * (x - lo) ** 2 * dur)
+        segment = _first_match(between, cost[..., :-1] + a1 + a2)
+
+    x = x[..., 0]
+    c = np.where(x >= pwr_last, cost_last, segment)
+    c = np.where(x <= pwr[..., 0], cost[..., 0], c)
+    c = np.where((cnt == 1)[:, :, np.newaxis], cost[..., 0], c)
+    return np.where(x < 0.0, 0.0, c)
+
+
 def are_different1(s, r, threshold, calling_neighbor=''):
     # Returns true is two sets of TransactiveRecord objects,
     # representing sent and received messages in a time interval, are
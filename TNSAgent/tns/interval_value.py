@@ -78,5 +78,81 @@ class IntervalValue:
         pass
 
 
+class IntervalValueList(list):
+    """
+    A list of IntervalValue instances indexed by the start time of their TimeInterval.
+    find_by_ti() replaces the linear helpers.find_obj_by_ti() scan with a dictionary lookup. The index is kept up to
+    date by append() and rebuilt on the first lookup after any other change to the list.
+    """
+    def __init__(self, items=()):
+        super(IntervalValueList, self).__init__(items)
+        self._ti_index = None
+
+    def _invalidate(self):
+        self._ti_index = None
+
+    def _build_ti_index(self):
+        self._ti_index = {}
+        for iv in self:
+            self._ti_index.setdefault(iv.timeInterval.startTime, []).append(iv)
+
+    def find_by_ti(self, ti):
+        # The first IntervalValue in the time interval, like find_obj_by_ti()
+        if self._ti_index is None:
+            self._build_ti_index()
+        found_items = self._ti_index.get(ti.startTime)
+        return found_items[0] if found_items else None
+
+    def find_all_by_ti(self, ti):
+        if self._ti_index is None:
+            self._build_ti_index()
+        return list(self._ti_index.get(ti.startTime, []))
+
+    def append(self, iv):
+        super(IntervalValueList, self).append(iv)
+        if self._ti_index is not None:
+            self._ti_index.setdefault(iv.timeInterval.startTime, []).append(iv)
+
+    def extend(self, items):
+        super(IntervalValueList, self).extend(items)
+        self._invalidate()
+
+    def insert(self, index, iv):
+        super(IntervalValueList, self).insert(index, iv)
+        self._invalidate()
+
+    def remove(self, iv):
+        super(IntervalValueList, self).remove(iv)
+        self._invalidate()
+
+    def pop(self, *args):
+        iv = super(IntervalValueList, self).pop(*args)
+        self._invalidate()
+        return iv
+
+    def clear(self):
+        del self[:]
+
+    def sort(self, *args, **kwargs):
+        super(IntervalValueList, self).sort(*args, **kwargs)
+        self._invalidate()
+
+    def reverse(self):
+        super(IntervalValueList, self).reverse()
+        self._invalidate()
+
+    def __setitem__(self, index, value):
+        super(IntervalValueList, self).__setitem__(index, value)
+        self._invalidate()
+
+    def __delitem__(self, index):
+        super(IntervalValueList, self).__delitem__(index)
+        self._invalidate()
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+
 if __name__ == '__main__':
     iv = IntervalValue()
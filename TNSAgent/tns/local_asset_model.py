@@ -63,7 +63,7 @@ from volttron.platform.agent import utils
 
 from .model import Model
 from .vertex import Vertex
-from .interval_value import IntervalValue
+from .interval_value import IntervalValue, IntervalValueList
 from .measurement_type import MeasurementType
 from .helpers import *
 from .market import Market
@@ -101,9 +101,9 @@ class LocalAssetModel(Model, object):
     def __init__(self):
         super(LocalAssetModel, self).__init__()
         self.engagementCost = [0.0, 0.0, 0.0]  # [engagement, hold, disengagement][$]
-        self.engagementSchedule = []  # IntervalValue.empty
+        self.engagementSchedule = IntervalValueList()  # IntervalValue.empty
         self.informationServices = []  # InformationService.empty
-        self.transitionCosts = []  # IntervalValue.empty  # values are [$]
+        self.transitionCosts = IntervalValueList()  # IntervalValue.empty  # values are [$]
 
         # Default power values for each time interval
         self.default_powers = []
@@ -193,8 +193,8 @@ class LocalAssetModel(Model, object):
 
         # Gather the active time intervals ti
         time_intervals = mkt.timeIntervals
-        time_interval_values = [t.startTime for t in time_intervals]
-        self.scheduledPowers = [x for x in self.scheduledPowers if x.timeInterval.startTime in time_interval_values]
+        time_interval_values = set(t.startTime for t in time_intervals)
+        self.scheduledPowers = IntervalValueList(x for x in self.scheduledPowers if x.timeInterval.startTime in time_interval_values)
 
         time_intervals.sort(key=lambda x: x.startTime)
 
@@ -241,8 +241,8 @@ class LocalAssetModel(Model, object):
 
         # Gather the active time intervals ti
         time_intervals = mkt.timeIntervals  # active TimeIntervals
-        time_interval_values = [t.startTime for t in time_intervals]
-        self.engagementSchedule = [x for x in self.engagementSchedule if x.timeInterval.startTime in time_interval_values]
+        time_interval_values = set(t.startTime for t in time_intervals)
+        self.engagementSchedule = IntervalValueList(x for x in self.engagementSchedule if x.timeInterval.startTime in time_interval_values)
 
         # Index through the active time intervals ti
         for i in range(len(time_intervals)):
@@ -295,8 +295,8 @@ class LocalAssetModel(Model, object):
 
         # Gather the active time intervals ti
         time_intervals = mkt.timeIntervals  # active TimeIntervals
-        time_interval_values = [t.startTime for t in time_intervals]
-        self.reserveMargins = [x for x in self.reserveMargins if x.timeInterval.startTime in time_interval_values]
+        time_interval_values = set(t.startTime for t in time_intervals)
+        self.reserveMargins = IntervalValueList(x for x in self.reserveMargins if x.timeInterval.startTime in time_interval_values)
 
         # Index through active time intervals ti
         for i in range(len(time_intervals)):
@@ -410,8 +410,8 @@ class LocalAssetModel(Model, object):
 
         # Gather active time intervals
         time_intervals = mkt.timeIntervals
-        time_interval_values = [t.startTime for t in time_intervals]
-        self.transitionCosts = [x for x in self.transitionCosts if x.timeInterval.startTime in time_interval_values]
+        time_interval_values = set(t.startTime for t in time_intervals)
+        self.transitionCosts = IntervalValueList(x for x in self.transitionCosts if x.timeInterval.startTime in time_interval_values)
 
         # Ensure that ti is ordered by time interval start times
         time_intervals.sort(key=lambda x: x.startTime)
@@ -466,8 +466,8 @@ class LocalAssetModel(Model, object):
 
         # Gather the active time intervals ti
         time_intervals = mkt.timeIntervals
-        time_interval_values = [t.startTime for t in time_intervals]
-        self.dualCosts = [x for x in self.dualCosts if x.timeInterval.startTime in time_interval_values]
+        time_interval_values = set(t.startTime for t in time_intervals)
+        self.dualCosts = IntervalValueList(x for x in self.dualCosts if x.timeInterval.startTime in time_interval_values)
 
         # Index through the time intervals ti
         for i in range(1, len(time_intervals)):
@@ -522,8 +522,8 @@ class LocalAssetModel(Model, object):
 
         # Gather active time intervals ti
         time_intervals = mkt.timeIntervals
-        time_interval_values = [t.startTime for t in time_intervals]
-        self.productionCosts = [x for x in self.productionCosts if x.timeInterval.startTime in time_interval_values]
+        time_interval_values = set(t.startTime for t in time_intervals)
+        self.productionCosts = IntervalValueList(x for x in self.productionCosts if x.timeInterval.startTime in time_interval_values)
 
         # Index through the active time interval ti
         for i in range(1, len(time_intervals)):
@@ -588,8 +588,8 @@ class LocalAssetModel(Model, object):
 
         # Gather active time intervals
         ti = mkt.timeIntervals  # active TimeIntervals
-        time_interval_values = [t.startTime for t in ti]
-        self.activeVertices = [x for x in self.activeVertices if x.timeInterval.startTime in time_interval_values]
+        time_interval_values = set(t.startTime for t in ti)
+        self.activeVertices = IntervalValueList(x for x in self.activeVertices if x.timeInterval.startTime in time_interval_values)
 
         # Index through active time intervals ti
         for i in range(len(ti)):
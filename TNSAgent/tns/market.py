@@ -61,12 +61,14 @@ import gevent
 from datetime import datetime, timedelta
 import logging
 
+import numpy as np
+
 from volttron.platform.agent import utils
 
 from .vertex import Vertex
 from .helpers import *
 from .measurement_type import MeasurementType
-from .interval_value import IntervalValue
+from .interval_value import IntervalValue, IntervalValueList
 from .meter_point import MeterPoint
 from .market_state import MarketState
 from .time_interval import TimeInterval
@@ -93,20 +95,20 @@ class Market:
         self.method = 2  # Calculation method {1: subgradient, 2: interpolation}
         self.marketOrder = 1  # ordering of sequential markets [pos. integer]
 
-        self.activeVertices = []  # IntervalValue.empty  # values are vertices
+        self.activeVertices = IntervalValueList()  # IntervalValue.empty  # values are vertices
         self.blendedPrices1 = []  # IntervalValue.empty  # future
         self.blendedPrices2 = []  # IntervalValue.empty  # future
 
         self.defaultPrice = 0.05  # [$/kWh]
-        self.dualCosts = []  # IntervalValue.empty  # values are [$]
+        self.dualCosts = IntervalValueList()  # IntervalValue.empty  # values are [$]
         self.dualityGapThreshold = 0.01  # [dimensionless, 0.01 = 1#]
-        self.netPowers = []  # IntervalValue.empty  # values are [avg.kW]
-        self.marginalPrices = []  # IntervalValue.empty  # values are [$/kWh]
-        self.productionCosts = []  # IntervalValue.empty  # values are [$]
+        self.netPowers = IntervalValueList()  # IntervalValue.empty  # values are [avg.kW]
+        self.marginalPrices = IntervalValueList()  # IntervalValue.empty  # values are [$/kWh]
+        self.productionCosts = IntervalValueList()  # IntervalValue.empty  # values are [$]
 
-        self.totalDemand = []  # IntervalValue.empty  # [avg.kW]
+        self.totalDemand = IntervalValueList()  # IntervalValue.empty  # [avg.kW]
         self.totalDualCost = 0.0  # [$]
-        self.totalGeneration = []  # IntervalValue.empty  # [avg.kW]
+        self.totalGeneration = IntervalValueList()  # IntervalValue.empty  # [avg.kW]
         self.totalProductionCost = 0.0  # [$]
 
         self.marketClearingInterval = timedelta(hours=1)  # [h]
@@ -119,6 +121,10 @@ class Market:
 
         self.new_data_signal = False
 
+        # Convergence diagnostics of the last call to balance()
+        self.balanceIterations = 0
+        self.balanceResiduals = IntervalValueList()  # values are net power / gross power [dimensionless]
+
     def assign_system_vertices(self, mtn):
         # Collect active vertices from neighbor and asset models
         # and reassign them with aggregate system information for all active time intervals.
@@ -133,7 +139,7 @@ class Market:
         # include meaningful, accurate production-cost information.
         # - There is agreement locally and in the network concerning the format
         # and content of transactive records
-        # - Calls method mkt.sum_vertices in each time interval.
+        # - Calls method mkt.sum_vertex_arrays for all time intervals at once.
         #
         # INPUTS:
         # mtn - myTransactiveNode object
@@ -147,27 +153,22 @@ class Market:
         #   total production)).
         # - power: system net power at the vertex (The system "clears" where
         #   system net power is zero.)
+        # - Returns the system vertex arrays from mkt.sum_vertex_arrays.
 
-        time_interval_values = [t.startTime for t in self.timeIntervals]
-        # Delete any active vertices that are not in active time intervals. This
-        # prevents time intervals from accumulating indefinitely.
-        self.activeVertices = [x for x in self.activeVertices if x.timeInterval.startTime in time_interval_values]
-
-        for ti in self.timeIntervals:
-            # Find and delete existing aggregate active vertices in the indexed
-            # time interval. These shall be recreated.
-            self.activeVertices = [x for x in self.activeVertices if x.timeInterval.startTime != ti.startTime]
+        # All aggregate active vertices are recreated. This also removes those
+        # of time intervals that are no longer active.
+        mps, powers, costs = self.sum_vertex_arrays(mtn, self.timeIntervals)
 
-            # Call the utility method mkt.sum_vertices to recreate the
-            # aggregate vertices in the indexed time interval. (This method is
-            # separated out because it will be used by other methods.)
-            s_vertices = self.sum_vertices(mtn, ti)
-
-            # Create and store interval values for each new aggregate vertex v
-            for sv in s_vertices:
+        self.activeVertices = IntervalValueList()
+        for i, ti in enumerate(self.timeIntervals):
+            # Create and store interval values for each new aggregate vertex
+            for k in range(int(np.sum(~np.isnan(mps[i])))):
+                sv = Vertex(float(mps[i, k]), float(costs[i, k]), float(powers[i, k]))
                 iv = IntervalValue(self, ti, self, MeasurementType.SystemVertex, sv)
                 self.activeVertices.append(iv)
 
+        return mps, powers, costs
+
     def balance(self, mtn):
         """
         Balance current market
@@ -240,6 +241,9 @@ class Market:
             # Gather active time intervals ti
             tis = self.timeIntervals  # TimeIntervals
 
+            # Record the relative power imbalance of each active time interval.
+            self.update_balance_residuals()
+
             # A parameter is used to determine how the computational agent
             # searches for marginal prices.
             #
@@ -265,78 +269,52 @@ class Market:
             # intervals and scheduling of the individual Neighbors and LocalAssets.
             # This method might fail when many assets do complex scheduling of
             # their flexibilty.
+            #
+            # Either method updates the marginal prices of all active time
+            # intervals at once.
+
+            # Find the marginal price interval values of the active time intervals.
+            mps = [find_obj_by_ti(self.marginalPrices, ti) for ti in tis]
+
+            # Extract their marginal price values.
+            xlamda = np.array([mp.value for mp in mps], dtype=float)  # [$/kWh]
 
-            if self.method == 2:
-                self.assign_system_vertices(mtn)
+            if self.method == 1:
+                # Update the marginal prices using subgradient search.
+                # Time intervals with unknown imbalance keep their prices.
+                residuals = np.nan_to_num(self.balance_residuals(tis))
+                xlamda = xlamda - (residuals * 1e-1) / (10 + k)  # [$/kWh]
+
+            elif self.method == 2:
+                av_mps, av_powers, _ = self.assign_system_vertices(mtn)
                 av = [(x.timeInterval.name, x.value.marginalPrice, x.value.power) for x in self.activeVertices]
                 _log.debug("{} market active vertices are: {}".format(self.name, av))
 
-            # Index through active time intervals.
-            for i in range(len(tis)):
-                # Find the marginal price interval value for the
-                # corresponding indexed time interval.
-                mp = find_obj_by_ti(self.marginalPrices, tis[i])
-
-                # Extract its  marginal price value.
-                xlamda = mp.value  # [$/kWh]
-
-                if self.method == 1:
-                    # Find the net power corresponding to the indexed time interval.
-                    np = find_obj_by_ti(self.netPowers, tis[i])
-                    tg = find_obj_by_ti(self.totalGeneration, tis[i])
-                    td = find_obj_by_ti(self.totalDemand, tis[i])
-
-                    np = np.value / (tg.value - td.value)
-
-                    # Update the marginal price using subgradient search.
-                    xlamda = xlamda - (np * 1e-1) / (10 + k)  # [$/kWh]
-
-                elif self.method == 2:
-                    # Get the indexed active system vertices
-                    av = [x.value for x in self.activeVertices if x.timeInterval.startTime == tis[i].startTime]
-
-                    # Order the system vertices in the indexed time interval
-                    av = order_vertices(av)
-
-                    try:
-                        # Find the vertex that bookcases the balance point from the lower side.
-                        # Fix a case where all intersection points are on X-axis by using < instead of <=
-                        lower_av = [x for x in av if x.power < 0]
-                        if len(lower_av) == 0:
-                            err_msg = "At {}, there is no point having power < 0".format(tis[i].name)
-                        else:
-                            lower_av = lower_av[-1]
-
-                        # Find the vertex that bookcases the balance point from the upper side.
-                        upper_av = [x for x in av if x.power >= 0]
-                        if len(upper_av) == 0:
-                            err_msg = "At {}, there is no point having power >= 0".format(tis[i].name)
-                        else:
-                            upper_av = upper_av[0]
-
-                        # Interpolate the marginal price in the interval using a
-                        # principle of similar triangles.
-                        power_range = upper_av.power - lower_av.power
-                        mp_range = upper_av.marginalPrice - lower_av.marginalPrice
-                        if power_range == 0:
-                            err_msg = "At {}, power range is 0".format(tis[i].name)
-                        xlamda = - mp_range * lower_av.power / power_range + lower_av.marginalPrice
-                    except:
-                        _log.error(err_msg)
-                        _log.error("{} failed to find balance point. "
-                                   "Market active vertices: {}".format(mtn.name,
-                                                                       [(tis[i].name, x.marginalPrice, x.power)
-                                                                        for x in av]))
-
-                        self.converged = False
-                        return
-
-                # Regardless of the method used, variable "xlamda" should now hold
-                # the updated marginal price. Assign it to the marginal price
-                # value for the indexed active time interval.
-                mp.value = xlamda  # [$/kWh]
+                xlamda, failed = self.interpolate_prices(av_mps, av_powers)
+
+                if len(failed) > 0:
+                    # Marginal prices are updated up to the first time interval
+                    # that failed to find its balance point.
+                    i = failed[0]
+                    for mp, x in zip(mps[:i], xlamda[:i]):
+                        mp.value = float(x)
+                    _log.error("{} failed to find balance point. "
+                               "Market active vertices: {}".format(mtn.name,
+                                                                   [(tis[i].name, x.marginalPrice, x.power)
+                                                                    for x in find_objs_by_ti(self.activeVertices,
+                                                                                             tis[i])]))
+                    self.balanceIterations = k
+                    self.converged = False
+                    return
+
+            # Regardless of the method used, variable "xlamda" should now hold
+            # the updated marginal prices. Assign them to the marginal price
+            # values of the active time intervals.
+            for mp, x in zip(mps, xlamda):
+                mp.value = float(x)  # [$/kWh]
 
             # Increment the iteration counter.
+            self.balanceIterations = k
             k = k + 1
             if k == 100:
                 self.converged = True
@@ -345,6 +323,80 @@ class Market:
                 self.converged = False
                 return
 
+    def interpolate_prices(self, mps, powers):
+        # Interpolate the balance point of the net power curve in all active
+        # time intervals at once, using a principle of similar triangles
+        # between the system vertices that bookcase zero net power.
+        #
+        # INPUTS:
+        # mps, powers - system vertex arrays from sum_vertex_arrays()
+        #
+        # OUTPUTS:
+        # [xlamda] - balancing marginal prices [$/kWh], one per time interval
+        # [failed] - indices of time intervals without a balance point
+
+        # Order the system vertices by marginal price and power. Padding sorts last.
+        order = np.lexsort((powers, mps), axis=1)
+        mps = np.take_along_axis(mps, order, axis=1)
+        powers = np.take_along_axis(powers, order, axis=1)
+        rows = np.arange(len(mps))
+
+        # Find the vertex that bookcases the balance point from the lower side.
+        # Use < instead of <= for a case where all intersection points are on X-axis.
+        below = powers < 0
+        lower = powers.shape[1] - 1 - np.argmax(below[:, ::-1], axis=1)
+
+        # Find the vertex that bookcases the balance point from the upper side.
+        above = powers >= 0
+        upper = np.argmax(above, axis=1)
+
+        power_range = powers[rows, upper] - powers[rows, lower]
+        mp_range = mps[rows, upper] - mps[rows, lower]
+
+        failed = ~below.any(axis=1) | ~above.any(axis=1) | (power_range == 0)
+        for i in np.flatnonzero(failed):
+            if not below[i].any():
+                _log.error("At {}, there is no point having power < 0".format(self.timeIntervals[i].name))
+            elif not above[i].any():
+                _log.error("At {}, there is no point having power >= 0".format(self.timeIntervals[i].name))
+            else:
+                _log.error("At {}, power range is 0".format(self.timeIntervals[i].name))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xlamda = - mp_range * powers[rows, lower] / power_range + mps[rows, lower]
+        return xlamda, np.flatnonzero(failed)
+
+    def update_balance_residuals(self):
+        # Update the relative power imbalance (net power / (total generation -
+        # total demand)) of each active time interval. Time intervals without
+        # supply and demand sums are skipped. The residuals and the balance
+        # iteration count are published by the agents as convergence
+        # diagnostics.
+        self.balanceResiduals = IntervalValueList()
+        residuals = self.balance_residuals(self.timeIntervals)
+        for ti, r in zip(self.timeIntervals, residuals):
+            if not np.isnan(r):
+                self.balanceResiduals.append(IntervalValue(self, ti, self, MeasurementType.Unknown, float(r)))
+
+    def balance_residuals(self, tis):
+        # Relative power imbalance of time intervals tis as an array. nan where
+        # it is unknown.
+        residuals = np.full(len(tis), np.nan)
+        for i, ti in enumerate(tis):
+            np_ = find_obj_by_ti(self.netPowers, ti)
+            tg = find_obj_by_ti(self.totalGeneration, ti)
+            td = find_obj_by_ti(self.totalDemand, ti)
+            if np_ is not None and tg is not None and td is not None and tg.value != td.value:
+                residuals[i] = np_.value / (tg.value - td.value)
+        return residuals
+
+    def balance_diagnostics(self):
+        # Convergence diagnostics of the last call to balance() for publishing.
+        return {'converged': self.converged,
+                'iterations': self.balanceIterations,
+                'residuals': [{'timeInterval': x.timeInterval.name, 'residual': x.value}
+                              for x in self.balanceResiduals]}
+
     def calculate_blended_prices(self):
         # Calculate the blended prices for active time intervals.
         #
@@ -394,7 +446,7 @@ class Market:
 
         elif len(ti) < len(pc):
             _log.warning('Removing primal costs that are not among active time intervals.')
-            self.productionCosts = [x for x in self.productionCosts if x.timeInterval in self.timeIntervals]
+            self.productionCosts = IntervalValueList(x for x in self.productionCosts if x.timeInterval in self.timeIntervals)
 
         for i in range(len(ti)):
             pc = find_obj_by_ti(self.productionCosts, ti[i])
@@ -477,7 +529,7 @@ class Market:
 
         # Clean up the list of active marginal prices. Remove any active
         # marginal prices that are not in active time intervals.
-        self.marginalPrices = [x for x in self.marginalPrices if x.timeInterval in ti]
+        self.marginalPrices = IntervalValueList(x for x in self.marginalPrices if x.timeInterval in ti)
 
         # Index through active time intervals ti
         for i in range(len(ti)):
@@ -747,6 +799,63 @@ class Market:
 
         return vertices
 
+    def sum_vertex_arrays(self, mtn, tis, ote=None):
+        # Create system vertices for several time intervals at once. This is
+        # the vectorized counterpart of sum_vertices() and follows the same
+        # rules for choosing the marginal prices of the vertices.
+        #
+        # INPUTS:
+        # mtn - myTransactiveNode object
+        # tis - list of time intervals
+        # ote - optional neighbor or asset model to exclude
+        #
+        # OUTPUTS:
+        # [mps, powers, costs] - marginal prices [$/kWh], net powers [avg.kW]
+        # and production costs [$] of the system vertices, arrays of shape
+        # (len(tis), max vertex count). The vertices of each time interval are
+        # ordered by marginal price and padded with nan.
+        models = [x.model for x in mtn.neighbors + mtn.localAssets if ote is None or x.model != ote]
+        mp, pwr, cost, cnt = vertex_arrays(models, tis)
+
+        missing = np.argwhere(cnt == 0)
+        if len(missing) > 0:
+            i, j = missing[0]
+            raise Exception(' '.join(['No active vertices were found for', models[i].name,
+                                      'in time interval', tis[j].name]))
+
+        # Gather the candidate marginal prices of each time interval. Constant,
+        # single vertex models are assigned infinite marginal price.
+        slots = np.arange(mp.shape[-1])
+        mps = np.where(slots < cnt[..., np.newaxis], mp, np.nan)
+        mps[..., 0] = np.where(cnt == 1, float('inf'), mps[..., 0])
+        mps = np.sort(mps.transpose(1, 0, 2).reshape(len(tis), -1), axis=1)  # nan sorts last
+        valid = ~np.isnan(mps)
+
+        # Allow no more than two vertices at the same marginal price, and
+        # retain an infinite marginal price only if it is the first one.
+        keep = valid.copy()
+        keep[:, 2:] &= (mps[:, 2:] != mps[:, 1:-1]) | (mps[:, 1:-1] != mps[:, :-2])
+        keep[:, 1:] &= mps[:, 1:] != float('inf')
+
+        # Compact the kept marginal prices to the front of each row.
+        order = np.argsort(~keep, axis=1, kind='stable')
+        mps = np.where(np.take_along_axis(keep, order, axis=1), np.take_along_axis(mps, order, axis=1), np.nan)
+        mps = mps[:, :int(keep.sum(axis=1).max(initial=1))]
+
+        # Offset the first of any two duplicate marginal prices by a very
+        # small number for correct assignment of vertex power.
+        duplicate = mps[:, 1:] == mps[:, :-1]
+        mps[:, :-1] -= np.where(duplicate, 1e-10, 0.0)
+
+        # Sum the powers and production costs of all models at the vertices.
+        dur = np.array([get_duration_in_hour(ti.duration) for ti in tis], dtype=float)
+        p = production_arrays(mp, pwr, cnt, mps)
+        c = prod_cost_arrays(mp, pwr, cost, cnt, p, dur)
+        valid = ~np.isnan(mps)
+        powers = np.where(valid, p.sum(axis=0), np.nan)
+        costs = np.where(valid, c.sum(axis=0), np.nan)
+        return mps, powers, costs
+
     def update_costs(self, mtn):
         # Sum the production and dual costs from all modeled local resources, local
         # loads, and neighbors, and then sum them for the entire duration of the
@@ -779,6 +888,11 @@ class Market:
         for n in mtn.neighbors:
             n.model.update_costs(self)
 
+        # Delete sum dual costs that are not in active time intervals. This
+        # prevents time intervals from accumulating indefinitely.
+        time_interval_values = set(t.startTime for t in self.timeIntervals)
+        self.dualCosts = IntervalValueList(x for x in self.dualCosts if x.timeInterval.startTime in time_interval_values)
+
         for i in range (1, len(self.timeIntervals)):
             ti = self.timeIntervals[i]
             # Initialize the sum dual cost sdc in this time interval
@@ -849,9 +963,12 @@ class Market:
         # Extract active time intervals
         time_intervals = self.timeIntervals  # active TimeIntervals
 
-        time_interval_values = [t.startTime for t in time_intervals]
-        # Delete netPowers not in active time intervals
-        self.netPowers = [x for x in self.netPowers if x.timeInterval.startTime in time_interval_values]
+        time_interval_values = set(t.startTime for t in time_intervals)
+        # Delete netPowers, total generation and total demand not in active time intervals
+        self.netPowers = IntervalValueList(x for x in self.netPowers if x.timeInterval.startTime in time_interval_values)
+        self.totalGeneration = IntervalValueList(x for x in self.totalGeneration
+                                                 if x.timeInterval.startTime in time_interval_values)
+        self.totalDemand = IntervalValueList(x for x in self.totalDemand if x.timeInterval.startTime in time_interval_values)
 
         # Index through the active time intervals ti
         for i in range(1, len(time_intervals)):
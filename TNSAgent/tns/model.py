@@ -60,7 +60,7 @@
 from .vertex import Vertex
 from .time_interval import TimeInterval
 from .local_asset import LocalAsset
-from .interval_value import IntervalValue
+from .interval_value import IntervalValue, IntervalValueList
 
 
 class Model:
@@ -77,7 +77,7 @@ class Model:
 
         # An array of vertices that represent the production of a resource
         # (or consumption of load) as a function of marginal price.
-        self.activeVertices = []  # IntervalValue
+        self.activeVertices = IntervalValueList()  # IntervalValue
 
         # Three coefficients [a(1),a(2),a(3)] that may be used to calculate
         # production cost of resources (or gross consumer surplus (i.e., utility) for loads?).
@@ -92,7 +92,7 @@ class Model:
         # other Lagrangian and constraint terms during the importation of
         # electricity. During the exportation of electricity, dual costs
         # include the (net) consumer surplus, plus other Lagrangian terms [$]
-        self.dualCosts = []  # IntervalValue
+        self.dualCosts = IntervalValueList()  # IntervalValue
 
         # Array of meter points called upon by this model. [See class MeterPoint.]
         self.meterPoints = []  # MeterPoint
@@ -103,19 +103,19 @@ class Model:
         # Array of production costs for active time intervals. For a
         # neighbor, production costs apply only during the importation of
         # electricity. [$]
-        self.productionCosts = []  # IntervalValue[]
+        self.productionCosts = IntervalValueList()  # IntervalValue[]
 
         # Array of margins between maximum and scheduled powers in active
         # time intervals. An estimate of spinning reserve is tracked. The
         # long-term goal is to solve for a target reserve margin, but doing
         # so requires having multiple resource that may be engaged or
         # disengaged, spinning or non-spinning. [avg.kW]
-        self.reserveMargins = []  # IntervalValue[]
+        self.reserveMargins = IntervalValueList()  # IntervalValue[]
 
         # Array of scheduled real power for this resource in each of the
         # active time intervals. Values should be positive for imported
         # power negative for exported. [avg. kW]
-        self.scheduledPowers = []  # IntervalValue
+        self.scheduledPowers = IntervalValueList()  # IntervalValue
 
         # Sum of dual costs for the entire set of future time horizon
         # intervals. [$]
@@ -61,13 +61,13 @@ from datetime import datetime, timedelta, date, time
 import csv
 
 import logging
-import json
 
 from .model import Model
 from .helpers import *
 from .measurement_type import MeasurementType
-from .interval_value import IntervalValue
+from .interval_value import IntervalValue, IntervalValueList
 from .transactive_record import TransactiveRecord
+from .signal_codec import encode_signal, decode_signal
 from .vertex import Vertex
 from .timer import Timer
 
@@ -86,7 +86,7 @@ class NeighborModel(Model, object):
     def __init__(self):
         super(NeighborModel, self).__init__()
         self.converged = False
-        self.convergenceFlags = []  # IntervalValue.empty  # values are Boolean
+        self.convergenceFlags = IntervalValueList()  # IntervalValue.empty  # values are Boolean
         self.convergenceThreshold = 0.05  # [0.01 = 1#]
         self.demandMonth = datetime.today().month  # used to re-set demand charges
         self.demandRate = 4.5  # 4.5  # [$ / kW (/h)]
@@ -103,6 +103,13 @@ class NeighborModel(Model, object):
         self.sentSignal = []  # TransactiveRecord.empty  # last records sent
         self.transactive = False
 
+        # Incremental convergence checks keep the latest sent, received and
+        # calculated records per time interval name instead of searching the
+        # signal lists in every time interval.
+        self.incrementalConvergence = True
+        self.latestSignals = {'sent': {}, 'received': {}, 'my': {}}  # values are {name: (timeStamp, records)}
+        self._indexedSignals = {}  # the signal list and its length when last indexed
+
     def calculate_reserve_margin(self, mkt):
         # CALCULATE_RESERVE_MARGIN() - Estimate the spinning reserve margin
         # in each active time interval
@@ -131,8 +138,8 @@ class NeighborModel(Model, object):
 
         # Gather active time intervals ti
         time_intervals = mkt.timeIntervals
-        time_interval_values = [t.startTime for t in time_intervals]
-        self.reserveMargins = [x for x in self.reserveMargins if x.timeInterval.startTime in time_interval_values]
+        time_interval_values = set(t.startTime for t in time_intervals)
+        self.reserveMargins = IntervalValueList(x for x in self.reserveMargins if x.timeInterval.startTime in time_interval_values)
 
         # Index through active time intervals ti
         for i in range(len(time_intervals)):  # for i = 1:len(time_intervals)
@@ -195,6 +202,41 @@ class NeighborModel(Model, object):
 
         return ts, ti_signals
 
+    def update_latest_signals(self, kind, signals):
+        # Update the latest records per time interval name from a signal list.
+        # Nothing is done if the list is the one indexed last time and has not
+        # grown since.
+        # kind - 'sent', 'received' or 'my'
+        # signals - list of TransactiveRecord objects
+        indexed = self._indexedSignals.get(kind)
+        if indexed is not None and indexed[0] is signals and indexed[1] == len(signals):
+            return
+
+        ti_signals = {}
+        for s in signals:
+            ti_signals.setdefault(s.timeInterval, []).append(s)
+
+        latest = self.latestSignals[kind]
+        for ti_name, records in ti_signals.items():
+            # The timestamp of record 0 is the time of the signal.
+            ts = next((s.timeStamp for s in records if s.record == 0), None)
+            latest[ti_name] = (ts, records)
+
+        self._indexedSignals[kind] = (signals, len(signals))
+
+    def prune_latest_signals(self, time_interval_names):
+        # Forget the latest records of time intervals that are no longer active.
+        for latest in self.latestSignals.values():
+            for ti_name in [x for x in latest if x not in time_interval_names]:
+                del latest[ti_name]
+
+    def find_latest_message_ts(self, kind, ti_name, fallback_value):
+        # Incremental counterpart of find_last_message_ts().
+        ts, ti_signals = self.latestSignals[kind].get(ti_name, (None, []))
+        if ts is None:
+            ts = fallback_value
+        return ts, ti_signals
+
     def check_for_convergence(self, mkt):
         # Qualifies state of convergence with a transactive Neighor object by active time interval and globally.
         #
@@ -228,6 +270,21 @@ class NeighborModel(Model, object):
         # Gather active time intervals.
         time_intervals = mkt.timeIntervals
 
+        # Delete convergence flags that are not in active time intervals. This prevents flags of expired time
+        # intervals from accumulating indefinitely and holding the overall flag false.
+        time_interval_values = set(t.startTime for t in time_intervals)
+        self.convergenceFlags = IntervalValueList(x for x in self.convergenceFlags
+                                                  if x.timeInterval.startTime in time_interval_values)
+
+        if self.incrementalConvergence:
+            # Pick up any new signals, then drop those outside the active time intervals.
+            self.update_latest_signals('sent', self.sentSignal)
+            self.update_latest_signals('received', self.receivedSignal)
+            self.update_latest_signals('my', self.mySignal)
+            self.prune_latest_signals(set(t.name for t in time_intervals))
+
+        log_records = _log.isEnabledFor(logging.DEBUG)
+
         # Index through active time intervals to assess their convergence status.
         t_threshold = timedelta(minutes=5)
         for i in range(len(time_intervals)):
@@ -239,9 +296,14 @@ class NeighborModel(Model, object):
 
             # Find the TransactiveRecord objects sent from the transactive
             # Neighbor in this indexed active time interval.
-            ss_ts, ss = self.find_last_message_ts(self.sentSignal, time_intervals[i].name, dt-t_threshold)
-            rs_ts, rs = self.find_last_message_ts(self.receivedSignal, time_intervals[i].name, dt)
-            ms_ts, ms = self.find_last_message_ts(self.mySignal, time_intervals[i].name, dt)
+            if self.incrementalConvergence:
+                ss_ts, ss = self.find_latest_message_ts('sent', time_intervals[i].name, dt-t_threshold)
+                rs_ts, rs = self.find_latest_message_ts('received', time_intervals[i].name, dt)
+                ms_ts, ms = self.find_latest_message_ts('my', time_intervals[i].name, dt)
+            else:
+                ss_ts, ss = self.find_last_message_ts(self.sentSignal, time_intervals[i].name, dt-t_threshold)
+                rs_ts, rs = self.find_last_message_ts(self.receivedSignal, time_intervals[i].name, dt)
+                ms_ts, ms = self.find_last_message_ts(self.mySignal, time_intervals[i].name, dt)
 
             # Now, work through the convergence criteria.
             if len(ss) == 0:
@@ -258,12 +320,13 @@ class NeighborModel(Model, object):
                 # convergence requirement. Function are_different1() checks
                 # whether the sent and received signals differ significantly. If
                 # all these conditions are true, the Neighbor is not converged.
-                _log.debug("TCC for {} are_different1 returned True? Check: rs={}, ss={}, "
-                           "rs_ts={}, ss_ts={}, threshold={}".format(
-                    self.name,
-                    [(x.timeInterval, x.record, x.power, x.marginalPrice) for x in rs],
-                    [(x.timeInterval, x.record, x.power, x.marginalPrice) for x in ss],
-                    rs_ts, ss_ts, self.convergenceThreshold))
+                if log_records:
+                    _log.debug("TCC for {} are_different1 returned True? Check: rs={}, ss={}, "
+                               "rs_ts={}, ss_ts={}, threshold={}".format(
+                        self.name,
+                        [(x.timeInterval, x.record, x.power, x.marginalPrice) for x in rs],
+                        [(x.timeInterval, x.record, x.power, x.marginalPrice) for x in ss],
+                        rs_ts, ss_ts, self.convergenceThreshold))
                 flag = False
 
             #elif dt - ss_ts >= t_threshold and are_different2(ms, ss, self.convergenceThreshold, self.name):
@@ -275,12 +338,13 @@ class NeighborModel(Model, object):
                 # (ms) and the sentSignal (ss) differ significantly, meaning that
                 # local conditions have changed enough that a new, revised signal
                 # should be sent.
-                _log.debug("TCC for {} are_different2 returned True? Check: ms={}, ss={}, "
-                           "rs_ts={}, ss_ts={}, threshold={}".format(
-                    self.name,
-                    [(x.timeInterval, x.record, x.power, x.marginalPrice) for x in ms],
-                    [(x.timeInterval, x.record, x.power, x.marginalPrice) for x in ss],
-                    rs_ts, ss_ts, self.convergenceThreshold))
+                if log_records:
+                    _log.debug("TCC for {} are_different2 returned True? Check: ms={}, ss={}, "
+                               "rs_ts={}, ss_ts={}, threshold={}".format(
+                        self.name,
+                        [(x.timeInterval, x.record, x.power, x.marginalPrice) for x in ms],
+                        [(x.timeInterval, x.record, x.power, x.marginalPrice) for x in ss],
+                        rs_ts, ss_ts, self.convergenceThreshold))
                 flag = False
 
             # Check whether a convergence flag exists in the indexed time interval.
@@ -304,8 +368,9 @@ class NeighborModel(Model, object):
             self.converged = False
         else:
             self.converged = True
-        _log.debug("TCC convergence flags for {} are {}".format(
-            self.name, [(format_ts(f.timeInterval.startTime), f.value) for f in self.convergenceFlags]))
+        if log_records:
+            _log.debug("TCC convergence flags for {} are {}".format(
+                self.name, [(format_ts(f.timeInterval.startTime), f.value) for f in self.convergenceFlags]))
         _log.debug("TCC convergence flag for {} is {}.".format(self.name, self.converged))
 
     def marginal_price_from_vertices(self, power, vertices):
@@ -398,8 +463,8 @@ class NeighborModel(Model, object):
 
         # Gather the active time intervals ti
         time_intervals = mkt.timeIntervals  # TimeInterval objects
-        time_interval_values = [t.startTime for t in time_intervals]
-        self.scheduledPowers = [x for x in self.scheduledPowers if x.timeInterval.startTime in time_interval_values]
+        time_interval_values = set(t.startTime for t in time_intervals)
+        self.scheduledPowers = IntervalValueList(x for x in self.scheduledPowers if x.timeInterval.startTime in time_interval_values)
 
         # Index through active time intervals ti
         for i in range(len(time_intervals)):
@@ -497,8 +562,8 @@ class NeighborModel(Model, object):
     def update_dual_costs(self, mkt):
         # Gather the active time intervals.
         time_intervals = mkt.timeIntervals
-        time_interval_values = [t.startTime for t in time_intervals]
-        self.dualCosts = [x for x in self.dualCosts if x.timeInterval.startTime in time_interval_values]
+        time_interval_values = set(t.startTime for t in time_intervals)
+        self.dualCosts = IntervalValueList(x for x in self.dualCosts if x.timeInterval.startTime in time_interval_values)
 
         for i in range(1, len(time_intervals)):
             # Find the marginal price mp for the indexed time interval in the given market
@@ -547,8 +612,8 @@ class NeighborModel(Model, object):
 
     def update_production_costs(self, mkt):
         time_intervals = mkt.timeIntervals
-        time_interval_values = [t.startTime for t in time_intervals]
-        self.productionCosts = [x for x in self.productionCosts if x.timeInterval.startTime in time_interval_values]
+        time_interval_values = set(t.startTime for t in time_intervals)
+        self.productionCosts = IntervalValueList(x for x in self.productionCosts if x.timeInterval.startTime in time_interval_values)
 
         for i in range(1, len(time_intervals)):
             # Get the scheduled power in the indexed time interval.
@@ -622,7 +687,7 @@ class NeighborModel(Model, object):
 
         # Delete any active vertices that are not in active time intervals. This
         # prevents time intervals from accumulating indefinitely.
-        self.activeVertices = [x for x in self.activeVertices if x.timeInterval.startTime in time_interval_values]
+        self.activeVertices = IntervalValueList(x for x in self.activeVertices if x.timeInterval.startTime in time_interval_values)
 
         for i in range(len(time_intervals)):
             # Flag for logging demand charge 1st time only
@@ -631,8 +696,8 @@ class NeighborModel(Model, object):
             # Keep active vertices that are not in the indexed time interval, but
             # discard the one(s) in the indexed time interval. These shall be
             # recreated in this iteration.
-            self.activeVertices = [x for x in self.activeVertices if
-                                   x.timeInterval.startTime != time_interval_values[i]]
+            self.activeVertices = IntervalValueList(x for x in self.activeVertices if
+                                                    x.timeInterval.startTime != time_interval_values[i])
 
             # Get the default vertices.
             default_vertices = self.defaultVertices
@@ -1101,12 +1166,12 @@ class NeighborModel(Model, object):
             _log.warning("No transactive records were found. No transactive signal can be sent to %s." % self.name)
             return
 
-        msg = json.dumps(transactive_records, default=json_econder)
-        msg = json.loads(msg)
-        _log.debug("At {}, {} sends signal from {} on topic {} message {}"
+        # The records are sent in the compact signal format (see signal_codec).
+        msg = encode_signal(transactive_records)
+        _log.debug("At {}, {} sends signal from {} on topic {} with {} records"
                    .format(Timer.get_cur_time(),
                            self.name,
-                           self.location, topic, msg))
+                           self.location, topic, len(transactive_records)))
         mtn.vip.pubsub.publish(peer='pubsub',
                                topic=topic,
                                message={'source': self.location,
@@ -1121,6 +1186,8 @@ class NeighborModel(Model, object):
     def receive_transactive_signal(self, mtn, curves):
         # Receive and save transactive records from a transactive Neighbor object.
         # mtn = myTransactiveNode object
+        # curves = records in the compact signal format (see signal_codec) or
+        # as the list of JSON records that older neighbors send
         #
         # The process of receiving a transactive signal is emulated by reading an
         # available text table that is presumed to have been created by the
@@ -1134,6 +1201,10 @@ class NeighborModel(Model, object):
                          'No signal is read.')
             return
 
+        if isinstance(curves, str):
+            self.receivedSignal = decode_signal(curves)
+            return
+
         self.receivedSignal = []
         for curve in curves:
             transative_record = TransactiveRecord(ti=curve['timeInterval'],
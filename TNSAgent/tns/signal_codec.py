@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# 'AS IS' AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+
+# }}}
+
+
+import base64
+import struct
+
+import numpy as np
+
+from .transactive_record import TransactiveRecord
+from .helpers import format_ts
+
+# Compact wire format of the transactive records exchanged between neighbors.
+#
+# A signal is the base64 text of:
+# - a header: format version (uint8), number of time interval names (uint16),
+#   number of records (uint32)
+# - the time interval names, each a uint16 byte length followed by UTF-8 text
+# - the records, each a time interval name index (uint16), record number
+#   (int32), marginal price, power and cost (float64)
+#
+# All values are big endian. Time interval names are sent once however many
+# records refer to them. Bump SIGNAL_VERSION whenever the layout changes.
+SIGNAL_VERSION = 1
+
+_header = struct.Struct('>BHI')
+_name_length = struct.Struct('>H')
+_record_dtype = np.dtype([('timeInterval', '>u2'),
+                          ('record', '>i4'),
+                          ('marginalPrice', '>f8'),
+                          ('power', '>f8'),
+                          ('cost', '>f8')])
+
+
+def encode_signal(records):
+    # Encode a list of TransactiveRecords as signal text.
+    names = []
+    index = {}
+    rows = np.empty(len(records), dtype=_record_dtype)
+    for i, r in enumerate(records):
+        j = index.get(r.timeInterval)
+        if j is None:
+            j = index[r.timeInterval] = len(names)
+            names.append(r.timeInterval)
+        rows[i] = (j, r.record, r.marginalPrice, r.power, r.cost)
+
+    parts = [_header.pack(SIGNAL_VERSION, len(names), len(records))]
+    for name in names:
+        name = name.encode('utf-8')
+        parts.append(_name_length.pack(len(name)))
+        parts.append(name)
+    parts.append(rows.tobytes())
+    return base64.b64encode(b''.join(parts)).decode('ascii')
+
+
+def decode_signal(signal):
+    # Decode signal text into a list of TransactiveRecords.
+    data = base64.b64decode(signal)
+    version, name_count, record_count = _header.unpack_from(data)
+    if version != SIGNAL_VERSION:
+        raise ValueError('Unsupported transactive signal version {}'.format(version))
+
+    offset = _header.size
+    names = []
+    for i in range(name_count):
+        length, = _name_length.unpack_from(data, offset)
+        offset += _name_length.size
+        names.append(data[offset:offset + length].decode('utf-8'))
+        offset += length
+
+    rows = np.frombuffer(data, dtype=_record_dtype, count=record_count, offset=offset)
+    return [TransactiveRecord(ti=names[ti], rn=int(rn), mp=float(mp), p=float(p), cost=float(cost))
+            for ti, rn, mp, p, cost in rows.tolist()]
+
+
+def signal_to_json(records):
+    # The JSON form of a list of TransactiveRecords, as published before
+    # the compact format was introduced.
+    return [{'timeInterval': r.timeInterval,
+             'record': r.record,
+             'marginalPrice': r.marginalPrice,
+             'power': r.power,
+             'cost': r.cost,
+             'timeStamp': format_ts(r.timeStamp)}
+            for r in records]
@@ -61,7 +61,7 @@ from .helpers import *
 from .measurement_type import MeasurementType
 from .local_asset import LocalAsset
 from .local_asset_model import LocalAssetModel
-from .interval_value import IntervalValue
+from .interval_value import IntervalValue, IntervalValueList
 
 
 class SolarPvResourceModel(LocalAssetModel, object):
@@ -155,10 +155,10 @@ class SolarPvResourceModel(LocalAssetModel, object):
                 iv.value = val  # [$]
 
         # Remove any extra scheduled powers
-        self.scheduledPowers = [x for x in self.scheduledPowers if x.timeInterval in tis]
+        self.scheduledPowers = IntervalValueList(x for x in self.scheduledPowers if x.timeInterval in tis)
 
         # Remove any extra engagement schedule values
-        self.engagementSchedule = [x for x in self.engagementSchedule if x.timeInterval in tis]
+        self.engagementSchedule = IntervalValueList(x for x in self.engagementSchedule if x.timeInterval in tis)
 
 
 if __name__ == '__main__':
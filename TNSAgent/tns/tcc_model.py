@@ -62,7 +62,7 @@ import logging
 from volttron.platform.agent import utils
 
 from .vertex import Vertex
-from .interval_value import IntervalValue
+from .interval_value import IntervalValue, IntervalValueList
 from .measurement_type import MeasurementType
 from .helpers import *
 from .market import Market
@@ -110,7 +110,7 @@ class TccModel(LocalAssetModel):
         marginalPrice. However, because the building already provided the curve in the 1st place, there is no need to
         rerun the mix market...
         """
-        self.scheduledPowers = []
+        self.scheduledPowers = IntervalValueList()
         time_intervals = mkt.timeIntervals
         if self.tcc_curves is not None:
             # Curves existed, update vertices first
@@ -145,11 +145,11 @@ class TccModel(LocalAssetModel):
             if self.tcc_curves[0] is None:
                 first_interval_vertices = [iv for iv in self.activeVertices
                                            if iv.timeInterval.startTime == time_intervals[0].startTime]
-                self.activeVertices = first_interval_vertices
+                self.activeVertices = IntervalValueList(first_interval_vertices)
 
             # After 1st mix-market, we always have tcc_curves for 25 market intervals => clear all previous av
             else:
-                self.activeVertices = []
+                self.activeVertices = IntervalValueList()
 
             for i in range(len(time_intervals)):
                 if self.tcc_curves[i] is None:
@@ -60,6 +60,7 @@
 import os
 import csv
 import logging
+from bisect import bisect_left
 from datetime import datetime, timedelta
 from dateutil import parser
 import dateutil.tz
@@ -69,6 +70,7 @@ from .information_service_model import InformationServiceModel
 from .measurement_type import MeasurementType
 from .measurement_unit import MeasurementUnit
 from .interval_value import IntervalValue
+from .timer import Timer
 
 from volttron.platform.agent import utils
 from volttron.platform.jsonrpc import RemoteError
@@ -94,6 +96,9 @@ class TemperatureForecastModel(InformationServiceModel, object):
         self.parent = parent
         self.predictedValues = []
         self.weather_data = []
+        # Weather data timestamps in ascending order and their values, for binary search
+        self.weather_times = []
+        self.weather_values = []
         self.last_modified = None
         try:
            self.localtz = dateutil.tz.tzlocal()
@@ -111,6 +116,10 @@ class TemperatureForecastModel(InformationServiceModel, object):
             self.location = [self.weather_config.get("location")]
             self.oat_point_name = self.config.get("temperature_point_name", "OutdoorAirTemperature")
             self.weather_data = None
+            # Forecasts from the weather service are reused for weather_cache_ttl seconds of
+            # Timer time, which runs faster than the clock in simulation
+            self.weather_cache_ttl = float(self.weather_config.get("weather_cache_ttl", 1800))
+            self.weather_cache_time = None
             # there is no easy way to check if weather service is running on a remote platform
             if self.weather_vip not in self.parent.vip.peerlist.list().get() and self.remote_platform is None:
                _log.warning("Weather service is not running!")
@@ -136,6 +145,23 @@ class TemperatureForecastModel(InformationServiceModel, object):
                     rec['Timestamp'] = parser.parse(rec['Timestamp']).replace(minute=0, second=0, microsecond=0)
                     rec['Value'] = float(rec['Value'])
 
+            # Index the data by time. The sort is stable so that the first record
+            # in the file wins for duplicate timestamps.
+            records = sorted(self.weather_data, key=lambda x: x['Timestamp'])
+            self.weather_times = [x['Timestamp'] for x in records]
+            self.weather_values = [x['Value'] for x in records]
+
+    def find_weather_value(self, timestamp):
+        """
+        Find the weather file value at a timestamp by binary search.
+        :param timestamp: datetime
+        :return: value or None if the file has no record at the timestamp
+        """
+        i = bisect_left(self.weather_times, timestamp)
+        if i < len(self.weather_times) and self.weather_times[i] == timestamp:
+            return self.weather_values[i]
+        return None
+
     def get_forecast_weatherservice(self, mkt):
         """
         Uses VOLTTRON DarkSky weather agent running on local or remote platform to
@@ -145,20 +171,30 @@ class TemperatureForecastModel(InformationServiceModel, object):
         """
         weather_results = None
         weather_data = None
-        try:
-            result = self.parent.vip.rpc.call(self.weather_vip,
-                                              "get_hourly_forecast",
-                                              self.location,
-                                              external_platform=self.remote_platform).get(timeout=15)
-            weather_results = result[0]["weather_results"]
+        now = Timer.get_cur_time()
+        if self.weather_cache_time is not None and \
+                0 <= (now - self.weather_cache_time).total_seconds() < self.weather_cache_ttl:
+            # Serve the forecast from the last successful call.
+            weather_data = self.weather_data
+        else:
+            try:
+                result = self.parent.vip.rpc.call(self.weather_vip,
+                                                  "get_hourly_forecast",
+                                                  self.location,
+                                                  external_platform=self.remote_platform).get(timeout=15)
+                weather_results = result[0]["weather_results"]
 
-        except (gevent.Timeout, RemoteError) as ex:
-            _log.warning("RPC call to {} failed for weather forecast: {}".format(self.weather_vip, ex))
+            except (gevent.Timeout, RemoteError) as ex:
+                _log.warning("RPC call to {} failed for weather forecast: {}".format(self.weather_vip, ex))
 
         if weather_results is not None:
             try:
-                weather_data = [[parser.parse(oat[0]).astimezone(self.localtz), oat[1][self.oat_point_name]] for oat in weather_results]
-                weather_data = [[oat[0].replace(tzinfo=None), oat[1]] for oat in weather_data]
+                forecast = [[parser.parse(oat[0]).astimezone(self.localtz), oat[1][self.oat_point_name]] for oat in weather_results]
+                forecast = [[oat[0].replace(tzinfo=None), oat[1]] for oat in forecast]
+                # Index the forecast by hour. The first forecast at each hour is used.
+                weather_data = dict(reversed(forecast))
+                self.weather_data = weather_data
+                self.weather_cache_time = now
             except KeyError:
                 if not self.predictedValues:
                     raise Exception("Measurement Point Name is not correct")
@@ -174,11 +210,10 @@ class TemperatureForecastModel(InformationServiceModel, object):
             for ti in mkt.timeIntervals:
                 # Find item which has the same timestamp as ti.timeStamp
                 start_time = ti.startTime.replace(minute=0)
-                items = [x[1] for x in weather_data if x[0] == start_time]
+                temp = weather_data.get(start_time)
 
                 # Create interval value and add it to predicted values
-                if items:
-                    temp = items[0]
+                if temp is not None:
                     interval_value = IntervalValue(self, ti, mkt, MeasurementType.PredictedValue, temp)
                     self.predictedValues.append(interval_value)
         elif self.predictedValues:
@@ -204,20 +239,19 @@ class TemperatureForecastModel(InformationServiceModel, object):
         for ti in mkt.timeIntervals:
             # Find item which has the same timestamp as ti.timeStamp
             start_time = ti.startTime.replace(minute=0)
-            items = [x for x in self.weather_data if x['Timestamp'] == start_time]
-            if len(items) == 0:
+            temp = self.find_weather_value(start_time)
+            if temp is None:
                 trial_deltas = [-1, 1, -2, 2, -24, 24]
                 for delta in trial_deltas:
-                    items = [x for x in self.weather_data if x['Timestamp'] == (start_time - timedelta(hours=delta))]
-                    if len(items) > 0:
+                    temp = self.find_weather_value(start_time - timedelta(hours=delta))
+                    if temp is not None:
                         break
 
                 # None exist, raise exception
-                if len(items) == 0:
+                if temp is None:
                     raise Exception('No weather data for time: {}'.format(utils.format_timestamp(ti.startTime)))
 
             # Create interval value and add it to predicted values
-            temp = items[0]['Value']
             interval_value = IntervalValue(self, ti, mkt, MeasurementType.PredictedValue, temp)
             self.predictedValues.append(interval_value)
 
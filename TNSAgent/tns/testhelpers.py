@@ -63,7 +63,7 @@ from datetime import datetime, timedelta
 from .helpers import *
 from .vertex import Vertex
 from .time_interval import TimeInterval
-from .interval_value import IntervalValue
+from .interval_value import IntervalValue, IntervalValueList
 from .measurement_type import MeasurementType
 
 
@@ -493,6 +493,44 @@ def test_are_different2():
     print('Result: {}\n\n'.format(pf))
 
 
+def test_find_obj_by_ti_indexed():
+    from .market import Market
+
+    print('Running test_find_obj_by_ti_indexed()')
+    pf = 'pass'
+
+    test_market = Market()
+
+    dt = datetime.now()
+    dur = timedelta(hours=1)
+    ti = [TimeInterval(dt, dur, test_market, dt, dt + i * dur) for i in range(3)]
+
+    ivs = IntervalValueList()
+    for i in range(3):
+        ivs.append(IntervalValue(None, ti[i], test_market, MeasurementType.ScheduledPower, i))
+
+    # A second value in the first interval must not shadow the first one.
+    ivs.append(IntervalValue(None, ti[0], test_market, MeasurementType.ScheduledPower, 10))
+
+    if find_obj_by_ti(ivs, ti[1]).value != 1:
+        pf = 'fail'
+        print('  The wrong IntervalValue was found')
+
+    if [iv.value for iv in find_objs_by_ti(ivs, ti[0])] != [0, 10]:
+        pf = 'fail'
+        print('  The values in the first interval were not all found')
+
+    # Removing an item must invalidate the index.
+    ivs.remove(find_obj_by_ti(ivs, ti[2]))
+    if find_obj_by_ti(ivs, ti[2]) is not None:
+        pf = 'fail'
+        print('  A removed IntervalValue was still found')
+
+    print('- the test ran to completion')
+    print('Result: {}\n\n'.format(pf))
+    assert pf == 'pass'
+
+
 if __name__ == "__main__":
     # test_is_hlh()
     # test_order_vertices()
@@ -86,6 +86,7 @@ def test_all():
     test_check_marginal_prices()  # High priorty - test not completed
     test_schedule()  # High priorty - test not completed
     test_sum_vertices()  # High priorty - test not completed
+    test_sum_vertex_arrays()
     test_update_costs()  # High priorty - test not completed
     test_update_supply_demand()  # High priorty - test not completed
     #test_view_net_curve()  # High priorty - test not completed
@@ -448,6 +449,67 @@ def test_sum_vertices():
     print('Result: #s\n\n', pf)
 
 
+def test_sum_vertex_arrays():
+    print('Running Market.test_sum_vertex_arrays()')
+    pf = 'pass'
+
+    test_node = myTransactiveNode()
+    test_market = Market()
+    test_node.markets = test_market
+
+    # Three time intervals, each with a different mix of vertices.
+    dt = datetime.now()
+    dur = timedelta(hours=1)
+    time_intervals = [TimeInterval(dt, dur, test_market, dt, dt + i * dur) for i in range(3)]
+    test_market.timeIntervals = time_intervals
+
+    test_asset = LocalAsset()
+    test_asset_model = LocalAssetModel()
+    test_asset.model = test_asset_model
+    test_asset_model.object = test_asset
+    test_node.localAssets = [test_asset]
+
+    test_neighbor = Neighbor()
+    test_neighbor_model = NeighborModel()
+    test_neighbor.model = test_neighbor_model
+    test_neighbor_model.object = test_neighbor
+    test_node.neighbors = [test_neighbor]
+
+    asset_vertices = [
+        [Vertex(0.2, 0, -110), Vertex(0.2, 0, -90)],  # interleaved with the neighbor
+        [Vertex(0.2, 0, -110)],  # constant
+        [Vertex(0.1, 0, -110), Vertex(0.1, 0, -90)]  # more than two vertices at one marginal price
+    ]
+    neighbor_vertices = [Vertex(0.1, 1, 0), Vertex(0.3, 30, 200)]
+    test_asset_model.activeVertices = [IntervalValue(test_node, ti, test_market, MeasurementType.ActiveVertex, v)
+                                       for ti, vertices in zip(time_intervals, asset_vertices) for v in vertices]
+    test_neighbor_model.activeVertices = [IntervalValue(test_node, ti, test_market, MeasurementType.ActiveVertex, v)
+                                          for ti in time_intervals for v in neighbor_vertices]
+
+    # The arrays must hold the same vertices as sum_vertices() finds one time interval at a time.
+    for ote in [None, test_neighbor_model]:
+        try:
+            mps, powers, costs = test_market.sum_vertex_arrays(test_node, time_intervals, ote)
+            print('  - the method ran without errors')
+        except:
+            pf = 'fail'
+            print('  - the method had errors when called and stopped')
+            break
+
+        for i, ti in enumerate(time_intervals):
+            vertices = test_market.sum_vertices(test_node, ti, ote)
+            expected = [(round(x.marginalPrice, 6), round(x.power, 4), round(x.cost, 4)) for x in vertices]
+            found = [(round(mps[i, k], 6), round(powers[i, k], 4), round(costs[i, k], 4))
+                     for k in range(len(mps[i])) if mps[i, k] == mps[i, k]]
+            if found != expected:
+                pf = 'fail'
+                print('  - the vertices in time interval {} were not as expected'.format(i))
+
+    print('- the test ran to completion')
+    print('Result: {}\n\n'.format(pf))
+    assert pf == 'pass'
+
+
 def test_update_costs():
     print('Running Market.test_update_costs()')
     pf = 'test is not complete'
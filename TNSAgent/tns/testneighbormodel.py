@@ -450,6 +450,73 @@ def test_check_for_convergence():
     print('\nResult: #s\n\n', pf)
 
 
+def test_check_for_convergence_incremental():
+    print('Running NeighborModel.test_check_for_convergence_incremental()')
+    pf = 'pass'
+
+    one_hour = timedelta(hours=1)
+    dt = datetime.now()
+
+    test_market = Market()
+    time_intervals = [TimeInterval(dt, one_hour, test_market, dt, dt + i * one_hour) for i in range(4)]
+    test_market.timeIntervals = time_intervals
+
+    # Interval 0 was sent and matches what was received, interval 1 differs
+    # from what was received later, interval 2 was never sent and interval 3
+    # has changed locally since it was sent.
+    sent = [TransactiveRecord(time_intervals[0], 0, 0.05, 100),
+            TransactiveRecord(time_intervals[1], 0, 0.05, 100),
+            TransactiveRecord(time_intervals[3], 0, 0.05, 100)]
+    received = [TransactiveRecord(time_intervals[0], 0, 0.05, -100),
+                TransactiveRecord(time_intervals[1], 0, 0.08, -150)]
+    for x in received:
+        x.timeStamp = sent[0].timeStamp + one_hour
+    mine = [TransactiveRecord(time_intervals[0], 0, 0.05, 100),
+            TransactiveRecord(time_intervals[1], 0, 0.05, 100),
+            TransactiveRecord(time_intervals[2], 0, 0.05, 100),
+            TransactiveRecord(time_intervals[3], 0, 0.06, 130)]
+
+    flags = []
+    for incremental in [False, True]:
+        test_model = NeighborModel()
+        test_model.convergenceThreshold = 0.01
+        test_model.incrementalConvergence = incremental
+        test_model.sentSignal = sent
+        test_model.receivedSignal = received
+        test_model.mySignal = mine
+        test_model.check_for_convergence(test_market)
+        flags.append([find_obj_by_ti(test_model.convergenceFlags, ti).value for ti in time_intervals])
+
+    if flags[0] != flags[1]:
+        pf = 'fail'
+        print('  - the incremental flags {} differ from {}'.format(flags[1], flags[0]))
+    else:
+        print('  - the incremental flags were as expected')
+
+    # Signals of time intervals that have expired must be forgotten.
+    test_market.timeIntervals = time_intervals[1:]
+    test_model.check_for_convergence(test_market)
+    if time_intervals[0].name in test_model.latestSignals['sent']:
+        pf = 'fail'
+        print('  - the signal of an expired time interval was kept')
+    else:
+        print('  - the signal of the expired time interval was pruned')
+
+    # A newly received signal must be picked up.
+    test_model.receivedSignal = [TransactiveRecord(time_intervals[1], 0, 0.05, -100)]
+    test_model.receivedSignal[0].timeStamp = sent[0].timeStamp + one_hour
+    test_model.check_for_convergence(test_market)
+    if find_obj_by_ti(test_model.convergenceFlags, time_intervals[1]).value is not True:
+        pf = 'fail'
+        print('  - the newly received signal was not used')
+    else:
+        print('  - the newly received signal was used')
+
+    print('- the test ran to completion')
+    print('Result: {}\n\n'.format(pf))
+    assert pf == 'pass'
+
+
 def test_marginal_price_from_vertices():
     # TEST_MARGINAL_PRICE_FROM_VERTICES() - test method
     # marginal_price_from_vertices().
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# 'AS IS' AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+
+# }}}
+
+
+import base64
+import json
+
+from .helpers import json_econder
+from .transactive_record import TransactiveRecord
+from .signal_codec import SIGNAL_VERSION, encode_signal, decode_signal, signal_to_json
+
+
+def make_records():
+    records = []
+    for h in range(25):
+        name = '20190101T{:02d}0000'.format(h)
+        records.append(TransactiveRecord(ti=name, rn=0, mp=0.05 + h * 1e-3, p=-1234.5678 + h, cost=98.7654321))
+        records.append(TransactiveRecord(ti=name, rn=1, mp=0.04, p=-1500.0, cost=0.0))
+        records.append(TransactiveRecord(ti=name, rn=2, mp=float('inf'), p=-900.125, cost=1e-9))
+    return records
+
+
+def test_signal_round_trip():
+    print('Running test_signal_round_trip()')
+    pf = 'pass'
+
+    records = make_records()
+
+    # The form that neighbors used to exchange, and that receive_transactive_signal still accepts.
+    expected = json.loads(json.dumps(records, default=json_econder))
+
+    decoded = decode_signal(encode_signal(records))
+    if len(decoded) != len(records):
+        pf = 'fail'
+        print('  Expected {} records, decoded {}'.format(len(records), len(decoded)))
+
+    keys = ['timeInterval', 'record', 'marginalPrice', 'power', 'cost']
+    found = [dict((k, x[k]) for k in keys) for x in signal_to_json(decoded)]
+    if found != [dict((k, x[k]) for k in keys) for x in expected]:
+        pf = 'fail'
+        print('  The decoded records differ from the JSON records')
+
+    if signal_to_json(records) != expected:
+        pf = 'fail'
+        print('  signal_to_json() differs from the JSON records')
+
+    print('- the test ran to completion')
+    print('Result: {}\n\n'.format(pf))
+    assert pf == 'pass'
+
+
+def test_signal_version():
+    print('Running test_signal_version()')
+    pf = 'pass'
+
+    signal = encode_signal(make_records())
+    if len(signal) >= len(json.dumps(make_records(), default=json_econder)):
+        pf = 'fail'
+        print('  The signal is not smaller than the JSON records')
+
+    # A signal of another version must be rejected rather than misread.
+    data = bytearray(base64.b64decode(signal))
+    data[0] = SIGNAL_VERSION + 1
+    try:
+        decode_signal(base64.b64encode(bytes(data)).decode('ascii'))
+        pf = 'fail'
+        print('  A signal of an unknown version was decoded')
+    except ValueError:
+        pass
+
+    if decode_signal(encode_signal([])) != []:
+        pf = 'fail'
+        print('  An empty signal did not decode to no records')
+
+    print('- the test ran to completion')
+    print('Result: {}\n\n'.format(pf))
+    assert pf == 'pass'
+
+
+if __name__ == "__main__":
+    test_signal_round_trip()
+    test_signal_version()
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# 'AS IS' AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+
+# }}}
+
+
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import dateutil.tz
+
+from .temperature_forecast_model import TemperatureForecastModel
+from .timer import Timer
+
+
+class FakeTimeInterval(object):
+    def __init__(self, start_time):
+        self.startTime = start_time
+
+
+class FakeMarket(object):
+    def __init__(self, start_time, hours):
+        self.timeIntervals = [FakeTimeInterval(start_time + timedelta(hours=h)) for h in range(hours)]
+
+
+class FakeResult(object):
+    def __init__(self, value):
+        self.value = value
+
+    def get(self, timeout=None):
+        return self.value
+
+
+class FakeRpc(object):
+    def __init__(self, weather_results):
+        self.calls = 0
+        self.weather_results = weather_results
+
+    def call(self, *args, **kwargs):
+        self.calls += 1
+        return FakeResult([{'weather_results': self.weather_results}])
+
+
+class FakeVip(object):
+    def __init__(self, rpc):
+        self.rpc = rpc
+
+
+class FakeParent(object):
+    def __init__(self, rpc):
+        self.vip = FakeVip(rpc)
+
+
+def make_file_model(rows):
+    f = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False)
+    f.write('Timestamp,Value\n')
+    for timestamp, value in rows:
+        f.write('{},{}\n'.format(timestamp, value))
+    f.close()
+
+    model = TemperatureForecastModel.__new__(TemperatureForecastModel)
+    model.predictedValues = []
+    model.weather_data = []
+    model.weather_times = []
+    model.weather_values = []
+    model.last_modified = None
+    model.weather_file = f.name
+    model.init_weather_data()
+    return model
+
+
+def make_service_model(rpc, ttl):
+    model = TemperatureForecastModel.__new__(TemperatureForecastModel)
+    model.parent = FakeParent(rpc)
+    model.predictedValues = []
+    model.weather_data = None
+    model.localtz = dateutil.tz.tzutc()
+    model.weather_vip = 'platform.weather_service'
+    model.remote_platform = None
+    model.location = [{'wfo': 'PDT', 'x': 119, 'y': 131}]
+    model.oat_point_name = 'OutdoorAirTemperature'
+    model.weather_cache_ttl = ttl
+    model.weather_cache_time = None
+    return model
+
+
+def test_find_weather_value():
+    print('Running test_find_weather_value()')
+    pf = 'pass'
+
+    # Out of order, with a duplicate hour where the first record must win.
+    model = make_file_model([('2020-07-01 02:00:00', 72.0),
+                             ('2020-07-01 00:00:00', 70.0),
+                             ('2020-07-01 01:15:00', 71.0),
+                             ('2020-07-01 02:30:00', 99.0),
+                             ('2020-07-01 05:00:00', 75.0)])
+    try:
+        start = datetime(2020, 7, 1)
+        for hour, expected in [(0, 70.0), (1, 71.0), (2, 72.0), (5, 75.0), (3, None), (6, None), (-1, None)]:
+            found = model.find_weather_value(start + timedelta(hours=hour))
+            if found != expected:
+                pf = 'fail'
+                print('  Hour {}: expected {}, found {}'.format(hour, expected, found))
+
+        # Missing hours use the nearest hour before, then after.
+        model.get_forecast_file(FakeMarket(start + timedelta(hours=2), 3))
+        found = [x.value for x in model.predictedValues]
+        if found != [72.0, 72.0, 75.0]:
+            pf = 'fail'
+            print('  Forecast with nearby hours: expected [72.0, 72.0, 75.0], found {}'.format(found))
+
+        # Hours with no record within the trial offsets raise.
+        try:
+            model.get_forecast_file(FakeMarket(start + timedelta(hours=10), 1))
+            pf = 'fail'
+            print('  A missing timestamp did not raise')
+        except Exception:
+            pass
+    finally:
+        os.remove(model.weather_file)
+
+    print('- the test ran to completion')
+    print('Result: {}\n\n'.format(pf))
+    assert pf == 'pass'
+
+
+def test_weather_service_cache():
+    print('Running test_weather_service_cache()')
+    pf = 'pass'
+
+    start = datetime(2020, 7, 1, 12)
+    weather_results = [[(start + timedelta(hours=h)).isoformat() + '+00:00', {'OutdoorAirTemperature': 80.0 + h}]
+                       for h in range(24)]
+    rpc = FakeRpc(weather_results)
+    model = make_service_model(rpc, ttl=1800)
+
+    saved = (Timer.simulation, Timer.created_time, Timer.sim_start_time)
+    try:
+        Timer.simulation = True
+        Timer.created_time = datetime.now()
+        Timer.sim_start_time = start
+
+        model.get_forecast_weatherservice(FakeMarket(start, 3))
+        found = [x.value for x in model.predictedValues]
+        if rpc.calls != 1 or found != [80.0, 81.0, 82.0]:
+            pf = 'fail'
+            print('  First forecast: {} calls, values {}'.format(rpc.calls, found))
+
+        # Within the TTL of Timer time the cached forecast is used.
+        Timer.sim_start_time = start + timedelta(minutes=20)
+        model.get_forecast_weatherservice(FakeMarket(start + timedelta(hours=1), 3))
+        found = [x.value for x in model.predictedValues]
+        if rpc.calls != 1 or found != [81.0, 82.0, 83.0]:
+            pf = 'fail'
+            print('  Cache hit: {} calls, values {}'.format(rpc.calls, found))
+
+        # Simulated time past the TTL expires the cache.
+        Timer.sim_start_time = start + timedelta(hours=2)
+        model.get_forecast_weatherservice(FakeMarket(start + timedelta(hours=2), 3))
+        if rpc.calls != 2:
+            pf = 'fail'
+            print('  Cache expiry: expected 2 calls, found {}'.format(rpc.calls))
+    finally:
+        Timer.simulation, Timer.created_time, Timer.sim_start_time = saved
+
+    print('- the test ran to completion')
+    print('Result: {}\n\n'.format(pf))
+    assert pf == 'pass'
+
+
+if __name__ == "__main__":
+    test_find_weather_value()
+    test_weather_service_cache()
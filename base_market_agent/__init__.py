@@ -192,3 +192,14 @@ class MarketAgent(Agent):
         result = self.registrations.make_offer(market_name, buyer_seller, curve)
         return result
 
+    def make_offers(self, offers):
+        """
+        This call makes offers on several markets with the MarketService in a single call.
+
+        :param offers: A list of (market_name, buyer_seller, curve) entries.
+
+        :return: A list of (result, error_message) tuples, one per entry.  A rejected offer
+        does not affect the other entries.
+        """
+        results = self.registrations.make_offers(offers)
+        return results
@@ -82,33 +82,45 @@ class MarketRegistration(object):
         self._validate_callbacks()
 
     def request_reservations(self, timestamp, rpc_proxy):
+        if self.wants_reservation(timestamp):
+            has_reservation = rpc_proxy.make_reservation(self.market_name, self.buyer_seller)
+            self.set_reservation(has_reservation)
+
+    def wants_reservation(self, timestamp):
         self.has_reservation = False
         self.failed_to_form_error = False
         if self.reservation_callback is not None:
             wants_reservation_this_time = self.reservation_callback(timestamp, self.market_name, self.buyer_seller)
         else:
             wants_reservation_this_time = self.always_wants_reservation
-        if wants_reservation_this_time:
-            has_reservation = rpc_proxy.make_reservation(self.market_name, self.buyer_seller)
-            if has_reservation:
-                self.has_reservation = has_reservation
-                if self.verbose_logging:
-                    _log.debug("Market: {} {} has obtained a reservation.".format(self.market_name, self.buyer_seller))
-            else:
-                if self.verbose_logging:
-                    _log.debug("Market: {} {} has failed to obtained a reservation.".format(self.market_name, self.buyer_seller))
+        return wants_reservation_this_time
+
+    def set_reservation(self, has_reservation):
+        if has_reservation:
+            self.has_reservation = has_reservation
+            if self.verbose_logging:
+                _log.debug("Market: {} {} has obtained a reservation.".format(self.market_name, self.buyer_seller))
+        else:
+            if self.verbose_logging:
+                _log.debug("Market: {} {} has failed to obtained a reservation.".format(self.market_name, self.buyer_seller))
 
     def make_offer(self, buyer_seller, curve, rpc_proxy):
         result = False
         is_ok, error_message = self._ok_to_make_offer()
         if is_ok:
             result, error_message = rpc_proxy.make_offer(self.market_name, buyer_seller, curve)
-            if result and error_message is None:
-                error_message = "Market: {} {} offer was made and accepted.".format(self.market_name, self.buyer_seller)
+        return self.offer_result(result, error_message)
+
+    def offer_result(self, result, error_message):
+        if result and error_message is None:
+            error_message = "Market: {} {} offer was made and accepted.".format(self.market_name, self.buyer_seller)
         _log.debug(error_message)
 
         return result, error_message
 
+    def ok_to_make_offer(self):
+        return self._ok_to_make_offer()
+
     def request_offers(self, timestamp):
         is_ok, error_message = self._ok_to_make_offer_via_callback()
         if is_ok:
@@ -56,44 +56,82 @@
 
 # }}}
 
+from bisect import bisect_left, bisect_right
+
 import numpy as np
 
 
 class PolyLine:
-    def __init__(self):
+    def __init__(self, points=None):
         self.points = []
         self.xs = None
         self.ys = None
         self.xsSortedByY = None
         self.ysSortedByY = None
+        self.xsSortedByX = None
+        self.ysSortedByX = None
+        # Keys are the negated prices of self.points so the list stays
+        # ascending for bisect while points stay sorted by descending price.
+        self._keys = []
         self._min_x = None
         self._max_x = None
         self._min_y = None
         self._max_y = None
+        if points:
+            self.extend(points)
 
-    def add(self, point):
-        if self.points is None:
-            self.points = []
-        if len(self.points) > 0:
-            for p in reversed(self.points):
-                if p.x == point.x and p.y == point.y:
-                    return
-        doSort = False
-        # if len(self.points) > 0 and point.y < self.points[-1].y:
-        if len(self.points) > 0:
-            doSort = True
-
-        self.points.append(point)
-        if doSort:
-            self.points.sort(key=lambda tup: tup[1], reverse=True)
+    def _invalidate(self):
         self.xs = None
         self.ys = None
+        self.xsSortedByY = None
+        self.ysSortedByY = None
+        self.xsSortedByX = None
+        self.ysSortedByX = None
+
+    def _update_bounds(self, point):
         if point.x is not None and point.y is not None:
             self._min_x = PolyLine.min(self._min_x, point.x)
             self._min_y = PolyLine.min(self._min_y, point.y)
             self._max_x = PolyLine.max(self._max_x, point.x)
             self._max_y = PolyLine.max(self._max_y, point.y)
 
+    def add(self, point):
+        if self.points is None:
+            self.points = []
+            self._keys = []
+        key = -point.y
+        lo = bisect_left(self._keys, key)
+        hi = bisect_right(self._keys, key)
+        # Points with the same price are contiguous, only they can be duplicates.
+        for p in self.points[lo:hi]:
+            if p.x == point.x:
+                return
+        # Inserting after points of equal price keeps the ordering of the
+        # previous append-then-stable-sort implementation.
+        self.points.insert(hi, point)
+        self._keys.insert(hi, key)
+        self._invalidate()
+        self._update_bounds(point)
+
+    def extend(self, points):
+        """Add many points at once with a single sort."""
+        if self.points is None:
+            self.points = []
+        seen = set((p.x, p.y) for p in self.points)
+        new_points = []
+        for point in points:
+            if (point.x, point.y) in seen:
+                continue
+            seen.add((point.x, point.y))
+            new_points.append(point)
+            self._update_bounds(point)
+        if not new_points:
+            return
+        self.points = self.points + new_points
+        self.points.sort(key=lambda tup: tup[1], reverse=True)
+        self._keys = [-p.y for p in self.points]
+        self._invalidate()
+
     def contains_none(self):
         result = False
         if self.points is not None and len(self.points) > 0:
@@ -132,10 +170,8 @@ class PolyLine:
         if y is None:
             return None
         self.vectorize()
-        # return np.interp(y, self.ys, self.xs) #, right=0.) .. we learned that this gave weird results previously
-        # ascending = self.ys[0]<self.ys[-1]
-        # ys = self.ys if ascending else self.ys[::-1]
-        # xs = self.xs if ascending else self.xs[::-1]
+        # np.interp does a binary search over the cached arrays which must be
+        # ascending in y.
         r = np.interp(y, self.ysSortedByY, self.xsSortedByY)
         return None if np.isnan(r) else r
 
@@ -145,33 +181,26 @@ class PolyLine:
         if x is None:
             return None
         self.vectorize()
-        # return np.interp(x, self.xs, self.ys) # this probably doesn't work b/c the xs are not neccesarily in the right order...
-        # ascending = self.xs[0]<self.xs[-1]
-        # ys = self.ys if ascending else self.ys[::-1]
-        # xs = self.xs if ascending else self.xs[::-1]
-        r = np.interp(x, self.xs, self.ys)
+        r = np.interp(x, self.xsSortedByX, self.ysSortedByX)
         return None if np.isnan(r) else r
 
-    # probably replace w/ zip()
     def vectorize(self):
         if not self.points:
             return None, None
-        if (self.xs == None or self.ys == None):
-            xs = [None] * len(self.points)
-            ys = [None] * len(self.points)
-            c = 0
-            for p in self.points:
-                xs[c] = p.x
-                ys[c] = p.y
-                c += 1
-            self.xs = xs
-            self.ys = ys
-            if self.ys[0] < self.ys[-1]:
-                self.xsSortedByY = self.xs
-                self.ysSortedByY = self.ys
+        if self.xs is None or self.ys is None:
+            xs = np.fromiter((p.x for p in self.points), dtype=float, count=len(self.points))
+            ys = np.fromiter((p.y for p in self.points), dtype=float, count=len(self.points))
+            self.xs = xs.tolist()
+            self.ys = ys.tolist()
+            if ys[0] < ys[-1]:
+                self.xsSortedByY = xs
+                self.ysSortedByY = ys
             else:
-                self.xsSortedByY = self.xs[::-1]
-                self.ysSortedByY = self.ys[::-1]
+                self.xsSortedByY = np.ascontiguousarray(xs[::-1])
+                self.ysSortedByY = np.ascontiguousarray(ys[::-1])
+            order = np.argsort(xs, kind='mergesort')
+            self.xsSortedByX = xs[order]
+            self.ysSortedByX = ys[order]
         return self.xs, self.ys
 
     def tuppleize(self):
@@ -245,10 +274,62 @@ class PolyLine:
             return False
         return True
 
+    @staticmethod
+    def _first_between(line, point):
+        """Index of the first segment of line that contains point, or None."""
+        ax, ay = line[:-1, 0], line[:-1, 1]
+        bx, by = line[1:, 0], line[1:, 1]
+        cx, cy = point
+        crossproduct = (cy - ay) * (bx - ax) - (cx - ax) * (by - ay)
+        dotproduct = (cx - ax) * (bx - ax) + (cy - ay) * (by - ay)
+        squaredlengthba = (bx - ax) * (bx - ax) + (by - ay) * (by - ay)
+        hits = np.abs(crossproduct) <= 1e-12
+        hits &= dotproduct >= 0
+        hits &= dotproduct <= squaredlengthba
+        hits &= np.isfinite(crossproduct)
+        idx = np.flatnonzero(hits)
+        return idx[0] if idx.size else None
+
+    @staticmethod
+    def _first_segment_intersection(pl_1, pl_2):
+        """Indices (i, j) of the first intersecting segment pair, or None.
+
+        Pairs are tested all at once with broadcasting and the first hit in
+        row-major order is returned, matching a nested scan over pl_1 then pl_2.
+        """
+        ax, ay = pl_1[:-1, 0, None], pl_1[:-1, 1, None]
+        bx, by = pl_1[1:, 0, None], pl_1[1:, 1, None]
+        cx, cy = pl_2[None, :-1, 0], pl_2[None, :-1, 1]
+        dx, dy = pl_2[None, 1:, 0], pl_2[None, 1:, 1]
+
+        ccw_acd = (dy - ay) * (cx - ax) > (cy - ay) * (dx - ax)
+        ccw_bcd = (dy - by) * (cx - bx) > (cy - by) * (dx - bx)
+        ccw_abc = (cy - ay) * (bx - ax) > (by - ay) * (cx - ax)
+        ccw_abd = (dy - ay) * (bx - ax) > (by - ay) * (dx - ax)
+        hits = (ccw_acd != ccw_bcd) & (ccw_abc != ccw_abd)
+
+        a_c = (ax == cx) & (ay == cy)
+        a_d = (ax == dx) & (ay == dy)
+        b_c = (bx == cx) & (by == cy)
+        b_d = (bx == dx) & (by == dy)
+        hits |= a_c | a_d | b_c | b_d
+
+        valid_1 = np.isfinite(pl_1).all(axis=1)
+        valid_2 = np.isfinite(pl_2).all(axis=1)
+        hits &= (valid_1[:-1] & valid_1[1:])[:, None]
+        hits &= (valid_2[:-1] & valid_2[1:])[None, :]
+
+        flat = np.flatnonzero(hits)
+        if not flat.size:
+            return None
+        return np.unravel_index(flat[0], hits.shape)
+
     @staticmethod
     def intersection(pl_1, pl_2):
         pl_1 = pl_1.points
         pl_2 = pl_2.points
+        p1 = np.array(pl_1, dtype=float).reshape(-1, 2)
+        p2 = np.array(pl_2, dtype=float).reshape(-1, 2)
 
         # we have two points
         if len(pl_1) == 1 and len(pl_2) == 1:
@@ -261,37 +342,34 @@ class PolyLine:
         elif len(pl_1) == 1 or len(pl_2) == 1:
             if len(pl_1) == 1:
                 point = pl_1[0]
-                line = pl_2
+                line = p2
             else:
                 point = pl_2[0]
-                line = pl_1
-            for j, pl_2_1 in enumerate(line[:-1]):
-                pl_2_2 = line[j + 1]
-                if PolyLine.between(pl_2_1, pl_2_2, point):
-                    quantity = point[0]
-                    price = point[1]
-                    return quantity, price
+                line = p1
+            if PolyLine._first_between(line, point) is not None:
+                quantity = point[0]
+                price = point[1]
+                return quantity, price
 
         # we have line segments
         elif len(pl_1) > 1 and len(pl_2) > 1:
-            for i, pl_1_1 in enumerate(pl_1[:-1]):
-                pl_1_2 = pl_1[i + 1]
-                for j, pl_2_1 in enumerate(pl_2[:-1]):
-                    pl_2_2 = pl_2[j + 1]
-                    if PolyLine.segment_intersects((pl_1_1, pl_1_2), (pl_2_1, pl_2_2)):
-                        quantity, price = PolyLine.segment_intersection((pl_1_1, pl_1_2), (pl_2_1, pl_2_2))
-                        return quantity, price
-        p1_qmax = max([point[0] for point in pl_1])
-        p1_qmin = min([point[0] for point in pl_1])
-
-        p2_qmax = max([point[0] for point in pl_2])
-        p2_qmin = min([point[0] for point in pl_2])
-
-        p1_pmax = max([point[1] for point in pl_1])
-        p2_pmax = max([point[1] for point in pl_2])
-
-        p1_pmin = min([point[1] for point in pl_1])
-        p2_pmin = min([point[1] for point in pl_2])
+            pair = PolyLine._first_segment_intersection(p1, p2)
+            if pair is not None:
+                i, j = pair
+                quantity, price = PolyLine.segment_intersection((pl_1[i], pl_1[i + 1]), (pl_2[j], pl_2[j + 1]))
+                return quantity, price
+
+        p1_qmax = p1[:, 0].max()
+        p1_qmin = p1[:, 0].min()
+
+        p2_qmax = p2[:, 0].max()
+        p2_qmin = p2[:, 0].min()
+
+        p1_pmax = p1[:, 1].max()
+        p2_pmax = p2[:, 1].max()
+
+        p1_pmin = p1[:, 1].min()
+        p2_pmin = p2[:, 1].min()
         # The lines don't intersect, add the auxillary information
         # TODO - clean this method up.
         if p1_pmax <= p2_pmax and p1_pmax <=p2_pmin:
@@ -303,8 +381,8 @@ class PolyLine:
             price = p2_pmin
 
         elif p2_qmax >= p1_qmin and p2_qmax >= p1_qmax:
-            quantity = np.mean([point[0] for point in pl_1])
-            price = np.mean([point[1] for point in pl_1])
+            quantity = p1[:, 0].mean()
+            price = p1[:, 1].mean()
 
         elif p2_qmin <= p1_qmin and p2_qmin <= p1_qmax:
             quantity = p2_qmax
@@ -53,6 +53,7 @@
 
 #}}}
 
+import heapq
 import numpy as np
 import logging
 #from poly_line import PolyLine
@@ -75,7 +76,9 @@ def remove(duplicate):
 
 class PolyLineFactory(object):
     @staticmethod
-    def combine(lines, increment):
+    def combine(lines, increment=None):
+        if increment is None:
+            return PolyLineFactory.combine_exact(lines)
 
         # we return a new PolyLine which is a composite (summed horizontally) of inputs
         composite = PolyLine()
@@ -126,37 +129,84 @@ class PolyLineFactory(object):
 
     @staticmethod
     def combine_withoutincrement(lines):
+        if len(lines) == 1 and isinstance(lines[0], list):
+            composite = PolyLine()
+            for point in lines[0]:
+                composite.add(Point(point[0], point[1]))
+            return composite
+        return PolyLineFactory.combine_exact(lines)
 
-        # we return a new PolyLine which is a composite (summed horizontally) of inputs
-        composite = PolyLine()
-        if len(lines) < 2:
-            if isinstance(lines[0], list):
-                for point in lines[0]:
-                    composite.add(Point(point[0], point[1]))
-                return composite
+    @staticmethod
+    def combine_exact(lines):
+        """
+        Sum the curves horizontally at every price breakpoint of every curve.
+
+        Each curve is piecewise linear in price and flat outside its price
+        range, the same as PolyLine.x.  The breakpoints of all curves are
+        merged in ascending price with a heap and the running sum is moved
+        along by the total slope of the segments in effect, so only the curves
+        with a breakpoint at a price are touched there.  This is
+        O(total points * log N) instead of evaluating every curve at every
+        breakpoint.
+        :param lines: list of PolyLine
+        :return: PolyLine
+        """
+        lines = [line for line in lines if line is not None and line.points]
+        if not lines:
+            return PolyLine()
+        if len(lines) == 1:
             return lines[0]
-        # find the range defined by the curves
-        ys=[]
-        for l in lines:
-            ys=ys+l.vectorize()[1]
 
-        ys = remove(ys)
-        
-        ys.sort(reverse=True)
-        for y in ys:
-            xt = None
-            for line in lines:
-                x = line.x(y)
-                if x is not None:
-                    xt = x if xt is None else xt + x
-            composite.add(Point(xt, y))
-        return composite
+        events = []
+        slopes = [0.0] * len(lines)
+        xs_by_line = []
+        ys_by_line = []
+        for i, line in enumerate(lines):
+            line.vectorize()
+            ys = line.ysSortedByY.tolist()
+            xs = line.xsSortedByY.tolist()
+            xs_by_line.append(xs)
+            ys_by_line.append(ys)
+            # One event per distinct price: (price, line, first index, last index).
+            line_events = []
+            first = 0
+            for k in range(1, len(ys) + 1):
+                if k == len(ys) or ys[k] != ys[first]:
+                    line_events.append((ys[first], i, first, k - 1))
+                    first = k
+            events.append(line_events)
+
+        # Below the lowest price every curve is at the quantity of its first point.
+        total = float(np.sum([xs[0] for xs in xs_by_line]))
+        slope = 0.0
+        sloped = 0
+        prev_y = None
+        points = []
+        for y, i, first, last in heapq.merge(*events):
+            if y != prev_y:
+                if prev_y is not None:
+                    points.append(Point(total, prev_y))
+                    total += slope * (y - prev_y)
+                prev_y = y
+            xs = xs_by_line[i]
+            ys = ys_by_line[i]
+            # Vertical steps jump from the first to the last quantity at this price.
+            total += xs[last] - xs[first]
+            new_slope = 0.0
+            if last + 1 < len(xs):
+                new_slope = (xs[last + 1] - xs[last]) / (ys[last + 1] - ys[last])
+            sloped += (new_slope != 0.0) - (slopes[i] != 0.0)
+            slope += new_slope - slopes[i]
+            slopes[i] = new_slope
+            # Drop accumulated round off once no curve has a sloped segment.
+            if not sloped:
+                slope = 0.0
+        points.append(Point(total, prev_y))
+        return PolyLine(points)
 
     @staticmethod
     def fromTupples(points):
         poly_line = PolyLine()
-        for p in points:
-            if p is not None and len(p) == 2:
-                poly_line.add(Point(p[0], p[1]))
+        poly_line.extend(Point(p[0], p[1]) for p in points if p is not None and len(p) == 2)
         return poly_line
 
@@ -99,15 +99,51 @@ class RegistrationManager(object):
                 result, error_message = registration.make_offer(buyer_seller, curve, self.rpc_proxy)
         return result, error_message
 
+    def make_offers(self, offers):
+        """
+        Make offers on several markets with one call to the MarketService.
+
+        :param offers: A list of (market_name, buyer_seller, curve) entries.
+        :return: A list of (result, error_message) tuples in the same order as offers.
+        """
+        results = [None] * len(offers)
+        to_send = []
+        for index, (market_name, buyer_seller, curve) in enumerate(offers):
+            registration = None
+            for candidate in self.registrations:
+                if candidate.market_name == market_name:
+                    registration = candidate
+            if registration is None:
+                error_message = "Market: {} {} was not found in the local list of markets".format(market_name,
+                                                                                                  buyer_seller)
+                results[index] = (False, error_message)
+                continue
+            is_ok, error_message = registration.ok_to_make_offer()
+            if is_ok:
+                to_send.append((index, registration))
+            else:
+                results[index] = registration.offer_result(False, error_message)
+
+        if to_send:
+            rpc_results = self.rpc_proxy.make_offers([offers[index] for index, _ in to_send])
+            for (index, registration), (result, error_message) in zip(to_send, rpc_results):
+                results[index] = registration.offer_result(result, error_message)
+        return results
+
     def request_reservations(self, timestamp):
         greenlets = []
         _log.debug("Registration manager request_reservations")
-        for registration in self.registrations:
-            if GREENLET_ENABLED:
+        if GREENLET_ENABLED:
+            for registration in self.registrations:
                 event = gevent.spawn(registration.request_reservations, timestamp, self.rpc_proxy)
                 greenlets.append(event)
-            else:
-                registration.request_reservations(timestamp, self.rpc_proxy)
+        else:
+            # One round trip for all the markets this agent wants to join.
+            wanted = [registration for registration in self.registrations if registration.wants_reservation(timestamp)]
+            reservations = [(registration.market_name, registration.buyer_seller) for registration in wanted]
+            has_reservations = self.rpc_proxy.make_reservations(reservations)
+            for registration, has_reservation in zip(wanted, has_reservations):
+                registration.set_reservation(has_reservation)
         gevent.joinall(greenlets)
         _log.debug("After request reserverations!")
 
@@ -61,7 +61,7 @@ import gevent
 
 from volttron.platform.agent import utils
 from volttron.platform.agent.known_identities import PLATFORM_MARKET_SERVICE
-from volttron.platform.jsonrpc import RemoteError
+from volttron.platform.jsonrpc import RemoteError, MethodNotFound
 
 _log = logging.getLogger(__name__)
 utils.setup_logging()
@@ -125,8 +125,69 @@ class RpcProxy(object):
             _log.info(
                 "Market: {} {} has had an offer rejected because {}".format(market_name, buyer_seller, e.message))
         except gevent.Timeout as e:
-            result = (False, e.message)
-            _log.info("Market: {} {} has had an offer rejected because {}".format(market_name, buyer_seller, e.message))
+            result = (False, str(e))
+            _log.info("Market: {} {} has had an offer rejected because {}".format(market_name, buyer_seller, str(e)))
         return result
 
+    def make_reservations(self, reservations):
+        """
+        This call makes several reservations with the MarketService in a single round trip.
+
+        :param reservations: A list of (market_name, buyer_seller) entries.
+
+        :return: A list with one boolean per entry indicating whether the reservation was made.
+        """
+        if not reservations:
+            return []
+        entries = [[market_name, buyer_seller] for market_name, buyer_seller in reservations]
+        try:
+            results = self.rpc_call(PLATFORM_MARKET_SERVICE, 'make_reservations', entries).get(timeout=300.0)
+            has_reservations = [bool(result[0]) for result in results]
+        except MethodNotFound:
+            # Older market service without the batch call.
+            has_reservations = [self.make_reservation(market_name, buyer_seller)
+                                for market_name, buyer_seller in entries]
+        except RemoteError as e:
+            has_reservations = [False] * len(entries)
+        except gevent.Timeout as e:
+            has_reservations = [False] * len(entries)
+        return has_reservations
 
+    def make_offers(self, offers):
+        """
+        This call makes several offers with the MarketService in a single round trip.
+
+        :param offers: A list of (market_name, buyer_seller, curve) entries.
+
+        :return: A list with one (result, error_message) tuple per entry.  A rejected entry
+        does not affect the result of the other entries.
+        """
+        if not offers:
+            return []
+        entries = [[market_name, buyer_seller, curve.tuppleize()] for market_name, buyer_seller, curve in offers]
+        try:
+            results = self.rpc_call(PLATFORM_MARKET_SERVICE, 'make_offers', entries).get(timeout=300.0)
+        except MethodNotFound:
+            # Older market service without the batch call.
+            return [self.make_offer(market_name, buyer_seller, curve) for market_name, buyer_seller, curve in offers]
+        except RemoteError as e:
+            _log.info("Offers for {} markets were rejected because {}".format(len(offers), e.message))
+            return [(False, e.message)] * len(offers)
+        except gevent.Timeout as e:
+            _log.info("Offers for {} markets were rejected because {}".format(len(offers), str(e)))
+            return [(False, str(e))] * len(offers)
+
+        offer_results = []
+        for (market_name, buyer_seller, curve), (accepted, error_message) in zip(offers, results):
+            if accepted:
+                offer_results.append((True, None))
+                if self.verbose_logging:
+                    _log.debug("Market: {} {} has made an offer Curve: {}".format(market_name,
+                                                                                  buyer_seller,
+                                                                                  curve.points))
+            else:
+                offer_results.append((False, error_message))
+                _log.info("Market: {} {} has had an offer rejected because {}".format(market_name,
+                                                                                      buyer_seller,
+                                                                                      error_message))
+        return offer_results
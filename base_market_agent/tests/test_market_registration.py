@@ -59,6 +59,7 @@
 import pytest
 
 from volttron.platform.agent.base_market_agent.market_registration import MarketRegistration
+from volttron.platform.agent.base_market_agent.registration_manager import RegistrationManager
 from volttron.platform.agent.base_market_agent.buy_sell import BUYER, SELLER
 from volttron.platform.agent.utils import get_aware_utc_now
 from volttron.platform.agent.base_market_agent.point import Point
@@ -100,6 +101,34 @@ def test_market_registration_offer_callback():
     registration.request_offers(get_time)
     assert agent.offer_made == True
 
+@pytest.mark.market
+def test_registration_manager_batches_reservations():
+    agent = MockAgent()
+    manager = RegistrationManager(agent)
+    manager.make_registration('test_market_0', SELLER, None, null_callback, None, None, None)
+    manager.make_registration('test_market_1', BUYER, wants_registration_false_callback, null_callback, None, None, None)
+    manager.make_registration('test_market_2', BUYER, None, null_callback, None, None, None)
+    manager.request_reservations(get_time())
+    assert agent.batches == [[('test_market_0', SELLER), ('test_market_2', BUYER)]]
+    assert [r.has_reservation for r in manager.registrations] == [True, False, True]
+
+@pytest.mark.market
+def test_registration_manager_offers_keep_per_entry_results():
+    agent = MockAgent()
+    manager = RegistrationManager(agent)
+    manager.make_registration('test_market_0', SELLER, None, null_callback, None, None, None)
+    manager.make_registration('test_market_1', SELLER, wants_registration_false_callback, null_callback, None, None, None)
+    manager.request_reservations(get_time())
+    curve = PolyLine()
+    curve.add(Point(0, 0))
+    results = manager.make_offers([('test_market_0', SELLER, curve),
+                                   ('test_market_1', SELLER, curve),
+                                   ('no_such_market', SELLER, curve)])
+    assert results[0][0] == True
+    assert results[1][0] == False
+    assert results[2][0] == False
+    assert agent.offer_batches == [[('test_market_0', SELLER, curve)]]
+
 def wants_registration_true_callback(*unused):
     return True
 
@@ -118,6 +147,16 @@ class MockAgent(object):
         self.reservation_made = False
         self.offer_made = False
         self.has_reservation = False
+        self.batches = []
+        self.offer_batches = []
+
+    def make_reservations(self, reservations):
+        self.batches.append(list(reservations))
+        return [True] * len(reservations)
+
+    def make_offers(self, offers):
+        self.offer_batches.append(list(offers))
+        return [(True, None)] * len(offers)
 
     def make_reservation(self, market_name, buyer_seller):
         self.reservation_made = True
@@ -170,3 +170,32 @@ def create_demand_curve():
     quantity = 0
     demand_curve.add(Point(price,quantity))
     return demand_curve
+
+@pytest.mark.market
+def test_poly_line_extend_matches_add():
+    points = [Point(0, 10), Point(5, 5), Point(5, 5), Point(10, 0), Point(2, 5)]
+    added = PolyLine()
+    for point in points:
+        added.add(point)
+    extended = PolyLine(points)
+    assert extended.points == added.points
+    assert extended.min_x() == added.min_x()
+    assert extended.max_y() == added.max_y()
+
+@pytest.mark.market
+def test_poly_line_x_lookup():
+    demand = create_demand_curve()
+    assert demand.x(250) == 750
+
+@pytest.mark.market
+def test_poly_line_y_lookup_supply():
+    supply = create_supply_curve()
+    assert supply.y(250) == 250
+
+@pytest.mark.market
+def test_poly_line_intersection_value():
+    demand = create_demand_curve()
+    supply = create_supply_curve()
+    quantity, price = PolyLine.intersection(demand, supply)
+    assert quantity == 500
+    assert price == 500
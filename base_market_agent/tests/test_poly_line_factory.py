@@ -81,6 +81,31 @@ def test_poly_line_combine_demand():
     assert combined_curves.min_y() == 0
     assert combined_curves.max_y() == 1000
 
+@pytest.mark.market
+def test_poly_line_combine_exact_at_breakpoints():
+    demand_curve = PolyLine([Point(100, 0.1), Point(60, 0.3), Point(20, 0.5)])
+    stepped_curve = PolyLine([Point(50, 0.2), Point(10, 0.2), Point(0, 0.4)])
+    combined_curve = PolyLineFactory.combine_exact([demand_curve, stepped_curve])
+    # Below 0.2 the stepped curve sits at its first point, at 0.2 it has
+    # stepped to 50.
+    expected = [(20, 0.5), (40, 0.4), (60 + 25, 0.3), (80 + 50, 0.2), (100 + 10, 0.1)]
+    assert [y for x, y in combined_curve.tuppleize()] == [y for x, y in expected]
+    assert [x for x, y in combined_curve.tuppleize()] == pytest.approx([x for x, y in expected])
+
+@pytest.mark.market
+def test_poly_line_combine_exact_matches_evaluation():
+    curves = [create_supply_curve(), create_demand_curve(),
+              PolyLine([Point(300, 250), Point(300, 750), Point(600, 900)])]
+    combined_curve = PolyLineFactory.combine_exact(curves)
+    for x, y in combined_curve.tuppleize():
+        assert x == pytest.approx(sum(curve.x(y) for curve in curves))
+
+@pytest.mark.market
+def test_poly_line_combine_without_increment_is_exact():
+    curves = [create_supply_curve(), create_demand_curve()]
+    assert PolyLineFactory.combine_withoutincrement(curves).tuppleize() == \
+        PolyLineFactory.combine(curves).tuppleize()
+
 @pytest.mark.market
 def test_poly_line_from_tupples():
     demand_curve = create_demand_curve()
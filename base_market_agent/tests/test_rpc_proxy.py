@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2017, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+# under Contract DE-AC05-76RL01830
+
+# }}}
+
+import gevent
+import pytest
+
+from volttron.platform.agent.base_market_agent.rpc_proxy import RpcProxy
+from volttron.platform.agent.base_market_agent.buy_sell import BUYER, SELLER
+from volttron.platform.agent.base_market_agent.point import Point
+from volttron.platform.agent.base_market_agent.poly_line import PolyLine
+from volttron.platform.jsonrpc import MethodNotFound
+
+@pytest.mark.market
+def test_make_offers_timeout_rejects_each_entry():
+    rpc = MockRpc(error=gevent.Timeout(300.0))
+    proxy = RpcProxy(rpc.call)
+    offers = [('test_market_0', BUYER, make_curve()), ('test_market_1', SELLER, make_curve())]
+    results = proxy.make_offers(offers)
+    assert [result for result, _ in results] == [False, False]
+    assert all(isinstance(message, str) for _, message in results)
+    assert rpc.calls == [('make_offers', 2)]
+
+@pytest.mark.market
+def test_make_offer_timeout_is_rejected():
+    rpc = MockRpc(error=gevent.Timeout(300.0))
+    proxy = RpcProxy(rpc.call)
+    result, message = proxy.make_offer('test_market_0', BUYER, make_curve())
+    assert result == False
+    assert isinstance(message, str)
+
+@pytest.mark.market
+def test_make_offers_keeps_per_entry_results():
+    rpc = MockRpc(results=[[True, None], [False, 'Market: test_market_1 is not accepting offers.']])
+    proxy = RpcProxy(rpc.call)
+    results = proxy.make_offers([('test_market_0', BUYER, make_curve()), ('test_market_1', BUYER, make_curve())])
+    assert results == [(True, None), (False, 'Market: test_market_1 is not accepting offers.')]
+
+@pytest.mark.market
+def test_make_offers_falls_back_to_single_offers():
+    rpc = MockRpc(error=MethodNotFound())
+    proxy = RpcProxy(rpc.call)
+    results = proxy.make_offers([('test_market_0', BUYER, make_curve()), ('test_market_1', BUYER, make_curve())])
+    assert [result for result, _ in results] == [True, True]
+    assert rpc.calls == [('make_offers', 2), ('make_offer', 'test_market_0'), ('make_offer', 'test_market_1')]
+
+def make_curve():
+    curve = PolyLine()
+    curve.add(Point(0, 0))
+    curve.add(Point(10, 10))
+    return curve
+
+class MockResult(object):
+    def __init__(self, value=None, error=None):
+        self.value = value
+        self.error = error
+
+    def get(self, timeout=None):
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+class MockRpc(object):
+    """Stands in for vip.rpc.call; only the batch call raises the given error."""
+    def __init__(self, results=None, error=None):
+        self.results = results
+        self.error = error
+        self.calls = []
+
+    def call(self, peer, method, *args):
+        if method == 'make_offers':
+            self.calls.append((method, len(args[0])))
+            return MockResult(self.results, self.error)
+        self.calls.append((method, args[0]))
+        if isinstance(self.error, gevent.Timeout):
+            return MockResult(error=self.error)
+        return MockResult()
@@ -58,7 +58,9 @@
 import logging
 import socket
 import sys
+import codecs
 import json
+import re
 from collections import defaultdict
 from gevent import monkey, sleep
 from volttron.platform.agent import utils
@@ -72,6 +74,86 @@ SUCCESS = 'SUCCESS'
 FAILURE = 'FAILURE'
 
 
+class JSONStreamDecoder:
+    """
+    Incrementally decodes a stream of JSON messages.  Messages may be
+    separated by whitespace, newlines or the null terminator Modelica
+    uses, and may be split across or share socket reads.  A malformed
+    message is logged and skipped; invalid UTF-8 bytes are replaced.
+    """
+    SEPARATORS = ' \t\r\n\0'
+    # Text a decode error may stop at when a number or literal is cut off
+    # at the end of the buffer.
+    PARTIAL_NUMBER = re.compile(r'[-+.eE0-9]*$')
+    LITERALS = ('true', 'false', 'null', 'NaN', 'Infinity', '-Infinity')
+
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+        # Holds at most the 3 leading bytes of a character split across reads.
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.buffer = ''
+
+    @property
+    def pending(self):
+        return self.text_decoder.getstate()[0]
+
+    def feed(self, data):
+        """
+        Add bytes read from the socket and return the complete messages.
+        :param data: bytes
+        :return: list of decoded messages
+        """
+        self.buffer += self.text_decoder.decode(data)
+        messages = []
+        index = 0
+        end = len(self.buffer)
+        while True:
+            while index < end and self.buffer[index] in self.SEPARATORS:
+                index += 1
+            if index == end:
+                break
+            try:
+                message, index = self.decoder.raw_decode(self.buffer, index)
+            except json.JSONDecodeError as ex:
+                if self.is_incomplete(ex):
+                    # Wait for the rest of the message.
+                    break
+                skip = self.next_separator(ex.pos)
+                log.error('Skipping malformed message from Modelica (%s): %r', ex, self.buffer[index:skip])
+                index = skip
+                continue
+            messages.append(message)
+        self.buffer = self.buffer[index:]
+        return messages
+
+    def is_incomplete(self, ex):
+        """
+        True if the decode error is only caused by the message running to
+        the end of the buffer.
+        :param ex: json.JSONDecodeError
+        """
+        rest = self.buffer[ex.pos:]
+        if not rest or ex.msg.startswith('Unterminated string'):
+            return True
+        if ex.msg.startswith('Invalid \\uXXXX escape'):
+            return len(rest) < 6
+        return bool(self.PARTIAL_NUMBER.match(rest)) or any(literal.startswith(rest) for literal in self.LITERALS)
+
+    def next_separator(self, start):
+        """
+        Index of the message terminator (newline or null) at or after start,
+        else of the next whitespace, else the end of the buffer.
+        """
+        for separators in ('\n\0', self.SEPARATORS):
+            found = [i for i in (self.buffer.find(sep, start) for sep in separators) if i >= 0]
+            if found:
+                return min(found)
+        return len(self.buffer)
+
+    def has_partial(self):
+        return bool(self.buffer) or bool(self.pending)
+
+
 class SocketServer:
     """
     Socket server class that facilitates communication with Modelica.
@@ -88,7 +170,7 @@ class SocketServer:
         self.sock.bind((host, port))
         self.client = None
         self.received_data = None
-        self.size = 4096
+        self.size = 65536
         log.debug('Bound to %s on %s' % (port, host))
 
     def run(self):
@@ -111,28 +193,53 @@ class SocketServer:
             # connection is closed by SocketServer after each transmittal.
             self.client, addr = self.sock.accept()
             log.debug('Connected with %s:%s', addr[0], addr[1])
-            data = self.receive_data()
-            # Python3 will send the data as a byte not a string
-            data = data.decode('utf-8')
-            log.debug('Modelica data %s', data)
-            if data:
-                data = json.loads(data)
+            for data in self.receive_messages():
                 self.received_data = data
                 self.on_receive_data(data)
 
+    def receive_messages(self):
+        """
+        Read from the client until at least one complete JSON message has
+        been received and no message is left partially read.  A payload
+        larger than the read size is read across as many reads as it needs.
+        Consecutive output dictionaries are merged so all outputs that
+        arrive together are published together.
+        :return: list of messages
+        """
+        decoder = JSONStreamDecoder()
+        messages = []
+        while True:
+            data = self.receive_data()
+            if not data:
+                if decoder.has_partial():
+                    log.error('Connection closed with an incomplete message: %s', decoder.buffer)
+                break
+            messages.extend(decoder.feed(data))
+            if messages and not decoder.has_partial():
+                break
+        log.debug('Modelica data %s', messages)
+        batched = []
+        for message in messages:
+            if isinstance(message, dict) and batched and isinstance(batched[-1], dict) \
+                    and not set(message).intersection(batched[-1]):
+                batched[-1].update(message)
+            else:
+                batched.append(message)
+        return batched
+
     def receive_data(self):
         """
         Client resource receives data payload from Modelica.
         :return: data where input data is a list output data is a
         dictionary.
         """
+        data = None
         if self.client is not None and self.sock is not None:
             try:
                 data = self.client.recv(self.size)
             except Exception:
                 log.error('We got an error trying to read a message')
-                data = None
-            return data
+        return data
 
     def on_receive_data(self, data):
         """
@@ -339,7 +446,7 @@ class ModelicaAgent(Agent):
         # For Python2 a string would be used.
         msg = msg.encode()
         # Send the input to Modelica via the SocketServer.
-        self.socket_server.client.send(msg)
+        self.socket_server.client.sendall(msg)
 
     def publish_modelica_data(self, data):
         """
@@ -355,7 +462,7 @@ class ModelicaAgent(Agent):
         log.debug('Modelica publish method %s', data)
         self.construct_data_payload(data)
         for key in data:
-            self.data_map.pop(key)
+            self.data_map.pop(key, None)
         # data_map will be empty when all data for a timestep
         # is received.
         if self.data_map:
@@ -364,8 +471,8 @@ class ModelicaAgent(Agent):
         # built in construct_data_payload  The key is the device publish
         # topic and the value is the data payload in the same format that the
         # MasterDriverAgent uses.
+        self.data_map = dict(self.data_map_master)
         for topic, value in self.output_data.items():
-            self.data_map = dict(self.data_map_master)
             headers = {'Timestep': self.time_step}
             publish_topic = "/".join([topic, "all"])
             log.debug('Publish - topic %s ----- payload %s', topic, value)
@@ -385,6 +492,9 @@ class ModelicaAgent(Agent):
         :return:
         """
         for key, payload in data.items():
+            if key not in self.data_map_master:
+                log.warning('Received output %s that is not configured', key)
+                continue
             data_map = self.data_map_master[key]
             topic = data_map['topic']
             name = data_map['field']
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+pytest.importorskip("volttron")
+
+from modelica_agent.agent import JSONStreamDecoder
+
+
+def test_split_message():
+    data = json.dumps({"zone_temp": {"value": 22.5, "time": 60}}).encode('utf-8') + b'\0'
+    for cut in range(1, len(data) - 1):
+        decoder = JSONStreamDecoder()
+        assert decoder.feed(data[:cut]) == []
+        assert decoder.has_partial()
+        assert decoder.feed(data[cut:]) == [{"zone_temp": {"value": 22.5, "time": 60}}]
+        assert not decoder.has_partial()
+
+
+def test_split_multibyte_character():
+    decoder = JSONStreamDecoder()
+    data = json.dumps({"unit": u"°C"}, ensure_ascii=False).encode('utf-8')
+    cut = data.index(b'\xc2') + 1
+    assert decoder.feed(data[:cut]) == []
+    assert decoder.pending == b'\xc2'
+    assert decoder.feed(data[cut:]) == [{"unit": u"°C"}]
+    assert not decoder.has_partial()
+
+
+def test_concatenated_messages():
+    decoder = JSONStreamDecoder()
+    data = b'{"a": 1}{"b": 2}\n{"c": [1, 2]} {"d": true}\0{"e": -1.5e'
+    assert decoder.feed(data) == [{"a": 1}, {"b": 2}, {"c": [1, 2]}, {"d": True}]
+    assert decoder.feed(b'2}\n') == [{"e": -150.0}]
+    assert not decoder.has_partial()
+
+
+def test_malformed_message_is_skipped():
+    decoder = JSONStreamDecoder()
+    assert decoder.feed(b'{"a": 1, bad}\n{"b": 2}\n') == [{"b": 2}]
+    assert not decoder.has_partial()
+    # The stream keeps going after a malformed message.
+    assert decoder.feed(b'{"c": 3}\0') == [{"c": 3}]
+
+
+def test_invalid_utf8_does_not_stall():
+    decoder = JSONStreamDecoder()
+    assert decoder.feed(b'{"a": "x\xffy"}\n{"b": 2}\n') == [{"a": u"x\ufffdy"}, {"b": 2}]
+    assert decoder.feed(b'\xff\n{"c": 3}\n') == [{"c": 3}]
+    assert decoder.pending == b''
+    assert not decoder.has_partial()
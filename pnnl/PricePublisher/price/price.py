@@ -58,8 +58,6 @@
 
 import sys
 import logging
-from datetime import timedelta as td
-import pandas as pd
 import dateutil.tz
 from dateutil import parser
 from volttron.platform.vip.agent import Agent, Core
@@ -69,6 +67,8 @@ from volttron.platform.agent.utils import format_timestamp
 from volttron.platform.agent.base_market_agent import MarketAgent
 from volttron.platform.agent.base_market_agent.buy_sell import SELLER
 
+from price.price_store import PriceStore
+
 
 _log = logging.getLogger(__name__)
 utils.setup_logging()
@@ -110,7 +110,7 @@ class PricePublisherAgent(MarketAgent):
         super(PricePublisherAgent, self).__init__(verbose_logging, **kwargs)
         self.agent_name = agent_name
         self.price_file = price_file
-        self.power_prices = None
+        self.price_store = None
         self.join_market(market_name, SELLER, self.reservation_callback, self.offer_callback,
                          None, self.price_callback, self.error_callback)
 
@@ -126,15 +126,7 @@ class PricePublisherAgent(MarketAgent):
             _log.debug("Electric supplier has no price information from file: {}".format(self.price_file))
             sys.exit()
         try:
-            self.power_prices = pd.read_csv(self.price_file)
-            self.power_prices = self.power_prices.set_index(self.power_prices.columns[0])
-            self.power_prices.index = pd.to_datetime(self.power_prices.index, format="%m/%d/%Y %H:%M")
-
-            self.power_prices['MA'] = self.power_prices.rolling(window=24).mean()
-            self.power_prices['STD'] = self.power_prices["price"].rolling(window=24).std()
-            self.power_prices['month'] = self.power_prices.index.month.astype(int)
-            self.power_prices['day'] = self.power_prices.index.day.astype(int)
-            self.power_prices['hour'] = self.power_prices.index.hour.astype(int)
+            self.price_store = PriceStore.from_csv(self.price_file, date_format="%m/%d/%Y %H:%M")
         except:
             _log.debug("ERROR reading price file!")
             sys.exit()
@@ -150,10 +142,7 @@ class PricePublisherAgent(MarketAgent):
             current_offset = 23
         current_time = timestamp.replace(hour=current_offset, month=8, year=2017, tzinfo=None)
         _log.debug("Parsed_time: {}".format(current_time))
-        end_time = current_time + td(hours=24)
-        mask = (self.power_prices.index > current_time) & (self.power_prices.index <= end_time)
-        prices = self.power_prices.loc[mask]
-        prices = [price for price in prices['price']]
+        prices = self.price_store.next_hours(current_time, 24)
         self.vip.pubsub.publish(peer='pubsub',
                                 topic='mixmarket/start_new_cycle',
                                 message={"prices": prices,
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*- {{{
+# vim: set fenc=utf-8 ft=python sw=4 ts=4 sts=4 et:
+
+# Copyright (c) 2016, Battelle Memorial Institute
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# The views and conclusions contained in the software and documentation
+# are those of the authors and should not be interpreted as representing
+# official policies, either expressed or implied, of the FreeBSD
+# Project.
+#
+# This material was prepared as an account of work sponsored by an
+# agency of the United States Government.  Neither the United States
+# Government nor the United States Department of Energy, nor Battelle,
+# nor any of their employees, nor any jurisdiction or organization that
+# has cooperated in the development of these materials, makes any
+# warranty, express or implied, or assumes any legal liability or
+# responsibility for the accuracy, completeness, or usefulness or any
+# information, apparatus, product, software, or process disclosed, or
+# represents that its use would not infringe privately owned rights.
+#
+# Reference herein to any specific commercial product, process, or
+# service by trade name, trademark, manufacturer, or otherwise does not
+# necessarily constitute or imply its endorsement, recommendation, or
+# favoring by the United States Government or any agency thereof, or
+# Battelle Memorial Institute. The views and opinions of authors
+# expressed herein do not necessarily state or reflect those of the
+# United States Government or any agency thereof.
+#
+# PACIFIC NORTHWEST NATIONAL LABORATORY
+# operated by BATTELLE for the UNITED STATES DEPARTMENT OF ENERGY
+
+import logging
+import numpy as np
+import pandas as pd
+
+_log = logging.getLogger(__name__)
+
+
+class PriceStore(object):
+    """
+    Prices from a price file indexed by time.  The file is read once and
+    the timestamps are kept as a sorted array so a window of prices is
+    found with a binary search instead of masking the whole file.
+    """
+    def __init__(self, times, prices):
+        """
+        :param times: sequence of datetime; one per price
+        :param prices: sequence of float
+        """
+        times = pd.to_datetime(pd.Series(times)).values
+        prices = np.asarray(prices, dtype=float)
+        order = np.argsort(times, kind='mergesort')
+        self.times = times[order]
+        self.prices = prices[order]
+
+    @classmethod
+    def from_csv(cls, price_file, date_format=None, column='price'):
+        """
+        Load a price file whose first column is the timestamp.
+        :param price_file: str; path to csv file
+        :param date_format: str; strftime format of the timestamps
+        :param column: str; name of the price column
+        :return: PriceStore
+        """
+        df = pd.read_csv(price_file)
+        times = pd.to_datetime(df[df.columns[0]], format=date_format)
+        _log.debug("Loaded {} prices from {}".format(len(df), price_file))
+        return cls(times, df[column])
+
+    def __len__(self):
+        return len(self.times)
+
+    def window(self, start, end):
+        """
+        Return the prices with start < timestamp <= end.
+        :param start: datetime; timezone naive like the price file
+        :param end: datetime
+        :return: list of float
+        """
+        lo = np.searchsorted(self.times, np.datetime64(start, 'ns'), side='right')
+        hi = np.searchsorted(self.times, np.datetime64(end, 'ns'), side='right')
+        return self.prices[lo:hi].tolist()
+
+    def next_hours(self, current_time, hours):
+        """
+        Prices for the hours after current_time, up to and including
+        current_time + hours.
+        """
+        return self.window(current_time, current_time + pd.Timedelta(hours=hours))
+
+    def previous_hours(self, current_time, hours):
+        """
+        Prices for the hours before current_time, including current_time.
+        """
+        return self.window(current_time - pd.Timedelta(hours=hours), current_time)
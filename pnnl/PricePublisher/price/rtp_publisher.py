@@ -58,8 +58,6 @@
 
 import sys
 import logging
-from datetime import timedelta as td
-import pandas as pd
 import dateutil.tz
 from dateutil import parser
 from volttron.platform.vip.agent import Agent, Core
@@ -70,6 +68,8 @@ from volttron.platform.agent.base_market_agent import MarketAgent
 from volttron.platform.agent.base_market_agent.buy_sell import SELLER
 from volttron.platform.scheduling import cron
 
+from price.price_store import PriceStore
+
 
 _log = logging.getLogger(__name__)
 utils.setup_logging()
@@ -114,7 +114,7 @@ class PricePublisherAgent(Agent):
         self.price_file = price_file
         self.cron_schedule = cron_schedule
         self.timezone = timezone
-        self.power_prices = None
+        self.price_store = None
         self.building_sim_topic = building_sim_topic
         self.current_time = None
 
@@ -130,13 +130,7 @@ class PricePublisherAgent(Agent):
             _log.debug("Electric supplier has no price information from file: {}".format(self.price_file))
             sys.exit()
         try:
-            self.power_prices = pd.read_csv(self.price_file)
-            self.power_prices = self.power_prices.set_index(self.power_prices.columns[0])
-            self.power_prices.index = pd.to_datetime(self.power_prices.index)
-
-            self.power_prices['month'] = self.power_prices.index.month.astype(int)
-            self.power_prices['day'] = self.power_prices.index.day.astype(int)
-            self.power_prices['hour'] = self.power_prices.index.hour.astype(int)
+            self.price_store = PriceStore.from_csv(self.price_file)
         except:
             _log.debug("ERROR reading price file!")
             sys.exit()
@@ -171,10 +165,7 @@ class PricePublisherAgent(Agent):
         current_hour = timestamp.hour
 
         current_time = timestamp.replace(minute=0, second=0, microsecond=0, tzinfo=None)
-        start_time = current_time - td(hours=24)
-        mask = (self.power_prices.index <= current_time) & (self.power_prices.index > start_time)
-        prices = self.power_prices.loc[mask]
-        prices = [price for price in prices['price']]
+        prices = self.price_store.previous_hours(current_time, 24)
         if not prices:
             _log.debug("No time coincides to the current date/hours!  - No prices to publish")
         else:
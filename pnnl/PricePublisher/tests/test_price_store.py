@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from price.price_store import PriceStore
+
+START = datetime(2017, 8, 1, 0, 0)
+HOURS = 48
+
+
+@pytest.fixture
+def price_file(tmp_path):
+    lines = ["timestamp,price"]
+    for hour in range(HOURS):
+        stamp = START + timedelta(hours=hour)
+        lines.append("{},{}".format(stamp.strftime("%m/%d/%Y %H:%M"), 0.02 + 0.001 * hour))
+    path = tmp_path / "prices.csv"
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def masked_prices(price_file, start, end):
+    """Window of prices selected the way the publishers did before PriceStore."""
+    power_prices = pd.read_csv(price_file)
+    power_prices = power_prices.set_index(power_prices.columns[0])
+    power_prices.index = pd.to_datetime(power_prices.index, format="%m/%d/%Y %H:%M")
+    mask = (power_prices.index > start) & (power_prices.index <= end)
+    return [price for price in power_prices.loc[mask]['price']]
+
+
+CURRENT_TIMES = [
+    START - timedelta(hours=3),
+    START,
+    START + timedelta(hours=5),
+    START + timedelta(hours=5, minutes=30),
+    START + timedelta(hours=23, minutes=59),
+    START + timedelta(hours=30),
+    START + timedelta(hours=HOURS - 1),
+    START + timedelta(hours=HOURS + 6),
+]
+
+
+@pytest.mark.parametrize("current_time", CURRENT_TIMES)
+def test_next_hours(price_file, current_time):
+    store = PriceStore.from_csv(price_file, date_format="%m/%d/%Y %H:%M")
+    expected = masked_prices(price_file, current_time, current_time + timedelta(hours=24))
+    assert store.next_hours(current_time, 24) == expected
+
+
+@pytest.mark.parametrize("current_time", CURRENT_TIMES)
+def test_previous_hours(price_file, current_time):
+    store = PriceStore.from_csv(price_file)
+    expected = masked_prices(price_file, current_time - timedelta(hours=24), current_time)
+    assert store.previous_hours(current_time, 24) == expected
+
+
+def test_next_hours_boundaries(price_file):
+    store = PriceStore.from_csv(price_file, date_format="%m/%d/%Y %H:%M")
+    assert len(store) == HOURS
+    # A timestamp on the hour is excluded; the hour 24 hours later is included.
+    prices = store.next_hours(START + timedelta(hours=5), 24)
+    assert len(prices) == 24
+    assert prices[0] == pytest.approx(0.02 + 0.001 * 6)
+    assert prices[-1] == pytest.approx(0.02 + 0.001 * 29)
+    # Between timestamps the next hour is the first price.
+    assert store.next_hours(START + timedelta(hours=5, minutes=30), 24)[0] == pytest.approx(0.02 + 0.001 * 6)
+
+
+def test_next_hours_at_end_of_file(price_file):
+    store = PriceStore.from_csv(price_file, date_format="%m/%d/%Y %H:%M")
+    last = START + timedelta(hours=HOURS - 1)
+    assert len(store.next_hours(last - timedelta(hours=3), 24)) == 3
+    assert store.next_hours(last, 24) == []
+    assert store.next_hours(last + timedelta(days=1), 24) == []
+
+
+def test_unsorted_prices_are_ordered():
+    times = [START + timedelta(hours=h) for h in (3, 1, 2)]
+    store = PriceStore(times, [3.0, 1.0, 2.0])
+    assert store.next_hours(START, 24) == [1.0, 2.0, 3.0]
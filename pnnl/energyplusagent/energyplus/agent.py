@@ -68,6 +68,8 @@ from inspect import getcallargs
 import collections, sys, logging
 from calendar import monthrange
 import gevent
+from gevent.event import Event as GeventEvent
+import time
 
 from math import modf
 from volttron.platform.agent import utils
@@ -92,6 +94,7 @@ FAILURE = 'FAILURE'
 class PubSubAgent(Agent):
     def __init__(self, config_path, **kwargs):
         self.config = utils.load_config(config_path)
+        self._proceed_event = GeventEvent()
         self.inputs = collections.OrderedDict()
         self.outputs = collections.OrderedDict()
         self.month = None
@@ -107,6 +110,17 @@ class PubSubAgent(Agent):
         kwargs = self.update_kwargs_from_config(**kwargs)
         super(PubSubAgent, self).__init__(**kwargs)
 
+    @property
+    def proceed(self):
+        return self._proceed_event.is_set()
+
+    @proceed.setter
+    def proceed(self, value):
+        if value:
+            self._proceed_event.set()
+        else:
+            self._proceed_event.clear()
+
     def update_kwargs_from_config(self, **kwargs):
         signature = getcallargs(super(PubSubAgent, self).__init__)
         for arg in signature:
@@ -429,6 +443,9 @@ class SocketServer():
         self.rcvd = None
         self.host = "127.0.0.1"
         self.port = None
+        self.buffer = bytearray()
+        self.steps = 0
+        self.first_step_time = None
 
     def on_recv(self, msg):
         log.debug('Received %s' % msg)
@@ -458,10 +475,33 @@ class SocketServer():
     def recv(self):
         if self.client is not None and self.sock is not None:
             try:
-                msg = self.client.recv(self.size)
+                return self.client.recv(self.size)
             except Exception:
                 log.error('We got an error trying to read a message')
-            return msg
+        return None
+
+    def read_messages(self, data):
+        """
+        Add data read from the socket to the buffer and return the complete
+        newline terminated messages in it.  A message split across reads
+        stays in the buffer until the rest of it arrives.
+        """
+        self.buffer += data
+        messages = []
+        end = self.buffer.find(b'\n')
+        while end >= 0:
+            msg = bytes(self.buffer[:end]).strip()
+            del self.buffer[:end + 1]
+            if msg:
+                messages.append(msg)
+            end = self.buffer.find(b'\n')
+        return messages
+
+    def steps_per_second(self):
+        if self.first_step_time is None or self.steps < 2:
+            return 0.0
+        elapsed = time.time() - self.first_step_time
+        return (self.steps - 1) / elapsed if elapsed > 0 else 0.0
 
     def start(self):
         log.debug('Starting socket server')
@@ -476,9 +516,16 @@ class SocketServer():
         log.debug('server now listening')
         self.client, addr = self.sock.accept()
         log.debug('Connected with ' + addr[0] + ':' + str(addr[1]))
+        # The socket is gevent patched so recv only blocks this greenlet.
         while True:
-            msg = self.recv()
-            if msg:
+            data = self.recv()
+            if not data:
+                log.debug('EnergyPlus closed the connection')
+                break
+            for msg in self.read_messages(data):
+                if self.first_step_time is None:
+                    self.first_step_time = time.time()
+                self.steps += 1
                 self.rcvd = msg
                 self.on_recv(msg)
 
@@ -499,6 +546,7 @@ class EnergyPlusAgent(SynchronizingPubSubAgent):
         self.sent = None
         self.rcvd = None
         self.socket_server = None
+        self.step_report_interval = self.config.get('step_report_interval', 1440)
         self.simulation = None
         self.step = None
         self.eplus_inputs = 0
@@ -625,12 +673,13 @@ class EnergyPlusAgent(SynchronizingPubSubAgent):
     def recv_eplus_msg(self, msg):
         self.rcvd = msg
         self.parse_eplus_msg(msg)
-        if self.sim_flag != '1':
+        if self.socket_server is not None and self.socket_server.steps % self.step_report_interval == 0:
+            self.log_step_rate()
+        if self.sim_flag != 1.0:
             self.publish_all_outputs()
         log.debug("Cosim realtime: {} -- periodic {} -- proceed {}".format(self.realtime, self.rt_periodic, self.proceed))
         if self.realtime and self.rt_periodic is None:
-            while not self.proceed:
-                gevent.sleep(0.25)
+            self._proceed_event.wait()
             timestep = 60. / (self.timestep*self.time_scale)*60.
             self.rt_periodic = self.core.periodic(timestep, self.run_periodic, wait=timestep)
         if self.cosimulation_sync:
@@ -668,10 +717,9 @@ class EnergyPlusAgent(SynchronizingPubSubAgent):
         self.send_eplus_msg()
 
     def parse_eplus_msg(self, msg):
-        msg = msg.decode("utf-8") 
-        msg = msg.rstrip()
-        arry = msg.split()
-        arry = [float(item) for item in arry]
+        # msg is one newline framed BCVTB message:
+        # version flag n_doubles n_ints n_bools time values...
+        arry = [float(item) for item in msg.split()]
         log.info('Received message from EnergyPlus: ' + str(arry))
         slot = 6
         self.sim_flag = arry[1]
@@ -681,16 +729,16 @@ class EnergyPlusAgent(SynchronizingPubSubAgent):
 
         if self.sim_flag != 0.0:
             log.debug("FLAG: {} - {}".format(self.sim_flag, type(self.sim_flag)))
-            if self.sim_flag == '1':
-                self.exit('Simulation reached end: ' + self.sim_flag)
-            elif self.sim_flag == '-1':
-                self.exit('Simulation stopped with unspecified error: ' + self.sim_flag)
-            elif self.sim_flag == '-10':
-                self.exit('Simulation stopped with error during initialization: ' + self.sim_flag)
-            elif self.sim_flag == '-20':
-                self.exit('Simulation stopped with error during time integration: ' + self.sim_flag)
+            if self.sim_flag == 1.0:
+                self.exit('Simulation reached end: ' + str(self.sim_flag))
+            elif self.sim_flag == -1.0:
+                self.exit('Simulation stopped with unspecified error: ' + str(self.sim_flag))
+            elif self.sim_flag == -10.0:
+                self.exit('Simulation stopped with error during initialization: ' + str(self.sim_flag))
+            elif self.sim_flag == -20.0:
+                self.exit('Simulation stopped with error during time integration: ' + str(self.sim_flag))
         elif arry[2] < self.eplus_outputs and len(arry) < self.eplus_outputs + 6:
-            self.exit('Got message with ' + arry[2] + ' inputs. Expecting ' + str(self.eplus_outputs) + '.')
+            self.exit('Got message with ' + str(arry[2]) + ' inputs. Expecting ' + str(self.eplus_outputs) + '.')
         else:
             if float(arry[5]):
                 self.time = float(arry[5])
@@ -733,8 +781,13 @@ class EnergyPlusAgent(SynchronizingPubSubAgent):
         self.stop()
         log.error(msg)
 
+    def log_step_rate(self):
+        log.info('EnergyPlus co-simulation: {} steps at {:.2f} steps per second'.format(
+            self.socket_server.steps, self.socket_server.steps_per_second()))
+
     def stop(self):
         if self.socket_server:
+            self.log_step_rate()
             self.socket_server.stop()
             self.socket_server = None
 
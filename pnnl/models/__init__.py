@@ -32,6 +32,18 @@ class Model(object):
         q = self.model.predict(_set, sched_index, market_index, occupied)
         return q
 
+    def get_q_batch(self, sets, sched_index, market_index, occupied):
+        """
+        Predict the quantity for every set point in sets.  Models that
+        provide predict_batch evaluate all set points in one call, with the
+        same results as get_q.  Demand curves are built for markets 0 and
+        up; predict_batch implementations may reject market_index < 0.
+        """
+        predict_batch = getattr(self.model, "predict_batch", None)
+        if predict_batch is not None:
+            return list(predict_batch(sets, sched_index, market_index, occupied))
+        return [self.get_q(_set, sched_index, market_index, occupied) for _set in sets]
+
     def store_model_config(self, _config):
         try:
             config = self.vip.config.get("model")
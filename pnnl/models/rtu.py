@@ -1,6 +1,7 @@
 import logging
 import operator
 import importlib
+import numpy as np
 from volttron.platform.agent import utils
 from volttron.pnnl.models.utils import clamp
 import volttron.pnnl.models.input_names as data_names
@@ -135,6 +136,7 @@ class rtuzone(object):
         self.off = [0]*parent.market_number
 
         self.predict = self.getQ
+        self.predict_batch = self.getQ_batch
         self.parent.init_predictions = self.init_predictions
         self.smc_interval = parent.single_market_contol_interval
         self.get_input_value = parent.get_input_value
@@ -273,6 +275,78 @@ class rtuzone(object):
             self.parent.publish_record(topic_suffix, message)
         return q
 
+    def getQ_batch(self, temp_stpts, sched_index, market_index, occupied):
+        """
+        Demand curve version of getQ.  Simulates every set point in
+        temp_stpts at once, stepping all of them through each minute as
+        numpy arrays.  Every set point starts from the stored state of
+        market_index, as when getQ is called for each price of a demand
+        curve (dc=True), and the prediction state left for market_index + 1
+        is that of the last set point.
+
+        Only market indices of 0 or more are accepted.  For the current hour
+        (-1) getQ reads the state it writes, so successive scalar calls do
+        not start from the same state and cannot be batched.
+        :param temp_stpts: list of zone temperature set points.
+        :param sched_index: int; hour of day for market.
+        :param market_index: int; market index, 0 for the next market.
+        :param occupied: bool; true if occupied.
+        :return: numpy array of predicted quantities.
+        """
+        if market_index < 0:
+            raise ValueError("getQ_batch requires a market index of 0 or more, got {}".format(market_index))
+        if self.parent.market_number == 1:
+            oat = self.oat
+            zt = self.zt
+            runtime = self.parent.single_market_contol_interval
+            ontime = self.on[0]
+            offtime = self.off[0]
+            sched_index = self.parent.current_datetime.hour
+        else:
+            zt = self.zt_predictions[market_index]
+            oat = self.parent.oat_predictions[market_index] if self.parent.oat_predictions else self.parent.get_input_value(self.oat)
+            ontime = self.on[market_index]
+            offtime = self.off[market_index]
+            runtime = 60
+
+        if self.parent.mapped is not None:
+            ops = OPS[self.parent.mapped]
+        else:
+            ops = OPS["csp"]
+
+        temp_stpt = np.asarray(temp_stpts, dtype=float)
+        size = temp_stpt.size
+        zt = np.full(size, zt, dtype=float)
+        ontime = np.full(size, ontime, dtype=int)
+        offtime = np.full(size, offtime, dtype=int)
+        on = np.zeros(size, dtype=int)
+        off_threshold = ops[1][1](temp_stpt, self.tdb_off)
+        on_threshold = ops[0][1](temp_stpt, self.tdb_on)
+        getT = self.getT
+        for i in range(runtime):
+            turn_off = (ontime != 0) & ops[1][0](zt, off_threshold) & (ontime > self.on_min)
+            stay_on = (ontime != 0) & ~turn_off
+            turn_on = (ontime == 0) & (offtime != 0) & ops[0][0](zt, on_threshold) & (offtime > self.off_min)
+            running = stay_on | turn_on
+            ontime = np.where(running, ontime + 1, 0)
+            ontime[turn_on] = 1
+            offtime = np.where(running, 0, offtime + 1)
+            offtime[turn_off] = 1
+            on += running
+            zt = getT(zt, oat, running.astype(int), sched_index)
+
+        if (market_index + 1) < self.parent.market_number:
+            last_zt = zt[-1]
+            if occupied:
+                last_zt = clamp(last_zt, min(self.parent.flexibility), max(self.parent.flexibility))
+            else:
+                last_zt = clamp(last_zt, min(self.parent.flexibility), self.parent.off_setpoint)
+            self.on[market_index+1] = int(ontime[-1])
+            self.off[market_index+1] = int(offtime[-1])
+            self.zt_predictions[market_index + 1] = float(last_zt)
+        q = on/runtime*self.rated_power
+        return q
+
     def getT(self, tpre, oat, on, index):
         T = (oat - tpre) * self.c1[index] - on * self.c2[index] * self.c + self.c3[index] + tpre
         return T
\ No newline at end of file
@@ -0,0 +1,77 @@
+import copy
+import random
+from datetime import datetime
+
+import pytest
+
+rtu = pytest.importorskip("volttron.pnnl.models.rtu")
+models = pytest.importorskip("volttron.pnnl.models")
+
+MARKET_NUMBER = 24
+
+
+class Parent(object):
+    def __init__(self, rng):
+        self.market_number = MARKET_NUMBER
+        self.single_market_contol_interval = None
+        self.actuation_rate = 300
+        self.current_datetime = datetime(2020, 7, 1, 12, 25)
+        self.oat_predictions = [rng.uniform(70.0, 95.0) for _ in range(MARKET_NUMBER)]
+        self.flexibility = [70.0, 76.0]
+        self.off_setpoint = 80.0
+        self.mapped = None
+        self.agent_name = "rtu"
+
+    def get_input_value(self, name):
+        return 73.0
+
+    def check_future_schedule(self, current_datetime):
+        return True
+
+    def publish_record(self, topic_suffix, message):
+        pass
+
+
+def make_model(seed):
+    rng = random.Random(seed)
+    config = {
+        "c1": [rng.uniform(0.01, 0.05) for _ in range(24)],
+        "c2": [rng.uniform(0.1, 0.4) for _ in range(24)],
+        "c3": [rng.uniform(-0.05, 0.05) for _ in range(24)],
+        "c": 1.0,
+        "rated_power": 7.5,
+        "on_min": rng.randint(0, 5),
+        "off_min": rng.randint(0, 5),
+        "temp_db": 0.5
+    }
+    zone = rtu.rtuzone(config, Parent(rng))
+    zone.on = [rng.randint(0, 10) for _ in range(MARKET_NUMBER)]
+    zone.off = [0 if on else rng.randint(1, 10) for on in zone.on]
+    zone.zt_predictions = [rng.uniform(68.0, 78.0) for _ in range(MARKET_NUMBER)]
+    model = models.Model.__new__(models.Model)
+    model.model = zone
+    return model
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("occupied", [True, False])
+def test_get_q_batch_matches_get_q(seed, occupied):
+    sets = [70.0 + 0.5 * i for i in range(13)]
+    for market_index in range(MARKET_NUMBER):
+        scalar = make_model(seed)
+        batch = copy.deepcopy(scalar)
+        sched_index = (12 + market_index) % 24
+
+        expected = [scalar.get_q(_set, sched_index, market_index, occupied) for _set in sets]
+        result = batch.get_q_batch(sets, sched_index, market_index, occupied)
+
+        assert result == pytest.approx(expected)
+        assert batch.model.on == scalar.model.on
+        assert batch.model.off == scalar.model.off
+        assert batch.model.zt_predictions == pytest.approx(scalar.model.zt_predictions)
+
+
+def test_get_q_batch_rejects_current_hour():
+    model = make_model(0)
+    with pytest.raises(ValueError):
+        model.get_q_batch([72.0, 74.0], 12, -1, True)
@@ -1,11 +1,13 @@
 import logging
 import sys
+import time
 from datetime import timedelta as td
 import numpy as np
 
 from dateutil.parser import parse
 import dateutil.tz
 import gevent
+from gevent.event import Event
 
 from volttron.platform.agent.math_utils import mean, stdev
 from volttron.platform.agent.base_market_agent import MarketAgent
@@ -24,6 +26,41 @@ setup_logging()
 __version__ = '0.3'
 
 
+class MarketUpdateFlags(object):
+    """
+    Per market update flags backed by gevent events.  Supports the list
+    style access used by concrete agents (update_flag[index] = True) while
+    letting offer_callback block on the event instead of polling.
+    """
+    def __init__(self):
+        self._events = []
+
+    def append(self, value):
+        event = Event()
+        if value:
+            event.set()
+        self._events.append(event)
+
+    def __getitem__(self, index):
+        return self._events[index].is_set()
+
+    def __setitem__(self, index, value):
+        if value:
+            self._events[index].set()
+        else:
+            self._events[index].clear()
+
+    def __len__(self):
+        return len(self._events)
+
+    def reset(self):
+        for event in self._events:
+            event.clear()
+
+    def wait(self, index, timeout=None):
+        return self._events[index].wait(timeout)
+
+
 class TransactiveBase(MarketAgent, Model):
     def __init__(self, config, aggregator=None, **kwargs):
         MarketAgent.__init__(self, **kwargs)
@@ -66,7 +103,9 @@ class TransactiveBase(MarketAgent, Model):
         self.input_topics = set()
 
         self.commodity = "electricity"
-        self.update_flag = []
+        self.update_flag = MarketUpdateFlags()
+        self.last_data_time = None
+        self.offer_latency = {}
         self.demand_curve = []
         self.actuation_price_range = None
         self.prices = []
@@ -485,11 +524,13 @@ class TransactiveBase(MarketAgent, Model):
         self.ct_flexibility = output_info["ct_flex"]
         self.off_setpoint = output_info["off_setpoint"]
         market_index = self.market_list.index(market_name)
+        wait_start = time.time()
         if market_index > 0:
-            while not self.update_flag[market_index - 1]:
-                gevent.sleep(1)
+            # Woken by update_state of the previous market.
+            self.update_flag.wait(market_index - 1)
+        wait_time = time.time() - wait_start
         if market_index == len(self.market_list) - 1:
-            self.update_flag = [False]*len(self.market_list)
+            self.update_flag.reset()
         if market_index == 0 and self.current_datetime is not None:
             self.init_predictions(output_info)
 
@@ -504,7 +545,30 @@ class TransactiveBase(MarketAgent, Model):
                                                 schedule_index,
                                                 occupied)
         self.demand_curve[market_index] = demand_curve
+        # Offers are made one market at a time, not with make_offers, because
+        # this curve depends on the state update_state applied from the
+        # previous market's cleared price.
         result, message = self.make_offer(market_name, buyer_seller, demand_curve)
+        self.update_offer_latency(market_name, wait_time)
+        if market_index == len(self.market_list) - 1:
+            topic_suffix = "OfferLatency"
+            message = dict(self.offer_latency)
+            self.publish_record(topic_suffix, message)
+
+    def update_offer_latency(self, market_name, wait_time):
+        """
+        Store the time from the last device data update to the offer for
+        market_name and the time spent waiting on the previous market.
+        :param market_name: str; name of market offer was made on.
+        :param wait_time: float; seconds waited for previous market update.
+        :return:
+        """
+        now = time.time()
+        data_to_offer = now - self.last_data_time if self.last_data_time is not None else None
+        self.offer_latency[market_name] = {
+            "DataToOffer": data_to_offer,
+            "WaitTime": wait_time
+        }
 
     def create_demand_curve(self, market_index, sched_index, occupied):
         """
@@ -518,16 +582,17 @@ class TransactiveBase(MarketAgent, Model):
         """
         _log.debug("%s create_demand_curve - index: %s - sched: %s",
                    self.core.identity,  market_index, sched_index)
-        demand_curve = PolyLine()
         prices = self.determine_prices()
         self.update_prediction_error()
+        sets = []
         for control, price in zip(self.ct_flexibility, prices):
             if occupied:
                 _set = control
             else:
                 _set = self.off_setpoint
-            q = self.get_q(_set, sched_index, market_index, occupied)
-            demand_curve.add(Point(price=price, quantity=q))
+            sets.append(_set)
+        quantities = self.get_q_batch(sets, sched_index, market_index, occupied)
+        demand_curve = PolyLine([Point(price=price, quantity=q) for price, q in zip(prices, quantities)])
 
         topic_suffix = "DemandCurve"
         message = {
@@ -701,6 +766,7 @@ class TransactiveBase(MarketAgent, Model):
         :param data: dict; key value pairs from master driver.
         :return:
         """
+        self.last_data_time = time.time()
         to_publish = {}
         for name, input_data in self.inputs.items():
             for point, value in input_data.items():